@@ -1,5 +1,4 @@
 from typing import Set
-import requests
 import xml.etree.ElementTree as xml
 from pprint import pprint
 from team import Team
@@ -9,15 +8,24 @@ from os.path import exists
 
 
 class Network:
-    def __init__(self):
+    def __init__(self, session=None):
         self.cookies = None
+        # A requests.Session that is already logged in, used instead of cookies.
+        self.session = session
 
     def first_get(self, url, parameters=None):
+        import requests
+
         r = requests.get(url, cookies=self.cookies, params=parameters)
         self.cookies = r.cookies
         return r.text
 
     def get(self, url, parameters=None):
+        if self.session is not None:
+            return self.session.get(url, params=parameters).text
+
+        import requests
+
         r = requests.get(url, cookies=self.cookies, params=parameters)
         return r.text
 
@@ -46,6 +54,14 @@ class BBApi:
             elif child.tag == "error":
                 print("Error:", child.attrib["message"])
 
+    @classmethod
+    def from_session(cls, session) -> "BBApi":
+        # Reuse a session logged in elsewhere (first_active_match._login) instead of logging in again.
+        api = cls()
+        api.logged_in = True
+        api.network = Network(session)
+        return api
+
     def arena(self, teamid=0):
         p = {"teamid": teamid}
         data = self.network.get("http://bbapi.buzzerbeater.com/arena.aspx", p)
@@ -166,7 +182,7 @@ class BBApi:
             for i in range(len(quarters)):
                 bb_team.push_stat_sheet()
             for num, pts in enumerate(quarters):
-                bb_team.stats.qtr[num].sheet[Statistic.Points] = pts
+                bb_team.stats.qtr[num].sheet[Statistic.Points] = int(pts)
 
             totals = xml_team.find("./boxscore/teamTotals")
 
@@ -150,6 +150,56 @@ def describe_row(row: dict, with_forum: bool = True) -> str:
     return f"{base}."
 
 
+def query_rows(
+    conn: sqlite3.Connection,
+    teamid: int | None = None,
+    opponent_id: int | None = None,
+    matchid: int | None = None,
+    player_id: int | None = None,
+    order: str = "asc",
+) -> list[dict]:
+    cur = conn.cursor()
+    query = "SELECT * FROM buzzerbeaters"
+    filters = []
+    params = []
+    if teamid is not None:
+        filters.append("team_id = ?")
+        params.append(teamid)
+    if opponent_id is not None:
+        filters.append("opponent_id = ?")
+        params.append(opponent_id)
+    if matchid is not None:
+        filters.append("match_id = ?")
+        params.append(matchid)
+    if player_id is not None:
+        filters.append("player_id = ?")
+        params.append(player_id)
+    if filters:
+        query += " WHERE " + " AND ".join(filters)
+
+    order_dir = "DESC" if order == "desc" else "ASC"
+    query += (
+        f" ORDER BY COALESCE(season, 0) {order_dir}, "
+        f"match_id {order_dir}, "
+        f"COALESCE(game_clock, 0) {order_dir}, "
+        f"COALESCE(player_id, 0) {order_dir}"
+    )
+    cur.execute(query, params)
+    return [dict(row) for row in cur.fetchall()]
+
+
+def describe_with_link(row_dict: dict, with_url: bool = True, link_domain: str = "com") -> str:
+    desc = describe_row(row_dict, with_forum=with_url)
+    if with_url:
+        period = row_dict.get("period")
+        rt = _realtime_for_period(period)
+        match_id = row_dict.get("match_id")
+        if match_id is not None:
+            viewer = f"https://buzzerbeater.{link_domain}/match/{match_id}/reportmatch.aspx?realTime={rt}"
+            desc += f" [link={viewer}]"
+    return desc
+
+
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--db", default="data/buzzerbeaters.db")
@@ -204,34 +254,7 @@ def main() -> None:
 
     conn = sqlite3.connect(args.db)
     conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-    query = "SELECT * FROM buzzerbeaters"
-    filters = []
-    params = []
-    if args.teamid is not None:
-        filters.append("team_id = ?")
-        params.append(args.teamid)
-    if args.opponent_id is not None:
-        filters.append("opponent_id = ?")
-        params.append(args.opponent_id)
-    if args.matchid is not None:
-        filters.append("match_id = ?")
-        params.append(args.matchid)
-    if args.player_id is not None:
-        filters.append("player_id = ?")
-        params.append(args.player_id)
-    if filters:
-        query += " WHERE " + " AND ".join(filters)
-
-    order_dir = "DESC" if args.order == "desc" else "ASC"
-    query += (
-        f" ORDER BY COALESCE(season, 0) {order_dir}, "
-        f"match_id {order_dir}, "
-        f"COALESCE(game_clock, 0) {order_dir}, "
-        f"COALESCE(player_id, 0) {order_dir}"
-    )
-    cur.execute(query, params)
-    rows = cur.fetchall()
+    rows = query_rows(conn, args.teamid, args.opponent_id, args.matchid, args.player_id, args.order)
     conn.close()
 
     printed = 0
@@ -246,8 +269,7 @@ def main() -> None:
         columns = ["match_id", "player_id", "game_clock"]
 
     filtered_rows = []
-    for row in rows:
-        row_dict = dict(row)
+    for row_dict in rows:
         if args.only_outcome_change and not _outcome_changed(row_dict):
             continue
         filtered_rows.append(row_dict)
@@ -308,15 +330,7 @@ def main() -> None:
                 values.append(str(row_dict.get(col, "")))
             print("\t".join(values))
         else:
-            desc = describe_row(row_dict, with_forum=not args.no_url)
-            if not args.no_url:
-                period = row_dict.get("period")
-                rt = _realtime_for_period(period)
-                match_id = row_dict.get("match_id")
-                if match_id is not None:
-                    viewer = f"https://buzzerbeater.{args.link_domain}/match/{match_id}/reportmatch.aspx?realTime={rt}"
-                    desc += f" [link={viewer}]"
-            print(desc)
+            print(describe_with_link(row_dict, not args.no_url, args.link_domain))
             print()
         printed += 1
 
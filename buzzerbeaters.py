@@ -2,19 +2,27 @@ import argparse
 import contextlib
 import io
 import json
-import math
+import os
+import unittest
+from pathlib import Path
 
+import numpy as np
+
+from clocks import REGULAR_TIME, PeriodTable, period_name, regulation_period
 from comments import Comments
-from event import convert, FreeThrowEvent, ShotEvent
+from event import convert, ShotEvent
 from event_types import ShotType
-from main import parse_xml, get_xml_text
-
-
-REGULATION_SECONDS = 2880
-OVERTIME_SECONDS = 300
-# Court image is 368px wide and baskets are at x=21 and x=347 (326px apart).
-# Real basket-to-basket distance is 83.5 ft (94 ft court - 2 * 5.25 ft).
-FT_PER_PX = 83.5 / 326
+from scan_profile import NO_PROFILE, ScanProfile
+from score_timeline import FREE_THROW, SHOT, ScoreTimeline
+from shot_table import FT_PER_PX, shot_distance_px
+from main import (
+    EVENT_LEN,
+    decode_event,
+    get_xml_text,
+    parse_match_xml,
+    parse_report_header,
+    parse_xml,
+)
 
 
 def _is_buzzerbeater_comment(comment: str) -> bool:
@@ -22,101 +30,195 @@ def _is_buzzerbeater_comment(comment: str) -> bool:
     return comment.startswith("A buzzerbeater for ") and comment.endswith("!")
 
 
-def _build_period_ends(max_clock: int) -> list[int]:
-    # Fallback: 4 quarters (720s each) plus any number of 5-min OTs.
-    quarter_end = 720
-    period_ends = [
-        quarter_end * i for i in range(1, 5) if quarter_end * i <= max_clock
-    ]
-    if max_clock > REGULATION_SECONDS:
-        extra = max_clock - REGULATION_SECONDS
-        ot_count = (extra + OVERTIME_SECONDS - 1) // OVERTIME_SECONDS
-        period_ends += [
-            REGULATION_SECONDS + OVERTIME_SECONDS * i
-            for i in range(1, ot_count + 1)
-        ]
-    if not period_ends:
-        period_ends = [REGULATION_SECONDS]
-    return period_ends
-
-
-def _period_ends_from_events(events) -> list[int]:
+def _report_periods(events) -> PeriodTable:
     # Prefer explicit "End of period." markers when available (OT ends are offset in reports).
-    ends = sorted(
-        {
-            ev.gameclock.clock
-            for ev in events
-            if (ev.comment or "") == "End of period."
-        }
-    )
-    return ends
-
-
-def _period_label_from_end(end: int, period_ends: list[int]) -> str:
-    if end in period_ends:
-        idx = period_ends.index(end) + 1
-        if idx <= 4:
-            return f"Q{idx}"
-        return f"OT{idx - 4}"
-    return _period_label(end)
-
-
-def _matching_period_end(clock: int, period_ends: list[int]) -> int | None:
-    for end in period_ends:
-        if end - 5 <= clock <= end:
-            return end
-    return None
-
-
-def _period_label(clock: int) -> str:
-    if clock <= REGULATION_SECONDS:
-        quarter = (clock + 719) // 720
-        quarter = max(1, min(4, quarter))
-        return f"Q{quarter}"
-    ot_index = (clock - REGULATION_SECONDS + OVERTIME_SECONDS - 1) // OVERTIME_SECONDS
-    return f"OT{ot_index}"
-
-
-def find_buzzerbeaters(matchid: int):
-    text = get_xml_text(matchid)
-    # Suppress debug chatter from parse_report when __debug__ is True.
-    with contextlib.redirect_stdout(io.StringIO()):
-        events, ht, at = parse_xml(text)
-
-    comments = Comments()
-    # Populate comments and player objects for all events so convert() can work.
+    max_clock = max((ev.gameclock for ev in events), default=REGULAR_TIME)
+    return PeriodTable.from_markers([ev.gameclock for ev in events if ev.is_end_of_period()], max_clock)
+
+
+def _report_text(matchid: int, profile: ScanProfile) -> str:
+    if not profile.enabled:
+        return get_xml_text(matchid)
+    # get_xml_text serves matches/report_<id>.xml when present, else downloads it.
+    cached = os.path.exists(f"matches/report_{matchid}.xml")
+    profile.cache("report", cached)
+    with profile.phase("report_read" if cached else "report_download"):
+        text = get_xml_text(matchid)
+    profile.count("bytes_read" if cached else "bytes_fetched", len(text.encode("utf-8")))
+    return text
+
+
+def find_buzzerbeaters(
+    matchid: int,
+    render_comments: bool = False,
+    profile: ScanProfile = NO_PROFILE,
+    comments: Comments | None = None,
+):
+    # Pass `comments` to reuse one commentary catalog across matches.
+    text = _report_text(matchid, profile)
+    if not render_comments:
+        return _find_buzzerbeaters_windowed(text, profile, comments)
+    return _find_buzzerbeaters_full(text, comments)
+
+
+def _find_buzzerbeaters_full(text: str, comments: Comments | None = None):
+    # quiet rather than redirect_stdout: bb-serve runs this on handler threads.
+    events, ht, at = parse_xml(text, quiet=True)
+
+    if comments is None:
+        comments = Comments()
+    # Full decode: every event gets its commentary line (used for display and as
+    # the reference for the windowed path below).
     for ev in events:
-        with contextlib.redirect_stdout(io.StringIO()):
-            ev.comment = comments.get_comment(ev, [ht, at])
+        ev.comment = comments.get_comment(ev, [ht, at], quiet=True)
     baseevents = convert(events)
-    score_map = _score_snapshots(baseevents)
+    timeline = ScoreTimeline(baseevents)
     hits = []
-    max_clock = max((ev.gameclock.clock for ev in events), default=REGULATION_SECONDS)
-    period_ends = _period_ends_from_events(events)
-    if not period_ends:
-        period_ends = _build_period_ends(max_clock)
+    periods = _report_periods(events)
     for ev in events:
-        end = _matching_period_end(ev.gameclock.clock, period_ends)
-        if end is None:
+        index = periods.matching_end(ev.gameclock)
+        if index is None:
             continue
-        if _is_buzzerbeater_comment(ev.comment):
-            ev.period = _period_label_from_end(end, period_ends)
-            _attach_scoring_details(ev, baseevents, score_map, end)
+        if ev.is_buzzerbeater():
+            ev.period = periods.label(index)
+            _attach_scoring_details(ev, timeline, periods.end_list[index])
             hits.append(ev)
 
     return hits, ht, at
 
 
+def _is_shot_record(rec: str) -> bool:
+    etype = int(rec[1:4])
+    return int(rec[5]) == 0 and 100 <= etype < 500 and etype not in (210, 211, 212, 213, 214, 215)
+
+
+def _raw_scores_before(records: list[str]) -> list[tuple[int, int]]:
+    # Running score ahead of each raw record, using the same scoring rules as convert().
+    scores = [0, 0]
+    before = []
+    for rec in records:
+        before.append((scores[0], scores[1]))
+        if int(rec[5]) > 0:
+            continue
+        etype = int(rec[1:4])
+        if _is_shot_record(rec):
+            result = int(rec[4], 16)
+            if result > 9:
+                result -= 9
+            # Scored (1, 4) or goaltend (0)
+            if result in (0, 1, 4):
+                scores[int(rec[0])] += 3 if etype < 200 else 2
+        elif etype == 502:
+            scores[int(rec[0])] += 1
+    return before
+
+
+def _find_buzzerbeaters_windowed(text: str, profile: ScanProfile = NO_PROFILE, comments: Comments | None = None):
+    # Only the 5 seconds before each period end matter, so locate those windows
+    # from the raw clock column and decode just the records inside them.
+    with profile.phase("parse"):
+        report, ht, at = parse_match_xml(text)
+        offset = parse_report_header(report, at, ht, quiet=True)
+    records = [report[i : i + EVENT_LEN] for i in range(offset, len(report), EVENT_LEN)]
+    clocks = np.array([int(rec[9:13]) for rec in records], dtype=np.int64)
+
+    markers = [clock for rec, clock in zip(records, clocks.tolist()) if rec[1:6] == "96190"]
+    periods = PeriodTable.from_markers(markers, int(clocks.max()) if len(clocks) else REGULAR_TIME)
+
+    # Record indices in the last 5 seconds of each period, keyed by period index.
+    near = periods.near_end(clocks)
+    windows: dict[int, list[int]] = {}
+    for idx in np.flatnonzero(near >= 0).tolist():
+        windows.setdefault(int(near[idx]), []).append(idx)
+
+    scores_before = _raw_scores_before(records)
+    if comments is None:
+        comments = Comments()
+    hits = []
+    for index, indices in windows.items():
+        end = periods.end_list[index]
+        first, last = indices[0], indices[-1]
+        # Flagrant upgrades and assists patch the previous base event, so start
+        # at the record they belong to; convert() also peeks one record past
+        # every shot for and-one fouls, so extend the tail past any shot.
+        while first > 0 and records[first][1:4] in ("509", "510", "809"):
+            first -= 1
+        while last + 1 < len(records) and (last == indices[-1] or _is_shot_record(records[last])):
+            last += 1
+
+        with profile.phase("parse"):
+            events = []
+            for rec in records[first : last + 1]:
+                events.extend(decode_event(rec))
+        with profile.phase("comments"):
+            for ev in events:
+                comments.set_actors(ev, [ht, at])
+        with profile.phase("convert"):
+            baseevents = convert(events)
+        with profile.phase("detect"):
+            timeline = ScoreTimeline(baseevents, scores_before[first])
+            for ev in events:
+                if not (end - 5 <= ev.gameclock <= end) or not ev.is_buzzerbeater():
+                    continue
+                ev.comment = comments.get_comment(ev, [ht, at], quiet=True)
+                ev.period = periods.label(index)
+                _attach_scoring_details(ev, timeline, end)
+                hits.append(ev)
+
+    return hits, ht, at
+
+
+def hit_record(ev, ht, at) -> dict:
+    # Flatten a hit into plain values so it can cross process boundaries cheaply.
+    if ev.team == 0:
+        team, opp, is_home = ht, at, 1
+    else:
+        team, opp, is_home = at, ht, 0
+    return {
+        "team_id": team.id,
+        "team_name": team.name,
+        "opponent_id": opp.id,
+        "opponent_name": opp.name,
+        "player_id": int(getattr(ev.player1obj, "id", ev.player1)),
+        "player_name": getattr(ev.player1obj, "name", ""),
+        "period": getattr(ev, "period", None),
+        "game_clock": ev.gameclock,
+        "comment": ev.comment,
+        "is_home": is_home,
+        "event_kind": getattr(ev, "linked_event_kind", None),
+        "shot_type": getattr(ev, "shot_type", None),
+        "shot_type_label": getattr(ev, "shot_type_label", None),
+        "shot_result": getattr(ev, "shot_result", None),
+        "free_throw_type": getattr(ev, "free_throw_type", None),
+        "shot_x": getattr(ev, "shot_x", None),
+        "shot_y": getattr(ev, "shot_y", None),
+        "shot_distance": getattr(ev, "shot_distance", None),
+        "shot_distance_ft": getattr(ev, "shot_distance_ft", None),
+        "score_before_home": getattr(ev, "score_before_home", None),
+        "score_before_away": getattr(ev, "score_before_away", None),
+        "score_after_home": getattr(ev, "score_after_home", None),
+        "score_after_away": getattr(ev, "score_after_away", None),
+        # Raw report fields, for --json output.
+        "team_index": ev.team,
+        "event_type": ev.type,
+        "result": ev.result,
+        "variation": ev.variation,
+        "realclock": ev.realclock,
+        "data": ev.data,
+    }
+
+
+def find_buzzerbeater_records(
+    matchid: int, profile: ScanProfile = NO_PROFILE, comments: Comments | None = None
+) -> list[dict]:
+    hits, ht, at = find_buzzerbeaters(matchid, profile=profile, comments=comments)
+    return [hit_record(ev, ht, at) for ev in hits]
+
+
 def _shot_distance(shot_event: ShotEvent) -> float | None:
     if shot_event.shot_pos is None:
         return None
-    if shot_event.att_team == 0:
-        basket_x, basket_y = 347, 96
-    else:
-        basket_x, basket_y = 21, 96
-    dx = shot_event.shot_pos.x - basket_x
-    dy = shot_event.shot_pos.y - basket_y
-    return math.sqrt(dx * dx + dy * dy)
+    return float(shot_distance_px(shot_event.shot_pos.x, shot_event.shot_pos.y, shot_event.att_team))
 
 
 def _shot_distance_ft(shot_event: ShotEvent) -> float | None:
@@ -126,21 +228,11 @@ def _shot_distance_ft(shot_event: ShotEvent) -> float | None:
     return dist_px * FT_PER_PX
 
 
-def _attach_scoring_details(ev, baseevents, score_map, end: int) -> None:
+def _attach_scoring_details(ev, timeline: ScoreTimeline, end: int) -> None:
     window_start = end - 5
-    last_shot = None
-    last_ft = None
-    for be in baseevents:
-        if be.gameclock < window_start or be.gameclock > end:
-            continue
-        if isinstance(be, ShotEvent):
-            if be.att_team == ev.team and be.has_scored():
-                last_shot = be
-        elif isinstance(be, FreeThrowEvent):
-            if be.att_team == ev.team and be.has_scored():
-                last_ft = be
-
-    chosen = last_shot if last_shot is not None else last_ft
+    chosen = timeline.last_scoring(ev.team, window_start, end, SHOT)
+    if chosen is None:
+        chosen = timeline.last_scoring(ev.team, window_start, end, FREE_THROW)
     if chosen is None:
         ev.linked_event_kind = None
         return
@@ -167,7 +259,7 @@ def _attach_scoring_details(ev, baseevents, score_map, end: int) -> None:
         ev.shot_distance_ft = None
 
     # Attach score snapshot if available
-    snap = score_map.get(chosen)
+    snap = timeline.score_around(chosen)
     if snap:
         before, after = snap
         ev.score_before_home = before[0]
@@ -176,22 +268,51 @@ def _attach_scoring_details(ev, baseevents, score_map, end: int) -> None:
         ev.score_after_away = after[1]
 
 
-def _score_snapshots(baseevents):
-    scores = [0, 0]
-    snapshots = {}
-    for be in baseevents:
-        if isinstance(be, ShotEvent) and be.has_scored():
-            pts = 3 if be.is_3pt() else 2
-            before = (scores[0], scores[1])
-            scores[be.att_team] += pts
-            after = (scores[0], scores[1])
-            snapshots[be] = (before, after)
-        elif isinstance(be, FreeThrowEvent) and be.has_scored():
-            before = (scores[0], scores[1])
-            scores[be.att_team] += 1
-            after = (scores[0], scores[1])
-            snapshots[be] = (before, after)
-    return snapshots
+def format_buzzerbeaters(matchid: int, records: list[dict], as_json: bool = False, details: bool = False) -> str:
+    """bb-buzzerbeaters output for hit_record() dicts; bb-query prints the same."""
+    if as_json:
+        payload = [
+            {
+                "matchid": matchid,
+                "team": r["team_name"],
+                "team_index": r["team_index"],
+                "event_type": r["event_type"],
+                "result": r["result"],
+                "variation": r["variation"],
+                "gameclock": r["game_clock"],
+                "realclock": r["realclock"],
+                "data": r["data"],
+            }
+            for r in records
+        ]
+        return json.dumps(payload, indent=2)
+
+    lines = [f"buzzerbeaters: {len(records)}"]
+    for r in records:
+        period = r["period"] or period_name(regulation_period(r["game_clock"]))
+        line = f"- {r['team_name']} {period} {r['comment'] or ''}"
+        if details:
+            score = f" score={r['score_before_home']}-{r['score_before_away']}→{r['score_after_home']}-{r['score_after_away']}"
+            if r["event_kind"] == "shot":
+                line += (
+                    f" | shot_type={r['shot_type']}"
+                    f" shot_label={r['shot_type_label']}"
+                    f" shot_result={r['shot_result']}"
+                    f" pos=({r['shot_x']},{r['shot_y']})"
+                    f" dist_px={r['shot_distance']}"
+                    f" dist_ft={r['shot_distance_ft']}"
+                    f"{score}"
+                )
+            elif r["event_kind"] == "free_throw":
+                line += (
+                    f" | free_throw_type={r['free_throw_type']}"
+                    f" shot_result={r['shot_result']}"
+                    f"{score}"
+                )
+            else:
+                line += " | scoring_event=unknown"
+        lines.append(line)
+    return "\n".join(lines)
 
 
 def main() -> None:
@@ -205,55 +326,34 @@ def main() -> None:
     )
     args = parser.parse_args()
 
-    hits, ht, at = find_buzzerbeaters(args.matchid)
-
-    if args.json:
-        payload = []
-        for ev in hits:
-            payload.append(
-                {
-                    "matchid": args.matchid,
-                    "team": ht.name if ev.team == 0 else at.name,
-                    "team_index": ev.team,
-                    "event_type": ev.type,
-                    "result": ev.result,
-                    "variation": ev.variation,
-                    "gameclock": ev.gameclock.clock,
-                    "realclock": ev.realclock,
-                    "data": ev.data,
-                }
+    records = find_buzzerbeater_records(args.matchid)
+    print(format_buzzerbeaters(args.matchid, records, args.json, args.details))
+
+
+class TestBuzzerbeaterDetection(unittest.TestCase):
+    def test_codes_match_commentary(self):
+        # Regression corpus: whatever match reports are cached locally.
+        paths = sorted(Path("matches").glob("report_*.xml"))
+        if not paths:
+            self.skipTest("no cached match reports")
+        for path in paths:
+            with contextlib.redirect_stdout(io.StringIO()):
+                events, ht, at = parse_xml(path.read_text(encoding="utf-8"))
+                comments = Comments()
+                for ev in events:
+                    ev.comment = comments.get_comment(ev, [ht, at])
+            for ev in events:
+                self.assertEqual(ev.is_buzzerbeater(), _is_buzzerbeater_comment(ev.comment), path.name)
+                self.assertEqual(ev.is_end_of_period(), ev.comment == "End of period.", path.name)
+
+            matchid = int(path.stem.split("_", 1)[1])
+            fast, ht, at = find_buzzerbeaters(matchid)
+            full, _, _ = find_buzzerbeaters(matchid, render_comments=True)
+            self.assertEqual(
+                [hit_record(ev, ht, at) for ev in fast],
+                [hit_record(ev, ht, at) for ev in full],
+                path.name,
             )
-        print(json.dumps(payload, indent=2))
-    else:
-        print(f"buzzerbeaters: {len(hits)}")
-        for ev in hits:
-            team_name = ht.name if ev.team == 0 else at.name
-            period = getattr(ev, "period", None) or _period_label(ev.gameclock.clock)
-            comment = ev.comment or ""
-            line = f"- {team_name} {period} {comment}"
-            if args.details:
-                kind = getattr(ev, "linked_event_kind", None)
-                if kind == "shot":
-                    line += (
-                        f" | shot_type={getattr(ev, 'shot_type', None)}"
-                        f" shot_label={getattr(ev, 'shot_type_label', None)}"
-                        f" shot_result={getattr(ev, 'shot_result', None)}"
-                        f" pos=({getattr(ev, 'shot_x', None)},{getattr(ev, 'shot_y', None)})"
-                        f" dist_px={getattr(ev, 'shot_distance', None)}"
-                        f" dist_ft={getattr(ev, 'shot_distance_ft', None)}"
-                        f" score={getattr(ev, 'score_before_home', None)}-{getattr(ev, 'score_before_away', None)}"
-                        f"→{getattr(ev, 'score_after_home', None)}-{getattr(ev, 'score_after_away', None)}"
-                    )
-                elif kind == "free_throw":
-                    line += (
-                        f" | free_throw_type={getattr(ev, 'free_throw_type', None)}"
-                        f" shot_result={getattr(ev, 'shot_result', None)}"
-                        f" score={getattr(ev, 'score_before_home', None)}-{getattr(ev, 'score_before_away', None)}"
-                        f"→{getattr(ev, 'score_after_home', None)}-{getattr(ev, 'score_after_away', None)}"
-                    )
-                else:
-                    line += " | scoring_event=unknown"
-            print(line)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,46 @@
+import argparse
+import os
+import tempfile
+import unittest
+
+
+def add_matchid_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--matchids", default=None, help="Comma-separated match ids")
+    parser.add_argument("--matchids-file", default=None, help="File with one match id per line")
+
+
+def _read_match_id_file(path: str) -> list[str]:
+    ids = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                ids.append(line)
+    return ids
+
+
+def read_match_ids(args: argparse.Namespace) -> list[str]:
+    """Match ids from --matchids and --matchids-file, in order, without duplicates."""
+    match_ids: list[str] = []
+    if args.matchids:
+        match_ids += [m.strip() for m in args.matchids.split(",") if m.strip()]
+    if args.matchids_file:
+        match_ids += _read_match_id_file(args.matchids_file)
+    return list(dict.fromkeys(match_ids))
+
+
+class TestCliArgs(unittest.TestCase):
+    def test_read_match_ids(self):
+        parser = argparse.ArgumentParser()
+        add_matchid_args(parser)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ids.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("# season 70\n3\n\n2  # again\n4\n")
+            args = parser.parse_args(["--matchids", " 1, 2,,", "--matchids-file", path])
+            self.assertEqual(read_match_ids(args), ["1", "2", "3", "4"])
+        self.assertEqual(read_match_ids(parser.parse_args([])), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from collections import Counter
+from pathlib import Path
+
+
+def profile_parser() -> argparse.ArgumentParser:
+    # Flags handled by the console-script dispatcher (src/bb_events/cli.py) for
+    # every command; they are stripped before the command parses its own args.
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    parser.add_argument("--cprofile", default=None, metavar="OUT", help="Write cProfile stats (pstats format)")
+    parser.add_argument("--tracemalloc", default=None, metavar="OUT", help="Write the top allocation sites at exit")
+    parser.add_argument("--tracemalloc-top", type=int, default=25, metavar="N")
+    parser.add_argument("--flamegraph", default=None, metavar="OUT", help="Write sampled collapsed stacks (flamegraph.pl / speedscope)")
+    parser.add_argument("--sample-ms", type=float, default=1.0, help="Stack sampling interval for --flamegraph")
+    return parser
+
+
+def split_profile_args(argv: list[str]) -> tuple[argparse.Namespace, list[str]]:
+    """Profiling options and the remaining command arguments."""
+    return profile_parser().parse_known_args(argv)
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack and counts collapsed stacks.
+
+    Stacks start below the first frame running `root` (the profiling wrapper).
+    Only the sampled thread is seen; worker processes are not.
+    """
+
+    def __init__(self, thread_id: int, interval: float, root=None) -> None:
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.root = root
+        self.stacks: Counter[str] = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None and frame.f_code is not self.root:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if labels:
+                self.stacks[";".join(reversed(labels))] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+    def write(self, path) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def _write_tracemalloc(path, snapshot, peak: int, top: int) -> None:
+    stats = snapshot.statistics("lineno")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"peak_traced_bytes: {peak}\n")
+        f.write(f"traced_bytes_at_exit: {sum(s.size for s in stats)}\n")
+        f.write(f"top {top} allocation sites (lineno):\n")
+        for stat in stats[:top]:
+            f.write(f"{stat}\n")
+
+
+def run_profiled(run, argv: list[str] | None = None) -> None:
+    """Call run() with the profilers selected in argv (default sys.argv[1:]).
+
+    sys.argv is rewritten without the profiling flags first, so the command
+    parses its own arguments as usual. Outputs are written even when the
+    command exits through SystemExit or an error.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    opts, rest = split_profile_args(argv)
+    if opts.cprofile and opts.flamegraph and sys.version_info >= (3, 12):
+        # From 3.12 cProfile hooks every thread, the sampler included; each
+        # would skew the other.
+        raise SystemExit("--cprofile and --flamegraph measure each other; run them separately")
+    sys.argv = sys.argv[:1] + rest
+    for out in (opts.cprofile, opts.tracemalloc, opts.flamegraph):
+        if out:
+            Path(out).parent.mkdir(parents=True, exist_ok=True)
+
+    profiler = sampler = None
+    if opts.tracemalloc:
+        import tracemalloc
+
+        tracemalloc.start()
+    if opts.flamegraph:
+        sampler = StackSampler(threading.get_ident(), opts.sample_ms / 1000, run_profiled.__code__)
+        sampler.start()
+    if opts.cprofile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    start = time.perf_counter()
+    try:
+        run()
+    finally:
+        elapsed = time.perf_counter() - start
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(opts.cprofile)
+            print(f"cprofile: {opts.cprofile} ({elapsed:.2f}s)", file=sys.stderr)
+        if sampler is not None:
+            sampler.stop()
+            sampler.write(opts.flamegraph)
+            print(f"flamegraph: {opts.flamegraph} ({sum(sampler.stacks.values())} samples)", file=sys.stderr)
+        if opts.tracemalloc:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            _write_tracemalloc(opts.tracemalloc, snapshot, peak, opts.tracemalloc_top)
+            print(f"tracemalloc: {opts.tracemalloc} (peak {peak / 1e6:.1f} MB)", file=sys.stderr)
+
+
+def _busy(n: int) -> list[int]:
+    return [i * i for i in range(n)]
+
+
+class TestCliProfile(unittest.TestCase):
+    def test_split(self):
+        argv = ["--matchid", "1", "--cprofile", "out.prof", "--tracemalloc=mem.txt", "--print-stats"]
+        opts, rest = split_profile_args(argv)
+        self.assertEqual((opts.cprofile, opts.tracemalloc, opts.flamegraph), ("out.prof", "mem.txt", None))
+        self.assertEqual(rest, ["--matchid", "1", "--print-stats"])
+
+    def test_run_profiled(self):
+        import pstats
+
+        with tempfile.TemporaryDirectory() as tmp:
+            prof, mem, flame = (os.path.join(tmp, name) for name in ("run.prof", "mem.txt", "stacks.txt"))
+            saved_argv = sys.argv
+            seen = []
+
+            def run():
+                seen.append(list(sys.argv))
+                deadline = time.perf_counter() + 0.05
+                while time.perf_counter() < deadline:
+                    _busy(10_000)
+
+            try:
+                sys.argv = ["bb-test", "--cprofile", prof, "--tracemalloc", mem, "--x"]
+                run_profiled(run)
+                sys.argv = ["bb-test", "--flamegraph", flame]
+                run_profiled(run)
+                if sys.version_info >= (3, 12):
+                    sys.argv = ["bb-test", "--flamegraph", flame, "--cprofile", prof]
+                    with self.assertRaises(SystemExit):
+                        run_profiled(run)
+            finally:
+                sys.argv = saved_argv
+            self.assertEqual(seen, [["bb-test", "--x"], ["bb-test"]])
+            stats = pstats.Stats(prof)
+            self.assertTrue(any(func[2] == "_busy" for func in stats.stats))
+            with open(mem, encoding="utf-8") as f:
+                self.assertTrue(f.readline().startswith("peak_traced_bytes: "))
+            with open(flame, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+            self.assertTrue(lines)
+            self.assertTrue(all(line.startswith("run (") and line.rsplit(" ", 1)[1].isdigit() for line in lines))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
 import math
 import unittest
+from bisect import bisect_left
+
+import numpy as np
 
 NUM_QUARTERS = 4
 MINUTE = 60
@@ -8,6 +11,103 @@ MINUTES_IN_OVER_TIME = 5
 QUARTER_TIME = MINUTES_IN_QUARTER_TIME * MINUTE
 REGULAR_TIME = QUARTER_TIME * NUM_QUARTERS
 OVER_TIME = MINUTES_IN_OVER_TIME * MINUTE
+# Reports run the clock through every overtime as if it were a full quarter;
+# game time for overtime N is the report clock minus N times this.
+OVER_TIME_OFFSET = QUARTER_TIME - OVER_TIME
+
+# PeriodTable.table columns
+PERIOD_INDEX = 0
+PERIOD_START = 1
+PERIOD_END = 2
+PERIOD_OVERTIME = 3
+
+
+def till_break(clock: int) -> int:
+    """Seconds from clock to the next break: 4 quarters, then 5-minute overtimes."""
+    if clock < REGULAR_TIME:
+        return QUARTER_TIME - (clock % QUARTER_TIME)
+    return OVER_TIME - ((clock - REGULAR_TIME) % OVER_TIME)
+
+
+def regulation_period(clock: int) -> int:
+    """0-based period of clock under the same rules; a break belongs to the period it ends."""
+    if clock <= REGULAR_TIME:
+        return max(1, min(NUM_QUARTERS, (clock + QUARTER_TIME - 1) // QUARTER_TIME)) - 1
+    return NUM_QUARTERS - 1 + (clock - REGULAR_TIME + OVER_TIME - 1) // OVER_TIME
+
+
+def period_name(index: int) -> str:
+    if index < NUM_QUARTERS:
+        return f"Q{index + 1}"
+    return f"OT{index - NUM_QUARTERS + 1}"
+
+
+class PeriodTable:
+    """Period boundaries of one match, built once and shared by every lookup.
+
+    table has one row per period: PERIOD_INDEX (0-based), PERIOD_START,
+    PERIOD_END and PERIOD_OVERTIME. A clock on a boundary belongs to the period
+    it ends.
+    """
+
+    def __init__(self, ends) -> None:
+        self.ends = np.unique(np.asarray(ends, dtype=np.int64))
+        self.end_list = self.ends.tolist()
+        n = len(self.ends)
+        self.table = np.zeros((n, 4), dtype=np.int64)
+        self.table[:, PERIOD_INDEX] = np.arange(n)
+        self.table[1:, PERIOD_START] = self.ends[:-1]
+        self.table[:, PERIOD_END] = self.ends
+        self.table[:, PERIOD_OVERTIME] = np.arange(n) >= NUM_QUARTERS
+
+    @classmethod
+    def regulation(cls, max_clock: int) -> "PeriodTable":
+        """Quarters ending at or before max_clock plus enough overtimes to cover it."""
+        ends = [QUARTER_TIME * i for i in range(1, NUM_QUARTERS + 1) if QUARTER_TIME * i <= max_clock]
+        if max_clock > REGULAR_TIME:
+            overtimes = (max_clock - REGULAR_TIME + OVER_TIME - 1) // OVER_TIME
+            ends += [REGULAR_TIME + OVER_TIME * i for i in range(1, overtimes + 1)]
+        return cls(ends or [REGULAR_TIME])
+
+    @classmethod
+    def from_markers(cls, marker_clocks, max_clock: int) -> "PeriodTable":
+        """Ends at the report's end-of-period markers, or the regulation table when it has none."""
+        if len(marker_clocks):
+            return cls(marker_clocks)
+        return cls.regulation(max_clock)
+
+    def __len__(self) -> int:
+        return len(self.ends)
+
+    def locate(self, clocks) -> tuple[np.ndarray, np.ndarray]:
+        """Period index and seconds left in it for a whole clock column.
+
+        Clocks after the last end get index len(self) and a negative remainder.
+        """
+        clocks = np.asarray(clocks, dtype=np.int64)
+        index = np.searchsorted(self.ends, clocks, side="left")
+        remaining = self.ends[np.minimum(index, len(self.ends) - 1)] - clocks
+        return index, remaining
+
+    def near_end(self, clocks, window: int = 5) -> np.ndarray:
+        """Period index for clocks within `window` seconds of their period's end, else -1."""
+        index, remaining = self.locate(clocks)
+        return np.where((index < len(self.ends)) & (remaining <= window), index, -1)
+
+    def matching_end(self, clock: int, window: int = 5) -> int | None:
+        """Scalar near_end(): the index of the period clock is about to end, or None."""
+        k = bisect_left(self.end_list, clock)
+        if k < len(self.end_list) and self.end_list[k] - window <= clock:
+            return k
+        return None
+
+    def label(self, index: int) -> str:
+        return period_name(index)
+
+    def labels(self, clocks) -> list[str]:
+        """Period names for a clock column; "" after the last end."""
+        index, _ = self.locate(clocks)
+        return [period_name(i) if i < len(self.ends) else "" for i in index.tolist()]
 
 
 class Gameclock:
@@ -33,10 +133,7 @@ class Gameclock:
         return self.clock >= (REGULAR_TIME - OVER_TIME)
 
     def till_break(self) -> int:
-        if self.clock < REGULAR_TIME:
-            return QUARTER_TIME - (self.clock % QUARTER_TIME)
-        else:
-            return OVER_TIME - ((self.clock - REGULAR_TIME) % OVER_TIME)
+        return till_break(self.clock)
 
     def minutes(self) -> int:
         if self.clock <= REGULAR_TIME and self.quarter <= NUM_QUARTERS:
@@ -97,5 +194,26 @@ class TestGameclock(unittest.TestCase):
         self.assertEqual(Gameclock(clock=720 * 4 + 300, quarter=6).to_string(), "05:00")
 
 
+class TestPeriodTable(unittest.TestCase):
+    def test_regulation(self):
+        table = PeriodTable.regulation(REGULAR_TIME + 301)
+        self.assertEqual(table.ends.tolist(), [720, 1440, 2160, 2880, 3180, 3480])
+        self.assertEqual(table.table[4].tolist(), [4, 2880, 3180, 1])
+        self.assertEqual(PeriodTable.regulation(0).ends.tolist(), [REGULAR_TIME])
+        for clock in (0, 1, 719, 720, 721, 2880, 2881, 3180, 3181):
+            self.assertEqual(table.locate([clock])[0][0], regulation_period(clock), clock)
+
+    def test_lookups(self):
+        table = PeriodTable.from_markers([1440, 720, 2880, 2160, 3600, 720], 3600)
+        self.assertEqual(table.ends.tolist(), [720, 1440, 2160, 2880, 3600])
+        index, remaining = table.locate([0, 720, 721, 3597, 3700])
+        self.assertEqual(index.tolist(), [0, 0, 1, 4, 5])
+        self.assertEqual(remaining.tolist(), [720, 0, 719, 3, -100])
+        self.assertEqual(table.near_end([714, 715, 720, 3596, 3700]).tolist(), [-1, 0, 0, 4, -1])
+        self.assertEqual([table.matching_end(c) for c in (714, 715, 720, 3596, 3700)], [None, 0, 0, 4, None])
+        self.assertEqual(table.labels([10, 2880, 2881, 3700]), ["Q1", "Q4", "OT1", ""])
+        self.assertEqual(till_break(REGULAR_TIME + 10), OVER_TIME - 10)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -64,7 +64,7 @@ class Comments:
             return self.comments[key][ty1 * 10]
         return self.comments[key][0]
 
-    def get_text(self, data: str) -> str:
+    def get_text(self, data: str, quiet: bool = False) -> str:
         loc2 = 0
         loc3 = ""
         loc4 = ""
@@ -75,7 +75,7 @@ class Comments:
         evar1 = int(data[4], 16)  # ???
         event_variation = int(data[5], 16)
 
-        if __debug__:
+        if __debug__ and not quiet:
             print(
                 "\nRaw:\n\tprefix: {}\n\tresult: {}\n\tloc9: {}\n\tvar: {}".format(
                     event_prefix, event_result, evar1, event_variation
@@ -124,7 +124,7 @@ class Comments:
 
         return loc3
 
-    def get_actors(self, event: BBEvent, teams: list[Team]):
+    def get_actors(self, event: BBEvent, teams: list[Team], quiet: bool = False):
         loc3 = event.result % 16
         loc10 = 0
 
@@ -140,7 +140,7 @@ class Comments:
         event_prefix = event.type // 100
         event_type = event.type
 
-        if __debug__:
+        if __debug__ and not quiet:
             print(
                 f"RAW2:\n\tloc3: {loc3}\n\tloc10: {loc10}\n\ttype: {event_type}\n\tprefix: {event_prefix}"
             )
@@ -198,13 +198,19 @@ class Comments:
 
         return None, "Invalid", None, "Invalid"
 
-    def get_comment(self, event: BBEvent, teams: list[Team]) -> str:
-        text = self.get_text(event.data)
-        p1, t1, p2, t2 = self.get_actors(event, teams)
+    def set_actors(self, event: BBEvent, teams: list[Team]) -> None:
+        # Resolve player objects without rendering any text (enough for convert()).
+        p1, _, p2, _ = self.get_actors(event, teams, quiet=True)
         event.player1obj = p1
         event.player2obj = p2
 
-        if __debug__:
+    def get_comment(self, event: BBEvent, teams: list[Team], quiet: bool = False) -> str:
+        text = self.get_text(event.data, quiet)
+        p1, t1, p2, t2 = self.get_actors(event, teams, quiet)
+        event.player1obj = p1
+        event.player2obj = p2
+
+        if __debug__ and not quiet:
             print(event.to_string(p1, p2))
 
         if "$player1$" in text:
@@ -237,7 +243,7 @@ class Comments:
             text = text.replace("$team1$", teams[t1].name)
 
         event.comment = text
-        if __debug__:
+        if __debug__ and not quiet:
             print(event.to_string(p1, p2))
 
         return text
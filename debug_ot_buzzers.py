@@ -7,12 +7,9 @@ from pathlib import Path
 from comments import Comments
 from event import convert, FreeThrowEvent, ShotEvent
 from main import parse_xml
-from buzzerbeaters import (
-    _build_period_ends,
-    _period_ends_from_events,
-    _period_label_from_end,
-    _matching_period_end,
-)
+from score_timeline import ScoreTimeline
+from buzzerbeaters import _report_periods
+from clocks import REGULAR_TIME
 
 
 def _match_id_from_path(path: Path) -> int | None:
@@ -20,14 +17,12 @@ def _match_id_from_path(path: Path) -> int | None:
     return int(m.group(1)) if m else None
 
 
-def _score_events_in_window(baseevents, window_start: int, window_end: int):
+def _score_events_in_window(timeline: ScoreTimeline, window_start: int, window_end: int):
     scores = []
-    for be in baseevents:
-        if be.gameclock < window_start or be.gameclock > window_end:
-            continue
-        if isinstance(be, ShotEvent) and be.has_scored():
+    for be in timeline.scoring_in(window_start, window_end):
+        if isinstance(be, ShotEvent):
             scores.append(("shot", be.gameclock, be.att_team, str(be.shot_type)))
-        elif isinstance(be, FreeThrowEvent) and be.has_scored():
+        elif isinstance(be, FreeThrowEvent):
             scores.append(("ft", be.gameclock, be.att_team, str(be.free_throw_type)))
     return scores
 
@@ -53,8 +48,8 @@ def main() -> None:
         except Exception:
             continue
 
-        max_clock = max((ev.gameclock.clock for ev in events), default=0)
-        if not args.include_non_ot and max_clock <= 2880:
+        max_clock = max((ev.gameclock for ev in events), default=0)
+        if not args.include_non_ot and max_clock <= REGULAR_TIME:
             continue
 
         comments = Comments()
@@ -63,25 +58,24 @@ def main() -> None:
                 ev.comment = comments.get_comment(ev, [ht, at])
 
         baseevents = convert(events)
-        period_ends = _period_ends_from_events(events)
-        if not period_ends:
-            period_ends = _build_period_ends(max_clock)
+        timeline = ScoreTimeline(baseevents)
+        periods = _report_periods(events)
 
         match_id = _match_id_from_path(path)
-        print(f"match_id={match_id} max_clock={max_clock} period_ends={period_ends}")
+        print(f"match_id={match_id} max_clock={max_clock} period_ends={periods.end_list}")
 
         # Comments near period end
         near_end_comments = []
         buzzer_comments = []
         for ev in events:
-            end = _matching_period_end(ev.gameclock.clock, period_ends)
-            if end is None:
+            index = periods.matching_end(ev.gameclock)
+            if index is None:
                 continue
             comment = (ev.comment or "").strip()
             if not comment:
                 continue
-            label = _period_label_from_end(end, period_ends)
-            line = (ev.gameclock.clock, label, comment)
+            label = periods.label(index)
+            line = (ev.gameclock, label, comment)
             near_end_comments.append(line)
             if "buzzer" in comment.lower():
                 buzzer_comments.append(line)
@@ -96,12 +90,12 @@ def main() -> None:
                 print(f"  buzzer_comment t={clock} {label}: {comment}")
 
         # Scoring events near period ends
-        for end in period_ends:
+        for index, end in enumerate(periods.end_list):
             window_start = end - 5
-            scores = _score_events_in_window(baseevents, window_start, end)
+            scores = _score_events_in_window(timeline, window_start, end)
             if not scores:
                 continue
-            label = _period_label_from_end(end, period_ends)
+            label = periods.label(index)
             print(f"  scores near end {label} ({window_start}-{end}):")
             for kind, clock, team, shot_type in scores:
                 tname = ht.name if team == 0 else at.name
@@ -1,7 +1,6 @@
 from enum import IntEnum, auto
 from venv import create
 
-from clocks import Gameclock
 from team import Team, opponent
 from player import Player
 import math
@@ -354,13 +353,22 @@ class BBEvent:
         self.variation = variation
         self.player1 = player1
         self.player2 = player2
-        self.gameclock = Gameclock(gameclock)
+        self.gameclock = gameclock
         self.realclock = realclock
         self.data = data
         self.comment = ""
         self.player1obj: Player
         self.player2obj: Player
 
+    def is_buzzerbeater(self) -> bool:
+        # Raw codes behind commentary key e21409 ("A buzzerbeater for $player1$!"):
+        # type 140, result 9, special-event flag 2.
+        return self.data[0:5] == "14092"
+
+    def is_end_of_period(self) -> bool:
+        # Raw codes behind commentary key e9619 ("End of period.").
+        return self.data[0:5] == "96190"
+
     def __repr__(self) -> str:
         return """BBEvent
             team: {}
@@ -380,7 +388,7 @@ class BBEvent:
             self.variation,
             self.player1,
             self.player2,
-            self.gameclock.clock,
+            self.gameclock,
             self.realclock,
             self.data,
             self.comment,
@@ -406,7 +414,7 @@ class BBEvent:
             self.player1,
             p2,
             self.player2,
-            self.gameclock.clock,
+            self.gameclock,
             self.realclock,
             self.data,
             self.comment,
@@ -423,7 +431,7 @@ def convert(events: list[BBEvent]) -> list[BaseEvent]:
         bb_idx += 1
 
         comments = [event.comment]
-        clocks = Clocks(event.gameclock.clock, event.realclock, 0)
+        clocks = Clocks(event.gameclock, event.realclock, 0)
 
         etype = event.type
         eprefix = etype // 100
@@ -449,7 +457,7 @@ def convert(events: list[BBEvent]) -> list[BaseEvent]:
                 event.type,
                 event.player1obj.id,
                 event.player1obj.name,
-                event.gameclock.clock,
+                event.gameclock,
             )
 
             result_event = events[bb_idx]
@@ -950,10 +958,16 @@ def create_shot(
 def shotchart_main():
     import argparse
     from pathlib import Path
-    from shot_chart import ShotChart
+    from shot_chart import HEATMAP_LAYERS, HeatmapChart, ShotChart
 
     parser = argparse.ArgumentParser()
     parser.add_argument("event_type", type=int, help="Event type used to generate chart")
+    parser.add_argument(
+        "--heatmap",
+        choices=HEATMAP_LAYERS,
+        default=None,
+        help="Render a binned heatmap layer instead of one marker per shot",
+    )
     parser.add_argument(
         "--out",
         default=None,
@@ -961,7 +975,7 @@ def shotchart_main():
     )
     args = parser.parse_args()
 
-    sc = ShotChart()
+    sc = HeatmapChart(args.heatmap) if args.heatmap else ShotChart()
 
     for i in range(2880):
         shot = create_shot(0, args.event_type, 51805514, "", i + 1)
@@ -1,12 +1,16 @@
+from __future__ import annotations
+
 import argparse
 import os
 import xml.etree.ElementTree as ET
 from datetime import datetime
-
-import requests
+from typing import TYPE_CHECKING
 
 from main import get_xml_text
 
+if TYPE_CHECKING:
+    import requests
+
 
 def _load_env(path: str = ".env") -> None:
     if not os.path.exists(path):
@@ -80,6 +84,8 @@ def main() -> None:
     parser.add_argument("--season", type=int, required=True)
     args = parser.parse_args()
 
+    import requests
+
     _load_env()
     session = requests.Session()
     _login(session)
@@ -1,6 +1,5 @@
-from typing import Dict
-
 from bbapi import BBApi
+from clocks import NUM_QUARTERS, OVER_TIME_OFFSET, till_break
 from team import Team
 from comments import Comments
 from event import *
@@ -8,11 +7,39 @@ from event_types import *
 from stats import *
 import json
 
+import numpy as np
+
+
+EXTENSION_HOOKS = (
+    "on_shot_event",
+    "on_interrupt_event",
+    "on_foul_event",
+    "on_rebound_event",
+    "on_free_throw_event",
+    "on_injury_event",
+    "on_sub_event",
+    "on_break_event",
+)
+
 
 class Extension:
+    # Hook names this extension wants to receive, or None for every hook it
+    # overrides. Hooks left as the base no-ops are never dispatched.
+    hooks: tuple[str, ...] | None = None
+
     def __init__(self):
         pass
 
+    def handlers(self) -> dict:
+        wanted = EXTENSION_HOOKS if self.hooks is None else self.hooks
+        bound = {}
+        for name in wanted:
+            if name not in EXTENSION_HOOKS:
+                raise ValueError(f"Unknown extension hook {name!r}")
+            if getattr(type(self), name) is not getattr(Extension, name):
+                bound[name] = getattr(self, name)
+        return bound
+
     def on_shot_event(self, game, event):
         pass
 
@@ -38,6 +65,39 @@ class Extension:
         pass
 
 
+class PlayOptions:
+    """Switches consulted by Game.play.
+
+    Game also accepts the bbinsider argparse namespace; anything missing there
+    keeps the CLI behaviour (comments, shot charts and stat logging on). The
+    defaults here are for headless batch runs.
+    """
+
+    def __init__(
+        self,
+        print_events: bool = False,
+        print_stats: bool = False,
+        save_charts: bool = False,
+        verify: bool = False,
+        username: str | None = None,
+        password: str | None = None,
+        render_comments: bool = False,
+        shot_charts: bool = False,
+        verbose: bool = False,
+        chart_style: str = "dots",
+    ) -> None:
+        self.print_events = print_events
+        self.print_stats = print_stats
+        self.save_charts = save_charts
+        self.verify = verify
+        self.username = username
+        self.password = password
+        self.render_comments = render_comments
+        self.shot_charts = shot_charts
+        self.verbose = verbose
+        self.chart_style = chart_style
+
+
 class Game:
     def __init__(
         self,
@@ -45,13 +105,17 @@ class Game:
         events: list[BBEvent],
         ht: Team,
         at: Team,
-        args,
-        extensions: list[Extension],
+        args=None,
+        extensions: list[Extension] | None = None,
+        comments: Comments | None = None,
     ) -> None:
+        if args is None:
+            args = PlayOptions()
         self.matchid = matchid
         self.events = events
         self.teams = [ht, at]
-        self.comments = Comments()
+        # The commentary catalog is read-only; callers playing many games share one.
+        self.comments = comments if comments is not None else Comments()
         self.gameclock = 0
         self.shotclock = 24
         self.poss = 0
@@ -60,10 +124,24 @@ class Game:
         self.args = args
         self.event_index = 0
         self.baseevents: list[BaseEvent] = []
-        self.extensions = extensions
+        self.extensions = extensions if extensions is not None else []
+        # Possession ledger the game always keeps; its rows are also booked
+        # into the on-court stints, so both count the same possessions.
+        self.possessions = Possessions()
+        # Hook name -> bound handlers, so events only reach extensions that
+        # actually override that hook.
+        self.handlers: dict[str, list] = {name: [] for name in EXTENSION_HOOKS}
+        for ext in self.extensions:
+            for name, handler in ext.handlers().items():
+                self.handlers[name].append(handler)
+        self.render_comments = getattr(args, "render_comments", True)
+        self.shot_charts = getattr(args, "shot_charts", True) or args.save_charts
+        for team in self.teams:
+            team.verbose = getattr(args, "verbose", True)
+            team.chart_style = getattr(args, "chart_style", "dots")
 
     def update_clocks(self, shot: int, game: int):
-        self.shotclock = min(shot, Gameclock(game).till_break())
+        self.shotclock = min(shot, till_break(game))
         self.gameclock = game
 
         if self.args.print_events:
@@ -81,19 +159,29 @@ class Game:
         if self.args.print_events:
             print(f"Next possession: {self.teams[self.poss].name}")
 
+    def track_possessions(self, hook: str, bev) -> None:
+        # Run one Possessions hook and credit the possessions it ended to the
+        # lineups on court.
+        ledger = self.possessions
+        known = len(ledger.rows)
+        getattr(ledger, hook)(self, bev)
+        for team, *_ in ledger.rows[known:]:
+            self.teams[team].add_possession(True)
+            self.teams[opponent(team)].add_possession(False)
+
     def gameclock_normalized(self, gameclock: int):
         # TODO: translate gameclock at first parse
         clock = gameclock
-        if self.quarter > 4:
-            clock -= (self.quarter - 4) * 420
+        if self.quarter > NUM_QUARTERS:
+            clock -= (self.quarter - NUM_QUARTERS) * OVER_TIME_OFFSET
         return clock
 
     def play(self) -> None:
-        idx = 0
         for event in self.events:
-            comment = self.comments.get_comment(event, self.teams)
-            event.comment = comment
-            idx += 1
+            if self.render_comments:
+                event.comment = self.comments.get_comment(event, self.teams)
+            else:
+                self.comments.set_actors(event, self.teams)
 
         for team in self.teams:
             team.push_stat_sheet()
@@ -132,15 +220,14 @@ class Game:
                 if bev.has_scored():
                     att_team.add_stats(Statistic.FieldGoalsMade, 1, bev.attacker)
                     att_team.add_stats(Statistic.Points, pts, bev.attacker)
-                    for player in att_team.active:
-                        player.add_stats(Statistic.PlusMinus, pts)
-                    for player in def_team.active:
-                        player.add_stats(Statistic.PlusMinus, -pts)
-                    att_team.shot_chart.add_made(bev.shot_pos.x, bev.shot_pos.y)
+                    att_team.add_points_for(pts)
+                    def_team.add_points_against(pts)
+                    if self.shot_charts:
+                        att_team.shot_chart.add_made(bev.shot_pos.x, bev.shot_pos.y)
                     if not bev.is_fouled():
                         self.update_clocks(24, gameclock)
                         self.update_possession(bev.def_team)
-                else:
+                elif self.shot_charts:
                     att_team.shot_chart.add_miss(bev.shot_pos.x, bev.shot_pos.y)
 
                 if bev.is_blocked():
@@ -149,8 +236,9 @@ class Game:
                 if bev.is_assisted():
                     att_team.add_stats(Statistic.Assists, 1, bev.assistant)
 
-                for ext in self.extensions:
-                    ext.on_shot_event(self, bev)
+                self.track_possessions("on_shot_event", bev)
+                for handler in self.handlers["on_shot_event"]:
+                    handler(self, bev)
 
             elif isinstance(bev, FreeThrowEvent):
                 att_team = self.teams[bev.att_team]
@@ -161,13 +249,12 @@ class Game:
                     att_team.add_stats(Statistic.FreeThrowsMade, 1, bev.attacker)
                     att_team.add_stats(Statistic.Points, 1, bev.attacker)
 
-                    for player in att_team.active:
-                        player.add_stats(Statistic.PlusMinus, 1)
-                    for player in def_team.active:
-                        player.add_stats(Statistic.PlusMinus, -1)
+                    att_team.add_points_for(1)
+                    def_team.add_points_against(1)
 
-                for ext in self.extensions:
-                    ext.on_free_throw_event(self, bev)
+                self.track_possessions("on_free_throw_event", bev)
+                for handler in self.handlers["on_free_throw_event"]:
+                    handler(self, bev)
 
             elif isinstance(bev, ReboundEvent):
                 att_team = self.teams[bev.att_team]
@@ -197,8 +284,9 @@ class Game:
                             bev.att_team,
                         ]
 
-                for ext in self.extensions:
-                    ext.on_rebound_event(self, bev)
+                self.track_possessions("on_rebound_event", bev)
+                for handler in self.handlers["on_rebound_event"]:
+                    handler(self, bev)
 
             elif isinstance(bev, InterruptEvent):
                 att_team = self.teams[bev.att_team]
@@ -228,8 +316,9 @@ class Game:
                     self.update_clocks(24, gameclock)
                     self.update_possession(bev.def_team)
 
-                for ext in self.extensions:
-                    ext.on_interrupt_event(self, bev)
+                self.track_possessions("on_interrupt_event", bev)
+                for handler in self.handlers["on_interrupt_event"]:
+                    handler(self, bev)
 
             elif isinstance(bev, FoulEvent):
                 att_team = self.teams[bev.att_team]
@@ -259,14 +348,15 @@ class Game:
                 ):
                     def_team.add_stats(Statistic.Fouls, 1, bev.defender)
 
-                for ext in self.extensions:
-                    ext.on_foul_event(self, bev)
+                self.track_possessions("on_foul_event", bev)
+                for handler in self.handlers["on_foul_event"]:
+                    handler(self, bev)
 
             elif isinstance(bev, InjuryEvent):
                 self.patch_clock(bev, prev_bev)
 
-                for ext in self.extensions:
-                    ext.on_injury_event(self, bev)
+                for handler in self.handlers["on_injury_event"]:
+                    handler(self, bev)
 
             elif isinstance(bev, SubEvent):
                 team = self.teams[bev.team]
@@ -279,10 +369,13 @@ class Game:
                 else:
                     team.make_swap(bev.player_in, bev.player_out)
 
-                for ext in self.extensions:
-                    ext.on_sub_event(self, bev)
+                for handler in self.handlers["on_sub_event"]:
+                    handler(self, bev)
 
             elif isinstance(bev, BreakEvent):
+                # Before the break closes the stints of the period.
+                self.track_possessions("on_break_event", bev)
+
                 if bev.break_type == BreakType.END_OF_QUARTER:
                     self.update_clocks(24, bev.gameclock)
 
@@ -290,8 +383,8 @@ class Game:
                         self.quarter < 4
                         or self.teams[0].points() == self.teams[1].points()
                     ):
-                        self.teams[0].push_stat_sheet()
-                        self.teams[1].push_stat_sheet()
+                        self.teams[0].push_stat_sheet(gameclock)
+                        self.teams[1].push_stat_sheet(gameclock)
                         self.quarter += 1
 
                     if self.quarter <= 4:
@@ -306,8 +399,8 @@ class Game:
                 elif bev.break_type == BreakType.TIMEOUT_60:
                     self.teams[bev.team].add_stats(Statistic.Timeouts60, 1)
 
-                for ext in self.extensions:
-                    ext.on_break_event(self, bev)
+                for handler in self.handlers["on_break_event"]:
+                    handler(self, bev)
 
             if (
                 idx + 1 < len(self.baseevents)
@@ -318,6 +411,10 @@ class Game:
             ) or bev.gameclock == -1:
                 prev_bev = bev
 
+        # Reports normally end with END_OF_GAME, which already settled this.
+        for team in self.teams:
+            team.credit_plus_minus()
+
         for team in reversed(self.teams):
             if self.args.print_stats:
                 team.print_stats()
@@ -331,7 +428,7 @@ class Game:
             assert bbteams[0] == self.teams[1]
             assert bbteams[1] == self.teams[0]
 
-    def save(self, filename):
+    def to_dict(self, include_events: bool = True, comments: bool = True) -> dict:
         teams = []
         for tid, team in enumerate(self.teams):
             players = []
@@ -358,46 +455,190 @@ class Game:
             t = {"id": team.id, "name": team.name, "players": players, "stats": stats}
             teams.append(t)
 
-        events = []
-        for event in self.baseevents:
-            events.append(event.to_json())
-
         game = {
             "teamHome": teams[0],
             "teamAway": teams[1],
-            "events": events,
         }
+        if include_events:
+            game["events"] = list(self.events_json(comments))
+
+        return game
 
-        with open(filename, "w", encoding='utf-8') as f:
-            json.dump(game, f, indent=4, ensure_ascii=False)
+    def events_json(self, comments: bool = True):
+        for event in self.baseevents:
+            data = event.to_json()
+            if not comments:
+                data.pop("comments", None)
+            yield data
+
+    def save(self, filename, fmt: str = "json", comments: bool = True):
+        if fmt == "json":
+            with open(filename, "w", encoding='utf-8') as f:
+                json.dump(self.to_dict(comments=comments), f, indent=4, ensure_ascii=False)
+        elif fmt == "compact":
+            with open(filename, "w", encoding='utf-8') as f:
+                json.dump(self.to_dict(comments=comments), f, separators=(",", ":"), ensure_ascii=False)
+        elif fmt == "ndjson":
+            # First line is the box score, then one event per line.
+            with open(filename, "w", encoding='utf-8') as f:
+                f.write(_ndjson_line(self.to_dict(include_events=False)))
+                for data in self.events_json(comments):
+                    f.write(_ndjson_line(data))
+        elif fmt == "npz":
+            self.save_npz(filename, comments)
+        else:
+            raise ValueError(f"Unknown save format {fmt!r}, expected one of {SAVE_FORMATS}")
+
+    def save_npz(self, filename, comments: bool = True):
+        """Columnar events and per-period stat arrays in one .npz.
+
+        Every non-comment key of the event JSON becomes an int64 column
+        (enum codes as ints, MISSING where an event has no such field);
+        event_type and, optionally, newline-joined comments are string
+        columns. Stat arrays are entity x (total + periods) x Statistic, as
+        stored in Stats.data.
+        """
+        rows = list(self.events_json(comments))
+        keys = sorted({k for row in rows for k in row} - {"event_type", "comments"})
+        arrays = {"event_type": np.array([row["event_type"] for row in rows], dtype=str)}
+        for key in keys:
+            column = np.full(len(rows), MISSING, dtype=np.int64)
+            for i, row in enumerate(rows):
+                val = row.get(key)
+                if val is not None:
+                    column[i] = int(val)
+            arrays[f"event_{key}"] = column
+        if comments:
+            arrays["comments"] = np.array(["\n".join(row.get("comments", [])) for row in rows], dtype=str)
+
+        for side, team in zip(("home", "away"), self.teams):
+            periods = team.stats.periods + 1
+            arrays[f"{side}_team"] = np.array([team.id], dtype=np.int64)
+            arrays[f"{side}_name"] = np.array([team.name], dtype=str)
+            arrays[f"{side}_stats"] = team.stats.data[:periods]
+            arrays[f"{side}_player_ids"] = np.array([p.id for p in team.players], dtype=np.int64)
+            arrays[f"{side}_player_names"] = np.array([p.name for p in team.players], dtype=str)
+            arrays[f"{side}_player_starters"] = np.array([p.starter for p in team.players], dtype=bool)
+            player_stats = np.zeros((len(team.players), periods, Statistic.TeamStats), dtype=np.int64)
+            for i, player in enumerate(team.players):
+                n = min(player.stats.periods + 1, periods)
+                player_stats[i, :n] = player.stats.data[:n]
+            arrays[f"{side}_player_stats"] = player_stats
+
+        # A file object keeps numpy from appending ".npz" to custom paths.
+        with open(filename, "wb") as f:
+            np.savez_compressed(f, **arrays)
+
+
+SAVE_FORMATS = ("json", "compact", "ndjson", "npz")
+SAVE_SUFFIXES = {"json": ".json", "compact": ".json", "ndjson": ".ndjson", "npz": ".npz"}
+# Fill value for npz event columns an event type does not have.
+MISSING = -1
+
+
+def _ndjson_line(data: dict) -> str:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False) + "\n"
+
+
+def compute_boxscore(
+    events: list[BBEvent],
+    ht: Team,
+    at: Team,
+    options: PlayOptions | None = None,
+    include_events: bool = False,
+    matchid: str = "",
+    comments: Comments | None = None,
+) -> dict:
+    """Run the stat engine without CLI coupling and return the Game.save payload.
+
+    With the default options nothing is printed or drawn and commentary is not
+    rendered, so only the box score is meaningful; pass
+    PlayOptions(render_comments=True) with include_events=True for the full
+    Game.save output.
+    """
+    game = Game(matchid, events, ht, at, options or PlayOptions(), comments=comments)
+    game.play()
+    return game.to_dict(include_events=include_events)
+
+
+# Possession outcomes in Possessions.table()
+POSS_SCORE = 0
+POSS_TURNOVER = 1
+POSS_MISS = 2
+POSS_END_OF_PERIOD = 3
+
+# Possessions.table() columns
+POSS_TEAM = 0
+POSS_START = 1
+POSS_END = 2
+POSS_SHOTCLOCK_USED = 3
+POSS_OUTCOME = 4
+POSS_POINTS = 5
 
 
 class Possessions(Extension):
     def __init__(self) -> None:
         super().__init__()
         self.possessions: list[list[int]] = [[], []]
-
-    def add_possession(self, game: Game, team, shotclock):
+        # (team, start clock, end clock, shot clock used, outcome, points)
+        self.rows: list[tuple[int, int, int, int, int, int]] = []
+        self.start = 0
+        # Points scored by each team since its previous possession ended; they
+        # are booked when the possession that earned them ends.
+        self.points = [0, 0]
+        # Shot clock left at the last foul; free throws run with it stopped.
+        self.foul_shotclock = 0
+
+    def add_possession(self, game: Game, team, shotclock, outcome=POSS_SCORE, clock=None):
         assert team == 0 or team == 1
         assert shotclock >= 0 and shotclock <= 24, f"Got shotclock {shotclock}!"
         self.possessions[team].append(shotclock)
 
+        end = game.gameclock if clock is None else clock
+        self.rows.append((team, self.start, end, 24 - shotclock, outcome, self.points[team]))
+        self.points[team] = 0
+        self.start = end
+
         if game.args.print_events:
             print(
                 f"nPossessions: {len(self.possessions[1])}:{len(self.possessions[0])} (+1 {game.teams[team].name})"
             )
 
+    def table(self) -> np.ndarray:
+        # possessions x POSS_* columns
+        return np.array(self.rows, dtype=np.int64).reshape(-1, 6)
+
     def on_shot_event(self, game, event: ShotEvent):
-        # For other shot results the def teams needs to rebound ball first
-        if event.shot_result in (ShotResult.SCORED, ShotResult.GOALTEND):
-            self.add_possession(game, event.att_team, event.shotclock)
+        # Missed shots end with the defensive rebound
+        if event.has_scored():
+            self.points[event.att_team] += 3 if event.is_3pt() else 2
+            # An and-one ends with its free throw. SCORED_WITH_FOUL alone is
+            # not enough: convert() also sets it when the next foul is elsewhere.
+            if not _same_trip(_next_event(game), event):
+                self.add_possession(game, event.att_team, event.shotclock, POSS_SCORE, event.gameclock)
+
+    def on_free_throw_event(self, game, event: FreeThrowEvent):
+        if event.has_scored():
+            self.points[event.att_team] += 1
+        nxt = _next_event(game)
+        if _same_trip(nxt, event):
+            return
+        if event.has_scored():
+            self.add_possession(game, event.att_team, self.foul_shotclock, POSS_SCORE, event.gameclock)
+        elif not isinstance(nxt, ReboundEvent) and not (
+            isinstance(nxt, BreakEvent) and nxt.break_type in (BreakType.END_OF_QUARTER, BreakType.END_OF_GAME)
+        ):
+            # A missed last free throw is played on by the rebound; without
+            # one in the report the other team has the ball.
+            self.add_possession(game, event.att_team, self.foul_shotclock, POSS_MISS, event.gameclock)
 
     def on_interrupt_event(self, game, event: InterruptEvent):
-        self.add_possession(game, event.att_team, event.shotclock)
+        self.add_possession(game, event.att_team, event.shotclock, POSS_TURNOVER, event.gameclock)
 
     def on_foul_event(self, game, event: FoulEvent):
+        self.foul_shotclock = event.shotclock
         if event.foul_type == FoulType.OFFENSIVE_FOUL:
-            self.add_possession(game, event.att_team, event.shotclock)
+            self.add_possession(game, event.att_team, event.shotclock, POSS_TURNOVER, event.gameclock)
         # elif (
         #     event.foul_type == FoulType.PERSONAL_FOUL
         #     and game.teams[event.def_team]
@@ -411,33 +652,60 @@ class Possessions(Extension):
         # Defensive team gained possession by rebounding ball
         # game.poss is already reflecting possession change
         if game.poss == event.def_team:
-            self.add_possession(game, event.att_team, event.shotclock)
-
-    def on_free_throw_event(self, game: Game, event: FreeThrowEvent):
-        pass
-
-    def on_injury_event(self, game: Game, event: InjuryEvent):
-        pass
-
-    def on_sub_event(self, game: Game, event: SubEvent):
-        pass
+            self.add_possession(game, event.att_team, event.shotclock, POSS_MISS, event.gameclock)
 
     def on_break_event(self, game: Game, event: BreakEvent):
-        if event.break_type == BreakType.END_OF_QUARTER:
+        # Reports end with END_OF_QUARTER then END_OF_GAME; either closes the period.
+        if event.break_type in (BreakType.END_OF_QUARTER, BreakType.END_OF_GAME):
             prev_bev = game.baseevents[game.event_index - 1]
             if isinstance(prev_bev, ShotEvent) and prev_bev.shot_result not in (
                 ShotResult.SCORED,
                 ShotResult.GOALTEND,
             ):
-                self.add_possession(game, prev_bev.att_team, event.shotclock)
-            elif isinstance(prev_bev, FreeThrowEvent):
-                self.add_possession(game, prev_bev.att_team, event.shotclock)
+                self.add_possession(game, prev_bev.att_team, event.shotclock, POSS_END_OF_PERIOD, event.gameclock)
+            elif isinstance(prev_bev, FreeThrowEvent) and not prev_bev.has_scored():
+                self.add_possession(game, prev_bev.att_team, event.shotclock, POSS_END_OF_PERIOD, event.gameclock)
+            # Points still open (say a made first free throw, then an
+            # offensive rebound at the buzzer) end with the period.
+            for team in (0, 1):
+                if self.points[team]:
+                    self.add_possession(game, team, event.shotclock, POSS_END_OF_PERIOD, event.gameclock)
+            # The next period starts from a fresh possession.
+            self.start = event.gameclock
+
+
+def _next_event(game: Game):
+    # Substitutions may fall between a foul and its free throws.
+    for bev in game.baseevents[game.event_index + 1 :]:
+        if not isinstance(bev, SubEvent):
+            return bev
+    return None
+
+
+def _same_trip(bev, event) -> bool:
+    # A trip is the fouled team's foul and free throws at one game clock.
+    return (
+        isinstance(bev, (FoulEvent, FreeThrowEvent))
+        and bev.att_team == event.att_team
+        and bev.gameclock == event.gameclock
+    )
+
+
+# Dense index of every ShotType code, so per-type counts fit in fixed arrays.
+SHOT_TYPES = list(ShotType)
+SHOT_TYPE_INDEX = {int(t): i for i, t in enumerate(SHOT_TYPES)}
+SHOT_RESULTS = len(ShotResult)
+ROSTER_SIZE = 12
 
 
 class ShotTypes(Extension):
+    hooks = ("on_shot_event",)
+
     def __init__(self) -> None:
         super().__init__()
-        self.shot_types: list[Dict[ShotType, list[int]]] = [{}, {}]
+        # team x shot type x ShotResult, and team x roster index x shot type x ShotResult
+        self.counts = np.zeros((2, len(SHOT_TYPES), SHOT_RESULTS), dtype=np.int64)
+        self.player_counts = np.zeros((2, ROSTER_SIZE, len(SHOT_TYPES), SHOT_RESULTS), dtype=np.int64)
 
     def table(self, game: Game) -> str:
         from tabulate import tabulate
@@ -452,47 +720,14 @@ class ShotTypes(Extension):
             "Scored Fouled",
         ]
         tables: list[list[list[str]]] = [[], []]
-        for index, team in enumerate(self.shot_types):
-            for shot_type, results in team.items():
-                tables[index].append(
-                    [
-                        str(shot_type),
-                        str(results[0]),
-                        str(results[1]),
-                        str(results[2]),
-                        str(results[3]),
-                        str(results[4]),
-                        str(results[5]),
-                    ]
-                )
+        for index, team in enumerate(self.counts):
+            for k in np.flatnonzero(team.sum(axis=1)):
+                tables[index].append([str(SHOT_TYPES[k]), *(str(n) for n in team[k].tolist())])
         return f"{game.teams[0].name}:\n{tabulate(tables[0], headers=headers)}\n\n{game.teams[1].name}:\n{tabulate(tables[1], headers=headers)}"
 
     def on_shot_event(self, game: Game, event: ShotEvent):
         result = int(event.shot_result)
-
-        shot_type = self.shot_types[event.att_team].get(
-            str(event.shot_type), [0, 0, 0, 0, 0, 0]
-        )
-        shot_type[result] += 1
-        self.shot_types[event.att_team][str(event.shot_type)] = shot_type
-
-    def on_interrupt_event(self, game: Game, event: InterruptEvent):
-        pass
-
-    def on_foul_event(self, game: Game, event: FoulEvent):
-        pass
-
-    def on_rebound_event(self, game: Game, event: ReboundEvent):
-        pass
-
-    def on_free_throw_event(self, game: Game, event: FreeThrowEvent):
-        pass
-
-    def on_injury_event(self, game: Game, event: InjuryEvent):
-        pass
-
-    def on_sub_event(self, game: Game, event: SubEvent):
-        pass
-
-    def on_break_event(self, game: Game, event: BreakEvent):
-        pass
+        k = SHOT_TYPE_INDEX[int(event.shot_type)]
+        self.counts[event.att_team, k, result] += 1
+        if 0 < event.attacker <= ROSTER_SIZE:
+            self.player_counts[event.att_team, event.attacker - 1, k, result] += 1
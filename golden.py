@@ -0,0 +1,353 @@
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import random
+import re
+import sys
+import time
+import unittest
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from buzzerbeaters import _find_buzzerbeaters_full, _find_buzzerbeaters_windowed, _is_shot_record, hit_record
+from game import Game, PlayOptions, compute_boxscore
+from main import AWAY_IDS_END, EVENT_LEN, EVENTS_OFFSET, HOME_IDS_END, HOME_STARTERS_END, parse_xml
+from parallel import imap_bounded
+
+# Compared in this order; a candidate may produce any subset of them.
+SECTIONS = ("events", "base_events", "boxscore", "buzzerbeaters")
+VARIANTS = ("swap", "truncate", "rename")
+
+_MISSING = "<missing>"
+_SECTION_INDEX = re.compile(r"^(\w+)\[(\d+)\]")
+
+
+def _event_row(ev) -> dict:
+    return {
+        "team": ev.team,
+        "type": ev.type,
+        "result": ev.result,
+        "variation": ev.variation,
+        "player1": ev.player1,
+        "player2": ev.player2,
+        "gameclock": ev.gameclock,
+        "realclock": ev.realclock,
+        "data": ev.data,
+        "comment": ev.comment,
+    }
+
+
+def _plain(value):
+    # Outputs are compared as JSON values, so in-process runs and golden files agree.
+    return json.loads(json.dumps(value, default=int))
+
+
+def reference_pipeline(text: str, matchid: str = "") -> dict:
+    """parse_xml, Comments.get_comment, convert and Game.play/Game.save output,
+    plus the fully rendered buzzerbeater scan."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        events, ht, at = parse_xml(text)
+        game = Game(matchid, events, ht, at, PlayOptions(render_comments=True))
+        game.play()
+        hits, hht, hat = _find_buzzerbeaters_full(text)
+    return _plain(
+        {
+            "events": [_event_row(ev) for ev in game.events],
+            "base_events": list(game.events_json()),
+            "boxscore": game.to_dict(include_events=False),
+            "buzzerbeaters": [hit_record(ev, hht, hat) for ev in hits],
+        }
+    )
+
+
+def fast_pipeline(text: str, matchid: str = "") -> dict:
+    """The fast paths in this tree: box score without commentary and the windowed buzzerbeater scan."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        events, ht, at = parse_xml(text)
+        boxscore = compute_boxscore(events, ht, at, matchid=matchid)
+        hits, hht, hat = _find_buzzerbeaters_windowed(text)
+    return _plain({"boxscore": boxscore, "buzzerbeaters": [hit_record(ev, hht, hat) for ev in hits]})
+
+
+def load_pipeline(spec: str):
+    """'module:function' -> callable(text, matchid) returning a dict of SECTIONS."""
+    module, _, name = spec.partition(":")
+    if not name:
+        raise ValueError(f"Pipeline must be module:function, got {spec!r}")
+    return getattr(importlib.import_module(module), name)
+
+
+def _run(pipeline, text: str, matchid: str) -> dict:
+    # A crash is an output too: both pipelines must fail the same way.
+    try:
+        return pipeline(text, matchid)
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+def first_divergence(ref, cand, path: str = ""):
+    """(path, reference value, candidate value) of the first difference, or None."""
+    if isinstance(ref, dict) and isinstance(cand, dict):
+        for key in list(ref) + [k for k in cand if k not in ref]:
+            sub = f"{path}.{key}" if path else str(key)
+            if key not in ref or key not in cand:
+                return sub, ref.get(key, _MISSING), cand.get(key, _MISSING)
+            found = first_divergence(ref[key], cand[key], sub)
+            if found:
+                return found
+        return None
+    if isinstance(ref, list) and isinstance(cand, list):
+        for i, (a, b) in enumerate(zip(ref, cand)):
+            found = first_divergence(a, b, f"{path}[{i}]")
+            if found:
+                return found
+        if len(ref) != len(cand):
+            return f"{path}.length", len(ref), len(cand)
+        return None
+    # 1, 1.0 and True are different outputs.
+    if type(ref) is not type(cand) or ref != cand:
+        return path, ref, cand
+    return None
+
+
+def compare(ref: dict, cand: dict):
+    """First divergence over the sections the candidate produced."""
+    if "error" in ref or "error" in cand:
+        return first_divergence(ref.get("error", _MISSING), cand.get("error", _MISSING), "error")
+    for section in SECTIONS:
+        if section in cand:
+            found = first_divergence(ref.get(section, _MISSING), cand[section], section)
+            if found:
+                return found
+    return None
+
+
+def divergence_context(ref: dict, cand: dict, path: str, radius: int = 1) -> list[str]:
+    """Neighbouring list items (reference and candidate) around a divergence."""
+    match = _SECTION_INDEX.match(path)
+    if not match:
+        return []
+    section, index = match.group(1), int(match.group(2))
+    lines = []
+    for name, out in (("reference", ref), ("candidate", cand)):
+        items = out.get(section) or []
+        for i in range(max(index - radius, 0), min(index + radius + 1, len(items))):
+            marker = ">" if i == index else " "
+            lines.append(f"{marker} {name} {section}[{i}]: {json.dumps(items[i], ensure_ascii=False)}")
+    return lines
+
+
+# Synthetic reports: variants of a cached report that stay parseable but move
+# edge cases around (mirrored sides, games cut off mid-period, hostile names).
+
+_NAMES = (
+    "Ünal Şahin",
+    "D'Angelo O'Neil",
+    "Smith & Wesson",
+    "李 伟",
+    "<Lucky> Fan",
+    "Jean-Luc $player1$",
+    "A",
+    "Élodie \"The Wall\" Durand",
+)
+
+
+def _report_element(root) -> ET.Element:
+    element = root.find("ReportString")
+    if element is None or not element.text:
+        raise ValueError("Missing report string")
+    return element
+
+
+def _swap_sides(root, rng: random.Random) -> None:
+    element = _report_element(root)
+    report = element.text.strip()
+    header = (
+        report[HOME_IDS_END:AWAY_IDS_END]
+        + report[:HOME_IDS_END]
+        + report[HOME_STARTERS_END:EVENTS_OFFSET]
+        + report[AWAY_IDS_END:HOME_STARTERS_END]
+    )
+    records = [report[i : i + EVENT_LEN] for i in range(EVENTS_OFFSET, len(report), EVENT_LEN)]
+    element.text = header + "".join({"0": "1", "1": "0"}.get(rec[0], rec[0]) + rec[1:] for rec in records)
+    for child in root:
+        if child.tag in ("HomeTeam", "AwayTeam"):
+            child.tag = "AwayTeam" if child.tag == "HomeTeam" else "HomeTeam"
+        elif child.tag[:7] in ("HPlayer", "APlayer"):
+            child.tag = ("A" if child.tag[0] == "H" else "H") + child.tag[1:]
+
+
+def _truncate(root, rng: random.Random) -> None:
+    element = _report_element(root)
+    report = element.text.strip()
+    count = (len(report) - EVENTS_OFFSET) // EVENT_LEN
+    keep = rng.randrange(count // 4, count) if count > 4 else count
+    # convert() reads the record after every shot; real reports never end on one.
+    while keep < count and _is_shot_record(report[EVENTS_OFFSET + (keep - 1) * EVENT_LEN :][:EVENT_LEN]):
+        keep += 1
+    element.text = report[: EVENTS_OFFSET + keep * EVENT_LEN]
+
+
+def _rename(root, rng: random.Random) -> None:
+    for child in root:
+        if child.tag in ("HomeTeam", "AwayTeam"):
+            for field in child:
+                if field.tag in ("Name", "ShortName"):
+                    field.text = f"FC {rng.choice(_NAMES)}"
+        elif child.tag[:7] in ("HPlayer", "APlayer") and child.text:
+            child.text = rng.choice(_NAMES)
+
+
+def synthetic_report(text: str, variant: str, seed: int) -> str:
+    rng = random.Random(seed)
+    root = ET.fromstring(text)
+    {"swap": _swap_sides, "truncate": _truncate, "rename": _rename}[variant](root, rng)
+    return ET.tostring(root, encoding="unicode")
+
+
+def corpus(paths: list[Path], synthetic: int, seed: int) -> list[tuple]:
+    """(label, path, variant, seed) items: every report, then `synthetic` variants of each."""
+    items = [(path.stem, str(path), None, None) for path in paths]
+    rng = random.Random(seed)
+    for path in paths:
+        for i in range(synthetic):
+            variant = VARIANTS[i % len(VARIANTS)]
+            items.append((f"{path.stem}~{variant}{i // len(VARIANTS)}", str(path), variant, rng.randrange(2**32)))
+    return items
+
+
+def item_text(item) -> str:
+    _, path, variant, seed = item
+    text = Path(path).read_text(encoding="utf-8")
+    return synthetic_report(text, variant, seed) if variant else text
+
+
+def check_item(item, candidate: str, golden_dir: str | None) -> dict:
+    label = item[0]
+    text = item_text(item)
+    if golden_dir:
+        golden_path = Path(golden_dir) / f"{label}.json"
+        if not golden_path.exists():
+            return {"label": label, "status": "error", "message": f"no golden output {golden_path}"}
+        with open(golden_path, "r", encoding="utf-8") as f:
+            ref = json.load(f)
+    else:
+        ref = _run(reference_pipeline, text, label)
+    cand = _run(load_pipeline(candidate), text, label)
+    found = compare(ref, cand)
+    if found is None:
+        return {"label": label, "status": "ok"}
+    path, ref_value, cand_value = found
+    return {
+        "label": label,
+        "status": "diverged",
+        "path": path,
+        "reference": ref_value,
+        "candidate": cand_value,
+        "context": divergence_context(ref, cand, path),
+    }
+
+
+def record_item(item, out_dir: str) -> dict:
+    label = item[0]
+    out = _run(reference_pipeline, item_text(item), label)
+    with open(Path(out_dir) / f"{label}.json", "w", encoding="utf-8") as f:
+        json.dump(out, f, separators=(",", ":"), ensure_ascii=False)
+    return {"label": label, "status": "error" if "error" in out else "ok", "message": out.get("error")}
+
+
+def _run_all(func, items: list[tuple], workers: int, *args):
+    # Yields one result per item, in corpus order.
+    for item, result, error in imap_bounded(func, items, workers, *args):
+        yield {"label": item[0], "status": "error", "message": repr(error)} if error else result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check a candidate pipeline against the reference output, field by field.")
+    parser.add_argument("--reports", nargs="+", default=["matches/report_*.xml"], help="Report files or globs")
+    parser.add_argument("--synthetic", type=int, default=3, help="Synthetic variants per report (swap/truncate/rename)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--candidate", default="golden:fast_pipeline", help="module:function to check")
+    parser.add_argument("--golden", default=None, help="Compare against outputs saved by --record instead of running the reference")
+    parser.add_argument("--record", default=None, help="Only save reference outputs to this directory")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (default 0 = one per CPU)")
+    parser.add_argument("--show", type=int, default=5, help="Divergences to print in detail")
+    args = parser.parse_args()
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+
+    paths = []
+    for pattern in args.reports:
+        matched = sorted(Path().glob(pattern)) if any(c in pattern for c in "*?[") else [Path(pattern)]
+        paths.extend(matched)
+    paths = list(dict.fromkeys(paths))
+    if not paths:
+        parser.error("No reports found")
+    items = corpus(paths, args.synthetic, args.seed)
+
+    start = time.perf_counter()
+    if args.record:
+        Path(args.record).mkdir(parents=True, exist_ok=True)
+        failed = 0
+        for result in _run_all(record_item, items, workers, args.record):
+            if result["status"] != "ok":
+                failed += 1
+                print(f"{result['label']}: {result['message']}", file=sys.stderr)
+        print(f"recorded {len(items)} outputs ({failed} errors) -> {args.record} in {time.perf_counter() - start:.1f}s")
+        return
+
+    load_pipeline(args.candidate)
+    counts = {"ok": 0, "diverged": 0, "error": 0}
+    shown = 0
+    for result in _run_all(check_item, items, workers, args.candidate, args.golden):
+        counts[result["status"]] += 1
+        if result["status"] == "error":
+            print(f"{result['label']}: error: {result['message']}")
+        elif result["status"] == "diverged":
+            if shown < args.show:
+                print(f"{result['label']}: {result['path']}: reference {result['reference']!r}, candidate {result['candidate']!r}")
+                for line in result["context"]:
+                    print(f"    {line}")
+            else:
+                print(f"{result['label']}: {result['path']}")
+            shown += 1
+    print(
+        f"{len(items)} reports ({len(paths)} cached, {len(items) - len(paths)} synthetic): "
+        f"{counts['ok']} equal, {counts['diverged']} diverged, {counts['error']} errors "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+    if counts["diverged"] or counts["error"]:
+        sys.exit(1)
+
+
+class TestGolden(unittest.TestCase):
+    def test_first_divergence(self):
+        ref = {"events": [{"a": 1, "b": [1, 2]}, {"a": 2}], "boxscore": {"pts": 10}}
+        self.assertIsNone(compare(ref, json.loads(json.dumps(ref))))
+        cand = {"events": [{"a": 1, "b": [1, 3]}, {"a": 2.0}], "boxscore": {"pts": 10}}
+        self.assertEqual(compare(ref, cand), ("events[0].b[1]", 2, 3))
+        cand["events"][0]["b"] = [1, 2]
+        self.assertEqual(compare(ref, cand), ("events[1].a", 2, 2.0))
+        self.assertEqual(compare(ref, {"boxscore": {}}), ("boxscore.pts", 10, _MISSING))
+        self.assertEqual(compare(ref, {"events": ref["events"][:1]}), ("events.length", 2, 1))
+        self.assertEqual(len(divergence_context(ref, cand, "events[1].a")), 4)
+
+    def test_fast_pipeline_matches_reference(self):
+        paths = sorted(Path("matches").glob("report_*.xml"))[:1]
+        if not paths:
+            self.skipTest("no cached match reports")
+        text = paths[0].read_text(encoding="utf-8")
+        swapped = synthetic_report(synthetic_report(text, "swap", 1), "swap", 2)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(
+                [_event_row(ev) for ev in parse_xml(swapped)[0]],
+                [_event_row(ev) for ev in parse_xml(text)[0]],
+            )
+        for item in corpus(paths, len(VARIANTS), 0):
+            self.assertEqual(check_item(item, "golden:fast_pipeline", None)["status"], "ok", item)
+
+
+if __name__ == "__main__":
+    main()
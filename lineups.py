@@ -0,0 +1,196 @@
+import argparse
+import contextlib
+import csv
+import io
+import unittest
+from itertools import combinations
+from pathlib import Path
+
+import numpy as np
+
+from cli_args import add_matchid_args, read_match_ids
+from stints import END, PLAYERS, POSS_AGAINST, POSS_FOR, PTS_AGAINST, PTS_FOR, START, STINT_COLUMNS, TEAM
+
+
+def unit_totals(stints: np.ndarray, size: int = 5):
+    """Sum stints per team and `size`-man combination of on-court players.
+
+    Returns (keys, totals): keys is (units, 1 + size) of team id and sorted
+    player ids; totals is (units, 5) of seconds, points for/against and
+    possessions for/against. size=5 gives lineups, size=2 pairs.
+    """
+    ids = np.sort(stints[:, PLAYERS], axis=1)
+    values = np.column_stack(
+        [
+            stints[:, END] - stints[:, START],
+            stints[:, PTS_FOR],
+            stints[:, PTS_AGAINST],
+            stints[:, POSS_FOR],
+            stints[:, POSS_AGAINST],
+        ]
+    )
+    # Every stint contributes once to each of its C(5, size) combinations.
+    combos = list(combinations(range(5), size))
+    keys = np.concatenate([np.column_stack([stints[:, TEAM], ids[:, list(c)]]) for c in combos])
+    values = np.tile(values, (len(combos), 1))
+
+    if len(keys) == 0:
+        return np.zeros((0, 1 + size), dtype=np.int64), np.zeros((0, 5), dtype=np.int64)
+    units, inverse = np.unique(keys, axis=0, return_inverse=True)
+    totals = np.zeros((len(units), values.shape[1]), dtype=np.int64)
+    np.add.at(totals, inverse.ravel(), values)
+    return units, totals
+
+
+def unit_rows(units: np.ndarray, totals: np.ndarray, names: dict[int, str], min_secs: int = 0) -> list[list]:
+    keep = totals[:, 0] >= min_secs
+    units, totals = units[keep], totals[keep]
+    poss_for = np.maximum(totals[:, 3], 1)
+    poss_against = np.maximum(totals[:, 4], 1)
+    ortg = np.round(100 * totals[:, 1] / poss_for, 1)
+    drtg = np.round(100 * totals[:, 2] / poss_against, 1)
+
+    rows = []
+    for k in np.argsort(-totals[:, 0], kind="stable"):
+        team, *players = units[k].tolist()
+        secs, pf, pa, possf, possa = totals[k].tolist()
+        rows.append(
+            [
+                team,
+                " / ".join(names.get(p, str(p)) for p in players),
+                round(secs / 60, 1),
+                pf,
+                pa,
+                pf - pa,
+                possf,
+                possa,
+                float(ortg[k]),
+                float(drtg[k]),
+                round(float(ortg[k] - drtg[k]), 1),
+            ]
+        )
+    return rows
+
+
+UNIT_HEADERS = ["team_id", "players", "min", "pts_for", "pts_against", "+/-", "poss_for", "poss_against", "ortg", "drtg", "net"]
+
+
+def _play_stints(match_id) -> tuple[np.ndarray, dict[int, str]]:
+    from game import Game, PlayOptions
+    from main import get_xml_text, parse_xml
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        events, ht, at = parse_xml(get_xml_text(match_id))
+        game = Game(str(match_id), events, ht, at, PlayOptions())
+        game.play()
+    names = {player.id: player.name for team in game.teams for player in team.players if player.id}
+    return np.concatenate([team.stint_table() for team in game.teams]), names
+
+
+def match_stint_table(match_id, cache_dir: str | None = None) -> tuple[np.ndarray, dict[int, str]]:
+    """Stint table of both teams in one match, plus player names by id.
+
+    With cache_dir the table is kept as <cache_dir>/<match_id>.npz so later
+    runs skip parsing and playing the report.
+    """
+    path = Path(cache_dir) / f"{match_id}.npz" if cache_dir else None
+    if path is not None and path.exists():
+        with np.load(path) as data:
+            return data["stints"], dict(zip(data["player_ids"].tolist(), data["player_names"].tolist()))
+
+    stints, names = _play_stints(match_id)
+    if path is not None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                stints=stints,
+                player_ids=np.array(list(names), dtype=np.int64),
+                player_names=np.array(list(names.values()), dtype=str),
+            )
+    return stints, names
+
+
+def match_stints(match_ids, cache_dir: str | None = None) -> tuple[np.ndarray, np.ndarray, dict[int, str]]:
+    """Stack the stint tables of many matches.
+
+    Returns (stints, match_index, names): match_index is the position in
+    match_ids each stint row came from.
+    """
+    tables = []
+    names: dict[int, str] = {}
+    for match_id in match_ids:
+        stints, match_names = match_stint_table(match_id, cache_dir)
+        tables.append(stints)
+        names.update(match_names)
+    if not tables:
+        return np.zeros((0, STINT_COLUMNS), dtype=np.int64), np.zeros(0, dtype=np.int64), names
+    match_index = np.repeat(np.arange(len(tables)), [len(t) for t in tables])
+    return np.concatenate(tables), match_index, names
+
+
+def _write_csv(path: Path, rows: list[list]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(UNIT_HEADERS)
+        writer.writerows(rows)
+
+
+def main() -> None:
+    from tabulate import tabulate
+
+    parser = argparse.ArgumentParser(description="5-man unit and 2-man combination stats from lineup stints.")
+    add_matchid_args(parser)
+    parser.add_argument("--teamid", type=int, default=None, help="Only report units of this team")
+    parser.add_argument("--min-minutes", type=float, default=0.0, help="Hide units with less court time")
+    parser.add_argument("--out", default="output/lineups", help="Directory for units.csv and pairs.csv")
+    parser.add_argument("--cache", default="output/stints", help="Per-match stint cache directory ('' to disable)")
+    parser.add_argument("--top", type=int, default=10, help="Print the N most used units")
+    args = parser.parse_args()
+
+    match_ids = read_match_ids(args)
+    if not match_ids:
+        parser.error("Provide --matchids and/or --matchids-file")
+
+    stints, _, names = match_stints(match_ids, args.cache or None)
+    if args.teamid is not None:
+        stints = stints[stints[:, TEAM] == args.teamid]
+
+    min_secs = int(args.min_minutes * 60)
+    units = unit_rows(*unit_totals(stints, 5), names, min_secs)
+    pairs = unit_rows(*unit_totals(stints, 2), names, min_secs)
+
+    out_dir = Path(args.out)
+    _write_csv(out_dir / "units.csv", units)
+    _write_csv(out_dir / "pairs.csv", pairs)
+    print(f"{len(stints)} stints from {len(match_ids)} matches: {len(units)} units, {len(pairs)} pairs -> {out_dir}")
+    if args.top > 0 and units:
+        print(tabulate(units[: args.top], headers=UNIT_HEADERS))
+
+
+class TestUnitTotals(unittest.TestCase):
+    def setUp(self):
+        self.stints = np.zeros((2, STINT_COLUMNS), dtype=np.int64)
+        self.stints[:, TEAM] = 7
+        self.stints[0, PLAYERS] = [1, 2, 3, 4, 5]
+        self.stints[1, PLAYERS] = [5, 4, 3, 2, 6]
+        self.stints[:, START] = [0, 100]
+        self.stints[:, END] = [100, 160]
+        self.stints[:, PTS_FOR] = [10, 4]
+        self.stints[:, PTS_AGAINST] = [6, 5]
+
+    def test_lineups(self):
+        units, totals = unit_totals(self.stints, 5)
+        self.assertEqual(units.tolist(), [[7, 1, 2, 3, 4, 5], [7, 2, 3, 4, 5, 6]])
+        self.assertEqual(totals[:, :3].tolist(), [[100, 10, 6], [60, 4, 5]])
+
+    def test_pairs(self):
+        units, totals = unit_totals(self.stints, 2)
+        self.assertEqual(len(units), 10 + 4)
+        row = units.tolist().index([7, 2, 3])
+        self.assertEqual(totals[row, :3].tolist(), [160, 14, 11])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,9 @@
 #!/usr/bin/env python3
 
 import argparse
+import unittest
 from pathlib import Path
-import requests
 import xml.etree.ElementTree as XML
-from tabulate import tabulate, SEPARATING_LINE
 
 from game import *
 from event import *
@@ -13,24 +12,33 @@ from team import Team
 from bbapi import *
 
 
-def parse_report(report: str, at: Team, ht: Team) -> list[BBEvent]:
-    events = []
+# Report layout: 12 + 12 player ids (8 chars each), 5 + 5 starters, then 17-char events.
+PLAYER_ID_LEN = 8
+ROSTER_SLOTS = 12
+LINEUP_SIZE = 5
+HOME_IDS_END = ROSTER_SLOTS * PLAYER_ID_LEN
+AWAY_IDS_END = 2 * HOME_IDS_END
+HOME_STARTERS_END = AWAY_IDS_END + LINEUP_SIZE
+EVENTS_OFFSET = HOME_STARTERS_END + LINEUP_SIZE
+EVENT_LEN = 17
+
 
+def parse_report_header(report: str, at: Team, ht: Team, quiet: bool = False) -> int:
     # Read players
     i = 0
     index = 0
-    while i < 96:
-        id = int(report[i : i + 8])
-        i += 8
+    while i < HOME_IDS_END:
+        id = int(report[i : i + PLAYER_ID_LEN])
+        i += PLAYER_ID_LEN
 
         if index < len(ht.players):
             ht.players[index].id = id
         index += 1
 
     index = 0
-    while i < 192:
-        id = int(report[i : i + 8])
-        i += 8
+    while i < AWAY_IDS_END:
+        id = int(report[i : i + PLAYER_ID_LEN])
+        i += PLAYER_ID_LEN
 
         if index < len(at.players):
             at.players[index].id = id
@@ -38,74 +46,87 @@ def parse_report(report: str, at: Team, ht: Team) -> list[BBEvent]:
 
     # Read starters
     pos = 0
-    while i < 197:
+    while i < HOME_STARTERS_END:
         id = int(report[i], 16) - 1
-        if __debug__:
+        if __debug__ and not quiet:
             print("starter: ", id, f"{ht.players[id]}")
         ht.set_starter(id, pos)
         i += 1
         pos += 1
     pos = 0
-    while i < 202:
+    while i < EVENTS_OFFSET:
         id = int(report[i], 16) - 1
-        if __debug__:
+        if __debug__ and not quiet:
             print("starter: ", id, f"{at.players[id]}")
         at.set_starter(id, pos)
         i += 1
         pos += 1
 
-    # Read events
-    while i < len(report):
-        s = report[i : i + 17]
-
-        e = BBEvent(
-            team=int(s[0]),
-            type=int(s[1:4]),
-            result=int(s[4], 16),
-            variation=int(s[6], 16),
-            player1=int(s[7], 16),
-            player2=int(s[8], 16),
-            gameclock=int(s[9:13]),
-            realclock=int(s[13:17]),
-            data=s[1:9],
+    return i
+
+
+def decode_event(s: str) -> list[BBEvent]:
+    events = []
+
+    e = BBEvent(
+        team=int(s[0]),
+        type=int(s[1:4]),
+        result=int(s[4], 16),
+        variation=int(s[6], 16),
+        player1=int(s[7], 16),
+        player2=int(s[8], 16),
+        gameclock=int(s[9:13]),
+        realclock=int(s[13:17]),
+        data=s[1:9],
+    )
+
+    sub_type = e.type // 100
+    if int(s[5]) > 0:
+        e.type = -100
+        e.result = 0
+        sub_type = 99
+
+    events.append(e)
+
+    if sub_type in (1, 2, 4):
+        n = BBEvent(
+            team=e.team,
+            type=0,
+            variation=0,
+            result=e.result,
+            player1=e.player1,
+            player2=e.player2,
+            gameclock=e.gameclock,
+            realclock=e.realclock + 2,
+            data="",
         )
 
-        sub_type = e.type // 100
-        if int(s[5]) > 0:
-            e.type = -100
-            e.result = 0
-            sub_type = 99
-
-        events.append(e)
-
-        if sub_type in (1, 2, 4):
-            n = BBEvent(
-                team=e.team,
-                type=0,
-                variation=0,
-                result=e.result,
-                player1=e.player1,
-                player2=e.player2,
-                gameclock=e.gameclock.clock,
-                realclock=e.realclock + 2,
-                data="",
-            )
-
-            if n.result > 9:
-                n.result -= 9
-            if e.result > 9:
-                n.data = "000{}0000".format(e.result - 9)
-            else:
-                n.data = "000{}0000".format(e.result)
-
-            events.append(n)
-
-        i += 17
+        if n.result > 9:
+            n.result -= 9
+        if e.result > 9:
+            n.data = "000{}0000".format(e.result - 9)
+        else:
+            n.data = "000{}0000".format(e.result)
+
+        events.append(n)
 
     return events
 
 
-def parse_xml(text: str) -> tuple[list[BBEvent], Team, Team]:
+def parse_report(report: str, at: Team, ht: Team, quiet: bool = False) -> list[BBEvent]:
+    events = []
+
+    i = parse_report_header(report, at, ht, quiet)
+
+    # Read events
+    while i < len(report):
+        events.extend(decode_event(report[i : i + EVENT_LEN]))
+        i += EVENT_LEN
+
+    return events
+
+
+def parse_match_xml(text: str) -> tuple[str, Team, Team]:
     tree = XML.ElementTree(XML.fromstring(text))
     root = tree.getroot()
 
@@ -157,7 +178,13 @@ def parse_xml(text: str) -> tuple[list[BBEvent], Team, Team]:
     while len(at.players) < 12:
         at.players.append(Player("Lucky Fan"))
 
-    events = parse_report(report, at, ht)
+    return (report, ht, at)
+
+
+def parse_xml(text: str, quiet: bool = False) -> tuple[list[BBEvent], Team, Team]:
+    # quiet skips the __debug__ chatter; threaded callers cannot redirect stdout.
+    report, ht, at = parse_match_xml(text)
+    events = parse_report(report, at, ht, quiet)
 
     return (events, ht, at)
 
@@ -171,6 +198,8 @@ def get_xml_text(matchid) -> str:
         with open(path, mode="r", encoding='utf-8') as f:
             return f.read()
     else:
+        import requests
+
         data = requests.get(
             f"https://buzzerbeater.com/match/viewmatch.aspx?matchid={matchid}"
         )
@@ -189,13 +218,31 @@ def main():
     parser.add_argument("--print-events", action="store_true")
     parser.add_argument("--print-stats", action="store_true")
     parser.add_argument("--save-charts", action="store_true")
+    parser.add_argument(
+        "--chart-style",
+        choices=("dots", "heatmap"),
+        default="dots",
+        help="Draw every shot, or bin shots into a heatmap (with --save-charts)",
+    )
     parser.add_argument("--verify", action="store_true")
     parser.add_argument(
         "--out",
         default=None,
-        help="Output JSON path (default: output/reports/<matchid>.json)",
+        help="Output path (default: output/reports/<matchid>.<json|ndjson|npz>)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=SAVE_FORMATS,
+        default="json",
+        help="json (indented), compact JSON, ndjson event stream or columnar npz",
+    )
+    parser.add_argument(
+        "--no-comments",
+        action="store_true",
+        help="Skip rendering and writing event commentary",
     )
     args = parser.parse_args()
+    args.render_comments = not args.no_comments
 
     text = get_xml_text(args.matchid)
     events, ht, at = parse_xml(text)
@@ -204,9 +251,20 @@ def main():
     if args.out:
         out_path = Path(args.out)
     else:
-        out_path = Path("output") / "reports" / f"{args.matchid}.json"
+        out_path = Path("output") / "reports" / f"{args.matchid}{SAVE_SUFFIXES[args.format]}"
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    game.save(str(out_path))
+    game.save(str(out_path), args.format, comments=not args.no_comments)
+
+
+class TestReportHeader(unittest.TestCase):
+    def test_events_offset(self):
+        ht, at = Team(), Team()
+        for team in (ht, at):
+            team.players = [Player(f"p{i}") for i in range(12)]
+        header = "".join(f"{n:08d}" for n in range(1, 25)) + "12345" + "6789a"
+        self.assertEqual(parse_report_header(header, at, ht, quiet=True), EVENTS_OFFSET)
+        self.assertEqual([p.id for p in at.players][-1], 24)
+        self.assertEqual(at.lineup, [5, 6, 7, 8, 9])
 
 
 if __name__ == "__main__":
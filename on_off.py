@@ -0,0 +1,222 @@
+import argparse
+import contextlib
+import csv
+import io
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from cli_args import add_matchid_args, read_match_ids
+from lineups import match_stints
+from stints import END, PLAYERS, POSS_AGAINST, POSS_FOR, PTS_AGAINST, PTS_FOR, START, STINT_COLUMNS, TEAM
+
+# Columns of the on/off value arrays.
+SECS, PF, PA, POSSF, POSSA = range(5)
+
+
+def _stint_values(stints: np.ndarray) -> np.ndarray:
+    return np.column_stack(
+        [
+            stints[:, END] - stints[:, START],
+            stints[:, PTS_FOR],
+            stints[:, PTS_AGAINST],
+            stints[:, POSS_FOR],
+            stints[:, POSS_AGAINST],
+        ]
+    )
+
+
+def on_off_totals(stints: np.ndarray, match_index: np.ndarray):
+    """Per (team, player) totals with the player on and off court.
+
+    stints is a stacked stint table and match_index the match each row came
+    from. Off-court totals only count matches the player appeared in: per
+    match, off = team total - on. Returns (keys, games, on, off) where keys
+    is (players, 2) of team and player id and on/off are (players, 5) of
+    seconds, points for/against and possessions for/against.
+    """
+    values = _stint_values(stints)
+    empty = np.zeros((0, 5), dtype=np.int64)
+    if len(stints) == 0:
+        return np.zeros((0, 2), dtype=np.int64), np.zeros(0, dtype=np.int64), empty, empty
+
+    # Team totals per (match, team).
+    team_keys, team_inv = np.unique(np.column_stack([match_index, stints[:, TEAM]]), axis=0, return_inverse=True)
+    team_totals = np.zeros((len(team_keys), 5), dtype=np.int64)
+    np.add.at(team_totals, team_inv.ravel(), values)
+
+    # On-court totals per (match, team, player): each stint counts for its five players.
+    players = stints[:, PLAYERS].reshape(-1)
+    keys = np.column_stack([np.repeat(team_inv.ravel(), 5), players])
+    valid = players != 0
+    game_keys, game_inv = np.unique(keys[valid], axis=0, return_inverse=True)
+    on = np.zeros((len(game_keys), 5), dtype=np.int64)
+    np.add.at(on, game_inv.ravel(), np.repeat(values, 5, axis=0)[valid])
+    off = team_totals[game_keys[:, 0]] - on
+
+    # Merge matches into (team, player).
+    season = np.column_stack([team_keys[game_keys[:, 0], 1], game_keys[:, 1]])
+    keys, inv = np.unique(season, axis=0, return_inverse=True)
+    inv = inv.ravel()
+    on_total = np.zeros((len(keys), 5), dtype=np.int64)
+    off_total = np.zeros((len(keys), 5), dtype=np.int64)
+    np.add.at(on_total, inv, on)
+    np.add.at(off_total, inv, off)
+    games = np.bincount(inv, minlength=len(keys))
+    return keys, games, on_total, off_total
+
+
+def _ratings(totals: np.ndarray):
+    ortg = 100 * totals[:, PF] / np.maximum(totals[:, POSSF], 1)
+    drtg = 100 * totals[:, PA] / np.maximum(totals[:, POSSA], 1)
+    return ortg, drtg, ortg - drtg
+
+
+HEADERS = [
+    "team_id",
+    "player_id",
+    "name",
+    "gp",
+    "on_min",
+    "off_min",
+    "on_pts_for",
+    "on_pts_against",
+    "on_poss",
+    "on_ortg",
+    "on_drtg",
+    "on_net",
+    "off_pts_for",
+    "off_pts_against",
+    "off_poss",
+    "off_ortg",
+    "off_drtg",
+    "off_net",
+    "on_off",
+]
+
+
+def on_off_rows(keys, games, on, off, names: dict[int, str], min_secs: int = 0) -> list[list]:
+    on_ortg, on_drtg, on_net = _ratings(on)
+    off_ortg, off_drtg, off_net = _ratings(off)
+    diff = on_net - off_net
+
+    rows = []
+    for k in np.argsort(-diff, kind="stable"):
+        if on[k, SECS] < min_secs:
+            continue
+        team, player = keys[k].tolist()
+        rows.append(
+            [
+                team,
+                player,
+                names.get(player, str(player)),
+                int(games[k]),
+                round(on[k, SECS] / 60, 1),
+                round(off[k, SECS] / 60, 1),
+                int(on[k, PF]),
+                int(on[k, PA]),
+                int(on[k, POSSF]),
+                round(float(on_ortg[k]), 1),
+                round(float(on_drtg[k]), 1),
+                round(float(on_net[k]), 1),
+                int(off[k, PF]),
+                int(off[k, PA]),
+                int(off[k, POSSF]),
+                round(float(off_ortg[k]), 1),
+                round(float(off_drtg[k]), 1),
+                round(float(off_net[k]), 1),
+                round(float(diff[k]), 1),
+            ]
+        )
+    return rows
+
+
+def main() -> None:
+    from tabulate import tabulate
+
+    parser = argparse.ArgumentParser(description="Player on/off court splits from lineup stints.")
+    add_matchid_args(parser)
+    parser.add_argument("--teamid", type=int, default=None, help="Only report players of this team")
+    parser.add_argument("--min-minutes", type=float, default=0.0, help="Hide players with less court time")
+    parser.add_argument("--cache", default="output/stints", help="Per-match stint cache directory ('' to disable)")
+    parser.add_argument("--out", default="output/on_off.csv", help="CSV output path")
+    parser.add_argument("--top", type=int, default=10, help="Print the top N players by on/off net difference")
+    args = parser.parse_args()
+
+    match_ids = read_match_ids(args)
+    if not match_ids:
+        parser.error("Provide --matchids and/or --matchids-file")
+
+    stints, match_index, names = match_stints(match_ids, args.cache or None)
+    if args.teamid is not None:
+        keep = stints[:, TEAM] == args.teamid
+        stints, match_index = stints[keep], match_index[keep]
+
+    rows = on_off_rows(*on_off_totals(stints, match_index), names, int(args.min_minutes * 60))
+
+    out_path = Path(args.out)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADERS)
+        writer.writerows(rows)
+    print(f"{len(rows)} players from {len(match_ids)} matches -> {out_path}")
+
+    if args.top > 0 and rows:
+        cols = ["name", "team_id", "gp", "on_min", "on_net", "off_net", "on_off"]
+        idx = [HEADERS.index(c) for c in cols]
+        print(tabulate([[r[i] for i in idx] for r in rows[: args.top]], headers=cols))
+
+
+class TestOnOff(unittest.TestCase):
+    def test_split(self):
+        stints = np.zeros((3, STINT_COLUMNS), dtype=np.int64)
+        stints[:, TEAM] = 7
+        stints[0, PLAYERS] = [1, 2, 3, 4, 5]
+        stints[1, PLAYERS] = [6, 2, 3, 4, 5]
+        stints[2, PLAYERS] = [1, 2, 3, 4, 5]
+        stints[:, START] = [0, 100, 0]
+        stints[:, END] = [100, 160, 50]
+        stints[:, PTS_FOR] = [10, 4, 3]
+        stints[:, PTS_AGAINST] = [6, 5, 1]
+        # Second match: player 6 did not play, so it adds nothing to their off court.
+        keys, games, on, off = on_off_totals(stints, np.array([0, 0, 1]))
+        rows = {tuple(k): i for i, k in enumerate(keys.tolist())}
+
+        p1 = rows[(7, 1)]
+        self.assertEqual(games[p1], 2)
+        self.assertEqual(on[p1, :3].tolist(), [150, 13, 7])
+        self.assertEqual(off[p1, :3].tolist(), [60, 4, 5])
+
+        p6 = rows[(7, 6)]
+        self.assertEqual(games[p6], 1)
+        self.assertEqual(on[p6, :3].tolist(), [60, 4, 5])
+        self.assertEqual(off[p6, :3].tolist(), [100, 10, 6])
+
+    def test_ratings_match_pace(self):
+        # On + off court covers the whole team, so it must rate like bb-pace.
+        from game import Game, PlayOptions
+        from main import parse_xml
+        from pace import _TRIP_RECORDS, RATING_HEADERS, _report, game_possessions, team_ratings
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            events, ht, at = parse_xml(_report(_TRIP_RECORDS))
+            game = Game("1", events, ht, at, PlayOptions())
+            game.play()
+        stints = np.concatenate([team.stint_table() for team in game.teams])
+        keys, _, on, off = on_off_totals(stints, np.zeros(len(stints), dtype=np.int64))
+        ortg, drtg, _ = _ratings(on + off)
+
+        possessions, minutes = game_possessions(game)
+        teams, table = team_ratings(possessions, np.array([minutes]))
+        pace_ortg = dict(zip(teams.tolist(), table[:, RATING_HEADERS.index("ortg") - 1].tolist()))
+        pace_drtg = dict(zip(teams.tolist(), table[:, RATING_HEADERS.index("drtg") - 1].tolist()))
+        self.assertEqual(len(keys), 10)
+        for k, (team, _) in enumerate(keys.tolist()):
+            self.assertAlmostEqual(ortg[k], pace_ortg[team])
+            self.assertAlmostEqual(drtg[k], pace_drtg[team])
+
+
+if __name__ == "__main__":
+    main()
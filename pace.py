@@ -0,0 +1,230 @@
+import argparse
+import contextlib
+import csv
+import io
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from cli_args import add_matchid_args, read_match_ids
+from game import POSS_TURNOVER
+
+# Columns of a stacked season possession table.
+MATCH = 0
+TEAM_ID = 1
+OPP_ID = 2
+START = 3
+END = 4
+SHOTCLOCK_USED = 5
+OUTCOME = 6  # game.POSS_* code
+POINTS = 7
+COLUMNS = 8
+
+
+def match_possessions(match_id, cache_dir: str | None = None) -> tuple[np.ndarray, int]:
+    """Possession table of one match (MATCH column left 0) and its length in minutes.
+
+    With cache_dir the result is stored as <cache_dir>/<match_id>.npz so season
+    runs do not replay the match.
+    """
+    path = Path(cache_dir) / f"{match_id}.npz" if cache_dir else None
+    if path is not None and path.exists():
+        with np.load(path) as data:
+            return data["possessions"], int(data["minutes"])
+
+    from game import Game, PlayOptions
+    from main import get_xml_text, parse_xml
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        events, ht, at = parse_xml(get_xml_text(match_id))
+        game = Game(str(match_id), events, ht, at, PlayOptions())
+        game.play()
+    out, minutes = game_possessions(game)
+
+    if path is not None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(f, possessions=out, minutes=np.int64(minutes))
+    return out, minutes
+
+
+def game_possessions(game) -> tuple[np.ndarray, int]:
+    # Possession table of a played Game from its ledger, and its minutes.
+    table = game.possessions.table()
+    ids = np.array([team.id for team in game.teams], dtype=np.int64)
+    out = np.zeros((len(table), COLUMNS), dtype=np.int64)
+    out[:, TEAM_ID] = ids[table[:, 0]]
+    out[:, OPP_ID] = ids[1 - table[:, 0]]
+    out[:, START:] = table[:, 1:]
+    # Four 12-minute quarters plus 5 minutes per overtime.
+    return out, 48 + 5 * max(game.quarter - 4, 0)
+
+
+def season_possessions(match_ids, cache_dir: str | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """Stack possession tables; returns (possessions, minutes per match index)."""
+    tables = []
+    minutes = []
+    for index, match_id in enumerate(match_ids):
+        table, mins = match_possessions(match_id, cache_dir)
+        table = table.copy()
+        table[:, MATCH] = index
+        tables.append(table)
+        minutes.append(mins)
+    if not tables:
+        return np.zeros((0, COLUMNS), dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(tables), np.array(minutes, dtype=np.int64)
+
+
+def team_ratings(possessions: np.ndarray, minutes: np.ndarray):
+    """Per-team pace, offensive/defensive rating and possession profile.
+
+    Returns (team_ids, table) where table columns follow RATING_HEADERS[1:].
+    """
+    teams, inv = np.unique(np.concatenate([possessions[:, TEAM_ID], possessions[:, OPP_ID]]), return_inverse=True)
+    n = len(possessions)
+    off, dfn = inv[:n], inv[n:]
+    k = len(teams)
+
+    poss_for = np.bincount(off, minlength=k)
+    poss_against = np.bincount(dfn, minlength=k)
+    pts_for = np.bincount(off, weights=possessions[:, POINTS], minlength=k)
+    pts_against = np.bincount(dfn, weights=possessions[:, POINTS], minlength=k)
+    used = np.bincount(off, weights=possessions[:, SHOTCLOCK_USED], minlength=k)
+    turnovers = np.bincount(off, weights=possessions[:, OUTCOME] == POSS_TURNOVER, minlength=k)
+
+    # Games and minutes per team from the distinct (team, match) pairs.
+    pairs = np.unique(np.column_stack([off, possessions[:, MATCH]]), axis=0)
+    games = np.bincount(pairs[:, 0], minlength=k)
+    team_minutes = np.bincount(pairs[:, 0], weights=minutes[pairs[:, 1]], minlength=k)
+
+    safe_for = np.maximum(poss_for, 1)
+    safe_against = np.maximum(poss_against, 1)
+    pace = 48 * (poss_for + poss_against) / 2 / np.maximum(team_minutes, 1)
+    ortg = 100 * pts_for / safe_for
+    drtg = 100 * pts_against / safe_against
+
+    table = np.column_stack(
+        [
+            games,
+            poss_for,
+            poss_against,
+            pace,
+            ortg,
+            drtg,
+            ortg - drtg,
+            used / safe_for,
+            100 * turnovers / safe_for,
+        ]
+    )
+    return teams, table
+
+
+RATING_HEADERS = ["team_id", "gp", "poss_for", "poss_against", "pace", "ortg", "drtg", "net", "shotclock_used", "tov_pct"]
+
+
+def main() -> None:
+    from tabulate import tabulate
+
+    parser = argparse.ArgumentParser(description="Team pace and efficiency from possession tables.")
+    add_matchid_args(parser)
+    parser.add_argument("--cache", default="output/possessions", help="Per-match possession cache directory ('' to disable)")
+    parser.add_argument("--out", default="output/pace.csv", help="CSV output path")
+    args = parser.parse_args()
+
+    match_ids = read_match_ids(args)
+    if not match_ids:
+        parser.error("Provide --matchids and/or --matchids-file")
+
+    possessions, minutes = season_possessions(match_ids, args.cache or None)
+    teams, table = team_ratings(possessions, minutes)
+    rows = []
+    for team_id, values in zip(teams.tolist(), table.tolist()):
+        gp, poss_for, poss_against, *rates = values
+        rows.append([team_id, int(gp), int(poss_for), int(poss_against), *(round(v, 1) for v in rates)])
+    rows.sort(key=lambda r: r[RATING_HEADERS.index("net")], reverse=True)
+
+    out_path = Path(args.out)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(RATING_HEADERS)
+        writer.writerows(rows)
+    print(f"{len(possessions)} possessions from {len(match_ids)} matches -> {out_path}")
+    print(tabulate(rows, headers=RATING_HEADERS))
+
+
+class TestTeamRatings(unittest.TestCase):
+    def test_ratings(self):
+        rows = [
+            # match, team, opp, start, end, used, outcome, points
+            (0, 1, 2, 0, 10, 10, 0, 2),
+            (0, 2, 1, 10, 30, 20, 1, 0),
+            (0, 1, 2, 30, 44, 14, 0, 3),
+            (1, 1, 3, 0, 24, 24, 2, 0),
+        ]
+        teams, table = team_ratings(np.array(rows, dtype=np.int64), np.array([48, 53]))
+        self.assertEqual(teams.tolist(), [1, 2, 3])
+        t1 = dict(zip(RATING_HEADERS[1:], table[0].tolist()))
+        self.assertEqual((t1["gp"], t1["poss_for"], t1["poss_against"]), (2, 3, 1))
+        self.assertAlmostEqual(t1["ortg"], 500 / 3)
+        self.assertAlmostEqual(t1["drtg"], 0.0)
+        self.assertAlmostEqual(t1["pace"], 48 * 4 / 2 / 101)
+        t2 = dict(zip(RATING_HEADERS[1:], table[1].tolist()))
+        self.assertAlmostEqual(t2["tov_pct"], 100.0)
+
+
+def _report(records: list[str]) -> str:
+    players = "".join(f"<HPlayer{i}>H{i}</HPlayer{i}><APlayer{i}>A{i}</APlayer{i}>" for i in range(1, 13))
+    header = "".join(f"{n:08d}" for n in range(1, 25)) + "12345" * 2
+    return (
+        "<Match><HomeTeam><ID>1</ID><Name>Home</Name><ShortName>H</ShortName></HomeTeam>"
+        "<AwayTeam><ID>2</ID><Name>Away</Name><ShortName>A</ShortName></AwayTeam>"
+        f"{players}<ReportString>{header}{''.join(records)}</ReportString></Match>"
+    )
+
+
+# An and-one, a made shot that convert() wrongly flags as fouled, and a
+# free-throw trip that runs into the end of the quarter.
+_TRIP_RECORDS = [
+    "09339005500000003",  # jump ball
+    "02004004801000010",  # home scores, fouled: and-one
+    "05049004801000012",
+    "05029004001000014",
+    "12004001801100020",  # away scores; the next foul is elsewhere
+    "02002004807190030",  # home misses, fouled with a second left
+    "05049004807190032",
+    "05029004007190034",
+    "05029004007190036",
+    "09619000007200038",  # end of quarter
+]
+
+
+class TestPossessions(unittest.TestCase):
+    def test_free_throw_trips(self):
+        from game import POSS_END, POSS_OUTCOME, POSS_POINTS, POSS_SCORE, POSS_TEAM, Game, PlayOptions, Possessions
+        from main import parse_xml
+
+        poss = Possessions()
+        with contextlib.redirect_stdout(io.StringIO()):
+            events, ht, at = parse_xml(_report(_TRIP_RECORDS))
+            game = Game("1", events, ht, at, PlayOptions(), [poss])
+            game.play()
+        table = poss.table()
+        self.assertEqual(
+            table[:, [POSS_TEAM, POSS_END, POSS_OUTCOME, POSS_POINTS]].tolist(),
+            [[0, 100, POSS_SCORE, 3], [1, 110, POSS_SCORE, 2], [0, 719, POSS_SCORE, 2]],
+        )
+        self.assertEqual([team.points() for team in game.teams], [5, 2])
+
+        # The stints of each team book the same possessions as the table.
+        from stints import POSS_AGAINST, POSS_FOR
+
+        counts = np.bincount(table[:, POSS_TEAM], minlength=2).tolist()
+        stints = [team.stint_table() for team in game.teams]
+        self.assertEqual([int(s[:, POSS_FOR].sum()) for s in stints], counts)
+        self.assertEqual([int(s[:, POSS_AGAINST].sum()) for s in stints], counts[::-1])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import unittest
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+
+def imap_bounded(fn, items, workers: int, *args):
+    """Run fn(item, *args) for every item; yields (item, result, error) in item order.
+
+    error is the exception fn raised (result is then None). With workers <= 1
+    everything runs in this process. Otherwise a process pool keeps at most
+    workers * 4 calls in flight: workers stay busy without queueing the whole
+    input, and settling the oldest call first keeps results in order.
+    """
+    if workers <= 1:
+        for item in items:
+            try:
+                yield item, fn(item, *args), None
+            except Exception as e:
+                yield item, None, e
+        return
+
+    window = workers * 4
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for item in items:
+            pending.append((item, pool.submit(fn, item, *args)))
+            if len(pending) >= window:
+                yield _settle(*pending.popleft())
+        while pending:
+            yield _settle(*pending.popleft())
+
+
+def _settle(item, future):
+    try:
+        return item, future.result(), None
+    except Exception as e:
+        return item, None, e
+
+
+def _inverse(x: int, scale: int) -> float:
+    return scale / x
+
+
+class TestImapBounded(unittest.TestCase):
+    def test_order_and_errors(self):
+        for workers in (1, 2):
+            results = list(imap_bounded(_inverse, [4, 0, 2] * 5, workers, 8))
+            self.assertEqual([(item, result) for item, result, _ in results[:3]], [(4, 2.0), (0, None), (2, 4.0)])
+            self.assertEqual([type(error) for _, _, error in results[:3]], [type(None), ZeroDivisionError, type(None)])
+            self.assertEqual(len(results), 15)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,4 @@
-from stats import Stats, Statistic
+from stats import SECS_BY_POSITION, Stats, Statistic
 
 
 class Player:
@@ -19,10 +19,4 @@ class Player:
         self.stats.add(stat, val)
 
     def secs_total(self):
-        return (
-            self.stats.full.sheet[Statistic.SecsPG]
-            + self.stats.full.sheet[Statistic.SecsSG]
-            + self.stats.full.sheet[Statistic.SecsSF]
-            + self.stats.full.sheet[Statistic.SecsPF]
-            + self.stats.full.sheet[Statistic.SecsC]
-        )
+        return int(self.stats.data[0, SECS_BY_POSITION].sum())
@@ -0,0 +1,192 @@
+import json
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+LATENCY_PERCENTILES = (50, 90, 99)
+
+
+class _Phase:
+    __slots__ = ("profile", "name", "start")
+
+    def __init__(self, profile: "ScanProfile", name: str) -> None:
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.profile.add_phase(self.name, time.perf_counter() - self.start)
+
+
+class _NoPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NO_PHASE = _NoPhase()
+
+
+class ScanProfile:
+    """Per-phase wall time, counters, cache hits and per-match latency of a scan.
+
+    A disabled profile only costs an attribute check per call, so hot paths can
+    take one unconditionally. Worker processes fill their own profile and send
+    snapshot() back; the parent merge()s them.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.phases: dict[str, list[float]] = {}  # name -> [seconds, calls]
+        self.counters: dict[str, int] = {}
+        self.caches: dict[str, list[int]] = {}  # name -> [hits, misses]
+        self.latencies: list[float] = []
+
+    def phase(self, name: str):
+        """Context manager timing one call of phase `name`."""
+        if not self.enabled:
+            return _NO_PHASE
+        return _Phase(self, name)
+
+    def add_phase(self, name: str, seconds: float, calls: int = 1) -> None:
+        entry = self.phases.get(name)
+        if entry is None:
+            self.phases[name] = [seconds, calls]
+        else:
+            entry[0] += seconds
+            entry[1] += calls
+
+    def count(self, name: str, n: int = 1) -> None:
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def cache(self, name: str, hit: bool) -> None:
+        if self.enabled:
+            self.caches.setdefault(name, [0, 0])[0 if hit else 1] += 1
+
+    def match_done(self, seconds: float) -> None:
+        if self.enabled:
+            self.latencies.append(seconds)
+
+    def snapshot(self) -> dict:
+        return {
+            "phases": self.phases,
+            "counters": self.counters,
+            "caches": self.caches,
+            "latencies": self.latencies,
+        }
+
+    def merge(self, snapshot: dict) -> None:
+        for name, (seconds, calls) in snapshot["phases"].items():
+            self.add_phase(name, seconds, calls)
+        for name, n in snapshot["counters"].items():
+            self.counters[name] = self.counters.get(name, 0) + n
+        for name, (hits, misses) in snapshot["caches"].items():
+            entry = self.caches.setdefault(name, [0, 0])
+            entry[0] += hits
+            entry[1] += misses
+        self.latencies.extend(snapshot["latencies"])
+
+    def latency_ms(self) -> dict[str, float]:
+        if not self.latencies:
+            return {}
+        lat = np.asarray(self.latencies) * 1000
+        out = {f"p{p}": round(float(v), 2) for p, v in zip(LATENCY_PERCENTILES, np.percentile(lat, LATENCY_PERCENTILES))}
+        out["mean"] = round(float(lat.mean()), 2)
+        out["max"] = round(float(lat.max()), 2)
+        return out
+
+    def report(self) -> dict:
+        """JSON-ready summary. Phase times run in workers are summed over workers."""
+        phase_total = sum(seconds for seconds, _ in self.phases.values()) or 1.0
+        return {
+            "wall_s": round(time.perf_counter() - self.started, 3),
+            "phases": {
+                name: {
+                    "seconds": round(seconds, 4),
+                    "calls": calls,
+                    "mean_ms": round(1000 * seconds / max(calls, 1), 3),
+                    "share": round(seconds / phase_total, 4),
+                }
+                for name, (seconds, calls) in sorted(self.phases.items(), key=lambda item: -item[1][0])
+            },
+            "counters": dict(sorted(self.counters.items())),
+            "caches": {
+                name: {"hits": hits, "misses": misses, "hit_ratio": round(hits / max(hits + misses, 1), 4)}
+                for name, (hits, misses) in sorted(self.caches.items())
+            },
+            "matches": len(self.latencies),
+            "match_latency_ms": self.latency_ms(),
+        }
+
+    def summary(self, top: int = 3) -> str:
+        """One line for the live progress display."""
+        parts = []
+        lat = self.latency_ms()
+        if lat:
+            parts.append(f"p50 {lat['p50']:.0f}ms p90 {lat['p90']:.0f}ms")
+        total = sum(seconds for seconds, _ in self.phases.values())
+        if total:
+            ranked = sorted(self.phases.items(), key=lambda item: -item[1][0])[:top]
+            parts.append(" ".join(f"{name} {100 * seconds / total:.0f}%" for name, (seconds, _) in ranked))
+        for name, (hits, misses) in self.caches.items():
+            parts.append(f"{name} cache {100 * hits / max(hits + misses, 1):.0f}%")
+        fetched = self.counters.get("bytes_fetched", 0)
+        if fetched:
+            parts.append(f"{fetched / 1e6:.1f} MB fetched")
+        return " | ".join(parts) or "profiling"
+
+    def write(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+
+# Shared default for callers that do not profile.
+NO_PROFILE = ScanProfile(enabled=False)
+
+
+class TestScanProfile(unittest.TestCase):
+    def test_disabled(self):
+        with NO_PROFILE.phase("parse"):
+            pass
+        NO_PROFILE.count("bytes_fetched", 10)
+        NO_PROFILE.cache("report", True)
+        NO_PROFILE.match_done(0.1)
+        self.assertEqual(NO_PROFILE.snapshot(), {"phases": {}, "counters": {}, "caches": {}, "latencies": []})
+
+    def test_merge_and_report(self):
+        parent = ScanProfile()
+        for hit, seconds in ((True, 0.01), (False, 0.03)):
+            worker = ScanProfile()
+            with worker.phase("parse"):
+                pass
+            worker.add_phase("convert", seconds)
+            worker.cache("report", hit)
+            worker.count("bytes_fetched", 0 if hit else 2_000_000)
+            worker.match_done(seconds)
+            parent.merge(worker.snapshot())
+        report = parent.report()
+        self.assertEqual(report["phases"]["parse"]["calls"], 2)
+        self.assertAlmostEqual(report["phases"]["convert"]["seconds"], 0.04)
+        self.assertEqual(report["caches"]["report"], {"hits": 1, "misses": 1, "hit_ratio": 0.5})
+        self.assertEqual(report["matches"], 2)
+        self.assertEqual(report["match_latency_ms"]["p50"], 20.0)
+        self.assertIn("2.0 MB fetched", parent.summary())
+        json.dumps(report)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+from bisect import bisect_left, bisect_right
+
+from event import BaseEvent, Clocks, FreeThrowEvent, ShotEvent, ShotPos
+from event_types import FreeThrowType, ShotResult, ShotType
+
+SHOT = "shot"
+FREE_THROW = "free_throw"
+
+
+def scoring_points(be: BaseEvent) -> int:
+    if isinstance(be, ShotEvent) and be.has_scored():
+        return 3 if be.is_3pt() else 2
+    if isinstance(be, FreeThrowEvent) and be.has_scored():
+        return 1
+    return 0
+
+
+class ScoreTimeline:
+    """Base events of one match indexed by gameclock.
+
+    Scoring events are kept as parallel sorted arrays (clock, cumulative home and
+    away score, index into baseevents) so score and window lookups are bisections
+    instead of scans over the whole match.
+    """
+
+    def __init__(self, baseevents: list[BaseEvent], start: tuple[int, int] = (0, 0)) -> None:
+        self.baseevents = baseevents
+        self.start = (start[0], start[1])
+
+        # All events, ordered by (clock, position) for window queries.
+        self.order = sorted(range(len(baseevents)), key=lambda i: (baseevents[i].gameclock, i))
+        self.clocks = [baseevents[i].gameclock for i in self.order]
+
+        # Scoring events only, accumulated in event order.
+        self.score_clocks: list[int] = []
+        self.home: list[int] = []
+        self.away: list[int] = []
+        self.indices: list[int] = []
+        # id(event) -> position in the scoring arrays
+        self._pos: dict[int, int] = {}
+        # (team, kind) -> sorted clocks / event indices of that team's scores
+        self._by_team: dict[tuple[int, str], tuple[list[int], list[int]]] = {}
+
+        scores = [self.start[0], self.start[1]]
+        for idx, be in enumerate(baseevents):
+            pts = scoring_points(be)
+            if not pts:
+                continue
+            scores[be.att_team] += pts
+            self._pos[id(be)] = len(self.indices)
+            self.score_clocks.append(be.gameclock)
+            self.home.append(scores[0])
+            self.away.append(scores[1])
+            self.indices.append(idx)
+
+            kind = SHOT if isinstance(be, ShotEvent) else FREE_THROW
+            clocks, indices = self._by_team.setdefault((be.att_team, kind), ([], []))
+            # Reports are clock ordered; fall back to an ordered insert if not.
+            at = bisect_right(clocks, be.gameclock)
+            clocks.insert(at, be.gameclock)
+            indices.insert(at, idx)
+
+    def score_at(self, clock: int) -> tuple[int, int]:
+        # Score after every scoring event at or before `clock`.
+        k = bisect_right(self.score_clocks, clock)
+        if k == 0:
+            return self.start
+        return (self.home[k - 1], self.away[k - 1])
+
+    def score_around(self, be: BaseEvent) -> tuple[tuple[int, int], tuple[int, int]] | None:
+        # (before, after) score for a scoring event, None for anything else.
+        k = self._pos.get(id(be))
+        if k is None:
+            return None
+        before = self.start if k == 0 else (self.home[k - 1], self.away[k - 1])
+        return before, (self.home[k], self.away[k])
+
+    def last_scoring(self, team: int, window_start: int, window_end: int, kind: str = SHOT):
+        clocks, indices = self._by_team.get((team, kind), ([], []))
+        k = bisect_right(clocks, window_end) - 1
+        if k < 0 or clocks[k] < window_start:
+            return None
+        return self.baseevents[indices[k]]
+
+    def events_in(self, window_start: int, window_end: int) -> list[BaseEvent]:
+        lo = bisect_left(self.clocks, window_start)
+        hi = bisect_right(self.clocks, window_end)
+        return [self.baseevents[i] for i in self.order[lo:hi]]
+
+    def scoring_in(self, window_start: int, window_end: int) -> list[BaseEvent]:
+        lo = bisect_left(self.score_clocks, window_start)
+        hi = bisect_right(self.score_clocks, window_end)
+        return [self.baseevents[i] for i in self.indices[lo:hi]]
+
+
+def _shot(clock: int, team: int, shot_type: ShotType, result: ShotResult) -> ShotEvent:
+    return ShotEvent([], Clocks(clock, 0, 0), shot_type, result, 1, 1, 0, team, 1 - team, ShotPos(0, 0))
+
+
+def _free_throw(clock: int, team: int, result: ShotResult) -> FreeThrowEvent:
+    return FreeThrowEvent([], Clocks(clock, 0, 0), FreeThrowType.REGULAR, result, 1, team)
+
+
+class TestScoreTimeline(unittest.TestCase):
+    def setUp(self):
+        self.events = [
+            _shot(10, 0, ShotType.TWO_POINTER_DEFAULT, ShotResult.SCORED),
+            _shot(30, 1, ShotType.THREE_POINTER_WING, ShotResult.SCORED),
+            _shot(716, 0, ShotType.LAYUP, ShotResult.MISSED),
+            _free_throw(717, 0, ShotResult.SCORED),
+            _shot(719, 0, ShotType.DUNK1, ShotResult.SCORED_WITH_FOUL),
+            _free_throw(719, 0, ShotResult.MISSED),
+        ]
+        self.timeline = ScoreTimeline(self.events)
+
+    def test_score_at(self):
+        self.assertEqual(self.timeline.score_at(0), (0, 0))
+        self.assertEqual(self.timeline.score_at(30), (2, 3))
+        self.assertEqual(self.timeline.score_at(720), (5, 3))
+        self.assertEqual(ScoreTimeline(self.events, (40, 41)).score_at(720), (45, 44))
+
+    def test_last_scoring(self):
+        self.assertIs(self.timeline.last_scoring(0, 715, 720), self.events[4])
+        self.assertIs(self.timeline.last_scoring(0, 715, 720, FREE_THROW), self.events[3])
+        self.assertIsNone(self.timeline.last_scoring(1, 715, 720))
+
+    def test_windows(self):
+        self.assertEqual(self.timeline.events_in(715, 720), self.events[2:])
+        self.assertEqual(self.timeline.scoring_in(715, 720), [self.events[3], self.events[4]])
+        self.assertEqual(self.timeline.score_around(self.events[4]), ((3, 3), (5, 3)))
+        self.assertIsNone(self.timeline.score_around(self.events[2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
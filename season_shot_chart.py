@@ -0,0 +1,74 @@
+import argparse
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from cli_args import add_matchid_args, read_match_ids
+from shot_chart import HEATMAP_LAYERS, heatmap_image
+from shot_table import BASKET_X, BASKET_Y, ShotStore, concat_shots, is_made, match_shots
+
+
+def fold_to_right(shots: dict[str, np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """Shot positions with away-side shots rotated onto the home side's basket.
+
+    Rotating (not mirroring) keeps the shooter's left and right the same.
+    """
+    away = shots["side"] == 1
+    x = np.where(away, BASKET_X[0] + BASKET_X[1] - shots["x"], shots["x"])
+    y = np.where(away, 2 * BASKET_Y - shots["y"], shots["y"])
+    return x, y
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Season shot heatmap for a team or player from the shot store.")
+    add_matchid_args(parser)
+    parser.add_argument("--teamid", type=int, default=None, help="Only this team's shots; without match ids, its stored matches")
+    parser.add_argument("--season", type=int, nargs="+", default=None, help="Stored matches of these seasons (with --teamid)")
+    parser.add_argument("--playerid", type=int, default=None, help="Only this player's shots")
+    parser.add_argument("--layer", choices=HEATMAP_LAYERS, default="attempts")
+    parser.add_argument("--cell", type=int, default=6, help="Bin size in court pixels")
+    parser.add_argument("--no-fold", action="store_true", help="Keep away shots on the left basket")
+    parser.add_argument("--store", default="output/shots", help="Shot store directory ('' to disable)")
+    parser.add_argument("--out", default=None, help="PNG path (default: output/charts/season_<team|all>_<layer>.png)")
+    args = parser.parse_args()
+
+    store = ShotStore(args.store) if args.store else None
+    match_ids = read_match_ids(args)
+    if not match_ids and args.teamid is not None and store is not None:
+        match_ids = store.find(args.teamid, set(args.season) if args.season else None)
+    match_ids = list(dict.fromkeys(match_ids))
+    if not match_ids:
+        parser.error("Provide --matchids, --matchids-file or --teamid with stored matches")
+
+    if store is not None:
+        shots = store.load(match_ids)
+    else:
+        shots = concat_shots(match_shots(m) for m in match_ids)
+    keep = np.ones(len(shots["x"]), dtype=bool)
+    if args.teamid is not None:
+        keep &= shots["team"] == args.teamid
+    if args.playerid is not None:
+        keep &= shots["player"] == args.playerid
+    shots = {name: column[keep] for name, column in shots.items()}
+
+    x, y = (shots["x"], shots["y"]) if args.no_fold else fold_to_right(shots)
+    img = heatmap_image(x, y, is_made(shots), args.layer, args.cell)
+
+    who = args.playerid or args.teamid or "all"
+    out_path = Path(args.out or f"output/charts/season_{who}_{args.layer}.png")
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    img.save(out_path)
+    print(f"{len(x)} shots from {len(match_ids)} matches -> {out_path}")
+
+
+class TestFold(unittest.TestCase):
+    def test_fold(self):
+        shots = {"side": np.array([0, 1, 1]), "x": np.array([340, 21, 30]), "y": np.array([10, 96, 10])}
+        x, y = fold_to_right(shots)
+        self.assertEqual(x.tolist(), [340, 347, 338])
+        self.assertEqual(y.tolist(), [10, 96, 182])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+import argparse
+import contextlib
+import csv
+import io
+import json
+import unittest
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from cli_args import add_matchid_args, read_match_ids
+
+# Counting stats taken from the "total" block of Game.save player/team stats.
+COUNTING = ["pts", "fgm", "fga", "tpm", "tpa", "ftm", "fta", "or", "dr", "tr", "ast", "to", "stl", "blk", "pf", "+/-"]
+SECS = ["secs_pg", "secs_sg", "secs_sf", "secs_pf", "secs_c"]
+# Player rows also carry seconds played (sum of the per-position seconds).
+PLAYER_COLUMNS = ["secs", *COUNTING]
+TEAM_COLUMNS = COUNTING
+
+
+class _Rows:
+    """Growable (entities x columns) int64 totals keyed by entity id."""
+
+    def __init__(self, columns: int) -> None:
+        self.index: dict[int, int] = {}
+        self.totals = np.zeros((64, columns), dtype=np.int64)
+        self.games = np.zeros(64, dtype=np.int64)
+        self.names: list[str] = []
+        self.team_ids: list[int] = []
+
+    def add(self, entity_id: int, name: str, team_id: int, values: list[int], played: bool) -> None:
+        row = self.index.get(entity_id)
+        if row is None:
+            row = len(self.index)
+            self.index[entity_id] = row
+            self.names.append(name)
+            self.team_ids.append(team_id)
+            if row == len(self.totals):
+                self.totals = np.concatenate([self.totals, np.zeros_like(self.totals)])
+                self.games = np.concatenate([self.games, np.zeros_like(self.games)])
+        else:
+            # Players can move mid-season; keep the latest team.
+            self.team_ids[row] = team_id
+        self.totals[row] += values
+        self.games[row] += played
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+class SeasonAggregator:
+    """Accumulate player and team box scores over many games.
+
+    Games are the dicts written by Game.save (or returned by
+    compute_boxscore); only running totals are kept, so memory grows with the
+    number of players and teams, not games.
+    """
+
+    def __init__(self) -> None:
+        self.players = _Rows(len(PLAYER_COLUMNS))
+        self.teams = _Rows(len(TEAM_COLUMNS))
+        self.games = 0
+
+    def add_game(self, game: dict) -> None:
+        for side in ("teamHome", "teamAway"):
+            team = game[side]
+            total = team["stats"]["total"]
+            self.teams.add(team["id"], team["name"], team["id"], [total[k] for k in TEAM_COLUMNS], True)
+
+            for player in team["players"]:
+                # Roster padding ("Lucky Fan") has no id.
+                if not player["id"]:
+                    continue
+                total = player["stats"]["total"]
+                secs = sum(total[k] for k in SECS)
+                values = [secs, *(total[k] for k in COUNTING)]
+                self.players.add(player["id"], player["name"], team["id"], values, secs > 0)
+        self.games += 1
+
+    def player_table(self) -> tuple[list[str], list[list]]:
+        rows = self.players
+        n = len(rows)
+        totals = rows.totals[:n].astype(np.float64)
+        games = rows.games[:n]
+        per_game = totals[:, 1:] / np.maximum(games, 1)[:, None]
+        # Per 36 minutes of court time.
+        per36 = totals[:, 1:] * 2160 / np.maximum(totals[:, :1], 1)
+
+        headers = ["player_id", "name", "team_id", "gp", "min"]
+        headers += COUNTING + [f"{k}_pg" for k in COUNTING] + [f"{k}_36" for k in COUNTING]
+        table = []
+        for entity_id, row in rows.index.items():
+            table.append(
+                [
+                    entity_id,
+                    rows.names[row],
+                    rows.team_ids[row],
+                    int(games[row]),
+                    round(totals[row, 0] / 60, 1),
+                    *rows.totals[row, 1:].tolist(),
+                    *np.round(per_game[row], 2).tolist(),
+                    *np.round(per36[row], 2).tolist(),
+                ]
+            )
+        return headers, table
+
+    def team_table(self) -> tuple[list[str], list[list]]:
+        rows = self.teams
+        n = len(rows)
+        per_game = rows.totals[:n] / np.maximum(rows.games[:n], 1)[:, None]
+
+        headers = ["team_id", "name", "gp", *COUNTING, *(f"{k}_pg" for k in COUNTING)]
+        table = []
+        for entity_id, row in rows.index.items():
+            table.append(
+                [
+                    entity_id,
+                    rows.names[row],
+                    int(rows.games[row]),
+                    *rows.totals[row].tolist(),
+                    *np.round(per_game[row], 2).tolist(),
+                ]
+            )
+        return headers, table
+
+
+def iter_saved_games(paths: Iterable[str]) -> Iterator[dict]:
+    # Game.save JSON files; directories are scanned for *.json.
+    for raw in paths:
+        path = Path(raw)
+        files = sorted(path.glob("*.json")) if path.is_dir() else [path]
+        for file in files:
+            with open(file, "r", encoding="utf-8") as f:
+                yield json.load(f)
+
+
+def iter_parsed_games(match_ids: Iterable[str]) -> Iterator[dict]:
+    # Parse cached/downloaded reports and run the headless stats engine.
+    from game import compute_boxscore
+    from main import get_xml_text, parse_xml
+
+    for match_id in match_ids:
+        with contextlib.redirect_stdout(io.StringIO()):
+            events, ht, at = parse_xml(get_xml_text(match_id))
+            box = compute_boxscore(events, ht, at, matchid=str(match_id))
+        yield box
+
+
+def _write_csv(path: Path, headers: list[str], table: list[list]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        writer.writerows(table)
+
+
+def main() -> None:
+    from tabulate import tabulate
+
+    parser = argparse.ArgumentParser(description="Aggregate box scores across many matches.")
+    parser.add_argument("--reports", nargs="+", default=[], help="Game.save JSON files or directories")
+    add_matchid_args(parser)
+    parser.add_argument("--out", default="output/season", help="Directory for players.csv and teams.csv")
+    parser.add_argument("--top", type=int, default=10, help="Print the top N players by points per game")
+    args = parser.parse_args()
+
+    match_ids = read_match_ids(args)
+    if not args.reports and not match_ids:
+        parser.error("Provide --reports and/or --matchids/--matchids-file")
+
+    agg = SeasonAggregator()
+    for game in iter_saved_games(args.reports):
+        agg.add_game(game)
+    for game in iter_parsed_games(match_ids):
+        agg.add_game(game)
+
+    out_dir = Path(args.out)
+    headers, players = agg.player_table()
+    _write_csv(out_dir / "players.csv", headers, players)
+    team_headers, teams = agg.team_table()
+    _write_csv(out_dir / "teams.csv", team_headers, teams)
+    print(f"Aggregated {agg.games} games: {len(players)} players, {len(teams)} teams -> {out_dir}")
+
+    if args.top > 0 and players:
+        pts_pg = headers.index("pts_pg")
+        top = sorted(players, key=lambda r: r[pts_pg], reverse=True)[: args.top]
+        cols = ["name", "team_id", "gp", "min", "pts_pg", "tr_pg", "ast_pg", "pts_36"]
+        idx = [headers.index(c) for c in cols]
+        print(tabulate([[r[i] for i in idx] for r in top], headers=cols))
+
+
+def _game(home_pts: int, secs: int) -> dict:
+    def total(pts: int, with_secs: bool) -> dict:
+        stats = {k: 0 for k in COUNTING}
+        stats["pts"] = pts
+        if with_secs:
+            stats.update({k: 0 for k in SECS})
+            stats["secs_pg"] = secs
+        return {"total": stats}
+
+    def team(tid: int, pts: int) -> dict:
+        players = [
+            {"id": tid * 10 + 1, "name": f"P{tid}", "starter": True, "stats": total(pts, True)},
+            {"id": 0, "name": "Lucky Fan", "starter": False, "stats": total(0, True)},
+        ]
+        return {"id": tid, "name": f"T{tid}", "players": players, "stats": total(pts, False)}
+
+    return {"teamHome": team(1, home_pts), "teamAway": team(2, 80)}
+
+
+class TestSeasonAggregator(unittest.TestCase):
+    def test_totals_and_rates(self):
+        agg = SeasonAggregator()
+        agg.add_game(_game(90, 1800))
+        agg.add_game(_game(70, 360))
+        headers, players = agg.player_table()
+        self.assertEqual(len(players), 2)
+        row = dict(zip(headers, players[0]))
+        self.assertEqual((row["gp"], row["pts"], row["pts_pg"]), (2, 160, 80.0))
+        self.assertEqual(row["min"], 36.0)
+        self.assertEqual(row["pts_36"], 160.0)
+
+        team_headers, teams = agg.team_table()
+        self.assertEqual(dict(zip(team_headers, teams[1]))["pts_pg"], 80.0)
+
+    def test_growth(self):
+        agg = SeasonAggregator()
+        for i in range(100):
+            game = _game(i, 60)
+            game["teamHome"]["players"][0]["id"] = 1000 + i
+            agg.add_game(game)
+        self.assertEqual(len(agg.players), 101)
+        self.assertEqual(agg.players.totals[agg.players.index[1099], 1], 99)
+
+
+if __name__ == "__main__":
+    main()
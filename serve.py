@@ -0,0 +1,485 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Current season / season list from the API are refreshed after this long.
+SEASON_TTL = 3600
+
+
+class LRU:
+    """Small thread-safe LRU mapping for per-match results."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.data: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, compute):
+        with self.lock:
+            if key in self.data:
+                self.data.move_to_end(key)
+                self.hits += 1
+                return self.data[key]
+            self.misses += 1
+        # Computed outside the lock; two threads may race on the same key, which only costs time.
+        value = compute()
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            while len(self.data) > self.size:
+                self.data.popitem(last=False)
+        return value
+
+    def stats(self) -> dict:
+        return {"entries": len(self.data), "hits": self.hits, "misses": self.misses}
+
+
+class ServerState:
+    """Everything a query needs that is expensive to rebuild per process.
+
+    Per-match results are kept in LRU caches and share one commentary
+    catalog; the shot store, the BB API session and the buzzerbeater database
+    connection are opened once, on first use.
+    """
+
+    def __init__(self, db: str, store: str, cache_size: int = 1024) -> None:
+        from comments import Comments
+
+        self.db = db
+        self.store_dir = store
+        self.started = time.time()
+        self.buzzerbeaters = LRU(cache_size)
+        self.boxscores = LRU(cache_size)
+        self.shots = LRU(cache_size * 4)
+        # Read-only once loaded, so handler threads share it.
+        self.comments = Comments()
+        self._store = None
+        self._session = None
+        self._seasons: tuple[float, int, list[int]] | None = None
+        self._conn: sqlite3.Connection | None = None
+        self.verbose = False
+        # _lock guards lazy setup; the shot store index and the sqlite
+        # connection are not thread-safe, so each has its own lock.
+        self._lock = threading.Lock()
+        self._store_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+
+    # Shared resources
+
+    def store(self):
+        with self._lock:
+            if self._store is None:
+                from shot_table import ShotStore
+
+                self._store = ShotStore(self.store_dir)
+            return self._store
+
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                import requests
+
+                from team_shot_distance_hist import _load_env, _login
+
+                _load_env()
+                session = requests.Session()
+                _login(session)
+                self._session = session
+            return self._session
+
+    def seasons(self) -> tuple[int, list[int]]:
+        from team_shot_distance_hist import _all_seasons, _current_season
+
+        cached = self._seasons
+        if cached is None or time.time() - cached[0] > SEASON_TTL:
+            session = self.session()
+            current = _current_season(session)
+            seasons = sorted((s for s in _all_seasons(session) if s <= current), reverse=True)
+            cached = self._seasons = (time.time(), current, seasons)
+        return cached[1], cached[2]
+
+    def conn(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._conn is None:
+                # Shared by handler threads, always used under _db_lock.
+                self._conn = sqlite3.connect(self.db, check_same_thread=False)
+                self._conn.row_factory = sqlite3.Row
+            return self._conn
+
+    # Queries
+
+    def buzzerbeater_records(self, matchid: int) -> list[dict]:
+        from buzzerbeaters import find_buzzerbeater_records
+
+        return self.buzzerbeaters.get(matchid, lambda: find_buzzerbeater_records(matchid, comments=self.comments))
+
+    def boxscore(self, matchid: str) -> dict:
+        def compute():
+            from game import compute_boxscore
+            from main import get_xml_text, parse_xml
+
+            # No redirect_stdout here: it swaps sys.stdout for every thread.
+            events, ht, at = parse_xml(get_xml_text(matchid), quiet=True)
+            return compute_boxscore(events, ht, at, matchid=matchid, comments=self.comments)
+
+        return self.boxscores.get(matchid, compute)
+
+    def shot_distances(self, teamids: list[int], seasons: list[int] | None, count: int, offline: bool, bin_width: float) -> dict:
+        import numpy as np
+
+        from shot_table import concat_shots, is_three
+        from team_shot_distance_hist import _recent_matches
+
+        store = self.store()
+        match_ids: list = []
+        if offline:
+            for team_id in teamids:
+                match_ids += store.find(team_id, set(seasons) if seasons else None)[:count]
+        else:
+            session = self.session()
+            current, all_seasons = self.seasons()
+            for team_id in teamids:
+                with self._store_lock:
+                    match_ids += _recent_matches(session, store, team_id, sorted(seasons or all_seasons, reverse=True), current, count)
+        match_ids = list(dict.fromkeys(str(m) for m in match_ids))
+
+        with self._store_lock:
+            tables = [self.shots.get(m, lambda m=m: store.shots(m)) for m in match_ids]
+            store.save()
+        shots = concat_shots(tables)
+        three = is_three(shots)
+
+        def hist(dists):
+            if len(dists) == 0:
+                return {"n": 0, "edges": [], "counts": []}
+            edges = np.arange(dists.min(), dists.max() + 2 * bin_width, bin_width)
+            counts, edges = np.histogram(dists, bins=edges)
+            return {
+                "n": int(len(dists)),
+                "mean": round(float(dists.mean()), 2),
+                "median": round(float(np.median(dists)), 2),
+                "edges": [round(float(e), 2) for e in edges],
+                "counts": counts.tolist(),
+            }
+
+        return {
+            "matches": match_ids,
+            "three": hist(shots["distance_ft"][three]),
+            "two": hist(shots["distance_ft"][~three]),
+        }
+
+    def descriptions(self, filters: dict, with_url: bool, link_domain: str) -> list[str]:
+        from buzzerbeater_descriptions import describe_with_link, query_rows
+
+        conn = self.conn()
+        with self._db_lock:
+            rows = query_rows(conn, **filters)
+        return [describe_with_link(row, with_url, link_domain) for row in rows]
+
+    def status(self) -> dict:
+        return {
+            "uptime_s": round(time.time() - self.started, 1),
+            "buzzerbeaters": self.buzzerbeaters.stats(),
+            "boxscores": self.boxscores.stats(),
+            "shots": self.shots.stats(),
+            "logged_in": self._session is not None,
+        }
+
+
+def _int(params: dict, name: str, default=None):
+    values = params.get(name)
+    return int(values[0]) if values else default
+
+
+def _ints(params: dict, name: str) -> list[int] | None:
+    values = params.get(name)
+    if not values:
+        return None
+    return [int(v) for value in values for v in value.split(",") if v]
+
+
+def _flag(params: dict, name: str) -> bool:
+    values = params.get(name)
+    return bool(values) and values[0] not in ("0", "false", "")
+
+
+def dispatch(state: ServerState, path: str, params: dict):
+    """Answer one query; raises KeyError for unknown paths, ValueError for bad parameters."""
+    if path == "/status":
+        return state.status()
+    if path == "/buzzerbeaters":
+        matchid = _int(params, "matchid")
+        if matchid is None:
+            raise ValueError("matchid is required")
+        return state.buzzerbeater_records(matchid)
+    if path == "/boxscore":
+        matchid = _int(params, "matchid")
+        if matchid is None:
+            raise ValueError("matchid is required")
+        return state.boxscore(str(matchid))
+    if path == "/shot-distances":
+        teamids = _ints(params, "teamid")
+        if not teamids:
+            raise ValueError("teamid is required")
+        return state.shot_distances(
+            teamids,
+            _ints(params, "season"),
+            _int(params, "count", 10),
+            _flag(params, "offline"),
+            float(params.get("bin_width", ["0.25"])[0]),
+        )
+    if path == "/descriptions":
+        filters = {
+            "teamid": _int(params, "teamid"),
+            "opponent_id": _int(params, "opponent_id"),
+            "matchid": _int(params, "matchid"),
+            "player_id": _int(params, "player_id"),
+            "order": params.get("order", ["asc"])[0],
+        }
+        return state.descriptions(filters, not _flag(params, "no_url"), params.get("link_domain", ["com"])[0])
+    raise KeyError(path)
+
+
+def make_handler(state: ServerState):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urllib.parse.urlsplit(self.path)
+            try:
+                payload = dispatch(state, url.path, urllib.parse.parse_qs(url.query))
+            except KeyError:
+                self._reply(404, {"error": f"unknown query {url.path}"})
+                return
+            except ValueError as e:
+                self._reply(400, {"error": str(e)})
+                return
+            except Exception as e:
+                self._reply(500, {"error": repr(e)})
+                return
+            self._reply(200, payload)
+
+        def do_POST(self):
+            # Queries are GETs; the only command is /stop.
+            url = urllib.parse.urlsplit(self.path)
+            if url.path != "/stop":
+                self._reply(404, {"error": f"unknown command {url.path}"})
+                return
+            self._reply(200, {"stopping": True})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+        def _reply(self, code: int, payload) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            if state.verbose:
+                super().log_message(format, *args)
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local query daemon keeping parsed matches, sessions and databases warm.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Bind address (keep it local)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--db", default="data/buzzerbeaters.db", help="Buzzerbeater database for description queries")
+    parser.add_argument("--store", default="output/shots", help="Shot store directory")
+    parser.add_argument("--cache-size", type=int, default=1024, help="Matches kept per result cache")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    state = ServerState(args.db, args.store, args.cache_size)
+    state.verbose = args.verbose
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state))
+    print(f"Serving on http://{args.host}:{args.port} (POST /stop to shut down)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# Thin client
+
+
+def query(path: str, params: dict | None = None, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, method: str = "GET"):
+    params = {k: v for k, v in (params or {}).items() if v is not None and v is not False}
+    url = f"http://{host}:{port}{path}"
+    if params:
+        url += "?" + urllib.parse.urlencode(params, doseq=True)
+    request = urllib.request.Request(url, data=b"" if method == "POST" else None, method=method)
+    try:
+        with urllib.request.urlopen(request) as resp:
+            return json.load(resp)
+    except urllib.error.HTTPError as e:
+        raise SystemExit(f"{path}: {json.load(e).get('error', e.reason)}")
+    except urllib.error.URLError as e:
+        raise SystemExit(f"Cannot reach bb-serve at {host}:{port} ({e.reason}); start it with `bb-serve`.")
+
+
+def client_main() -> None:
+    parser = argparse.ArgumentParser(description="Thin client for a running bb-serve daemon.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("buzzerbeaters", help="Like bb-buzzerbeaters")
+    p.add_argument("--matchid", type=int, required=True)
+    p.add_argument("--json", action="store_true", help="Print results as JSON")
+    p.add_argument("--details", action="store_true", help="Show linked scoring details")
+
+    p = sub.add_parser("boxscore", help="Box score JSON, like bbinsider without events")
+    p.add_argument("--matchid", type=int, required=True)
+
+    p = sub.add_parser("shot-distances", help="Like bb-team-shot-distance-hist, as text")
+    p.add_argument("--teamid", type=int, nargs="+", required=True)
+    p.add_argument("--season", type=int, nargs="+", default=None)
+    p.add_argument("--count", type=int, default=10)
+    p.add_argument("--bin-width", type=float, default=0.25)
+    p.add_argument("--offline", action="store_true")
+
+    p = sub.add_parser("descriptions", help="Like bb-buzzerbeater-descriptions")
+    p.add_argument("--teamid", type=int, default=None)
+    p.add_argument("--opponent-id", type=int, default=None)
+    p.add_argument("--matchid", type=int, default=None)
+    p.add_argument("--player-id", type=int, default=None)
+    p.add_argument("--order", choices=("asc", "desc"), default="asc")
+    p.add_argument("--no-url", action="store_true")
+    p.add_argument("--link-domain", choices=("com", "org"), default="com")
+
+    sub.add_parser("status", help="Cache statistics")
+    sub.add_parser("stop", help="Shut the daemon down")
+    args = parser.parse_args()
+    addr = {"host": args.host, "port": args.port}
+
+    if args.command == "buzzerbeaters":
+        records = query("/buzzerbeaters", {"matchid": args.matchid}, **addr)
+        # Imported only here: it pulls in the parser, which the other commands avoid.
+        from buzzerbeaters import format_buzzerbeaters
+
+        print(format_buzzerbeaters(args.matchid, records, args.json, args.details))
+    elif args.command == "boxscore":
+        print(json.dumps(query("/boxscore", {"matchid": args.matchid}, **addr), indent=2, ensure_ascii=False))
+    elif args.command == "shot-distances":
+        params = {
+            "teamid": args.teamid,
+            "season": args.season,
+            "count": args.count,
+            "bin_width": args.bin_width,
+            "offline": int(args.offline),
+        }
+        result = query("/shot-distances", params, **addr)
+        print(f"{len(result['matches'])} matches")
+        for label, key in (("3PT", "three"), ("2PT", "two")):
+            h = result[key]
+            if not h["n"]:
+                print(f"{label}: no shots")
+                continue
+            print(f"{label}: {h['n']} shots, mean {h['mean']} ft, median {h['median']} ft")
+            for lo, hi, c in zip(h["edges"], h["edges"][1:], h["counts"]):
+                if c:
+                    print(f"  {lo:6.2f}-{hi:6.2f}  {c}")
+    elif args.command == "descriptions":
+        params = {
+            "teamid": args.teamid,
+            "opponent_id": args.opponent_id,
+            "matchid": args.matchid,
+            "player_id": args.player_id,
+            "order": args.order,
+            "no_url": int(args.no_url),
+            "link_domain": args.link_domain,
+        }
+        for desc in query("/descriptions", params, **addr):
+            print(desc)
+            print()
+    elif args.command == "status":
+        print(json.dumps(query("/status", **addr), indent=2))
+    elif args.command == "stop":
+        query("/stop", method="POST", **addr)
+
+
+class TestServe(unittest.TestCase):
+    def test_lru(self):
+        lru = LRU(2)
+        calls = []
+        for key in (1, 2, 1, 3, 2):
+            lru.get(key, lambda key=key: calls.append(key) or key * 10)
+        # 1 stays warm, 2 is evicted by 3 and recomputed.
+        self.assertEqual(calls, [1, 2, 3, 2])
+        self.assertEqual(lru.stats(), {"entries": 2, "hits": 1, "misses": 4})
+
+    def test_dispatch_errors(self):
+        state = ServerState(":memory:", "output/shots")
+        with self.assertRaises(KeyError):
+            dispatch(state, "/nope", {})
+        with self.assertRaises(ValueError):
+            dispatch(state, "/boxscore", {})
+        self.assertIn("uptime_s", dispatch(state, "/status", {}))
+
+    def test_concurrent_dispatch_keeps_stdout(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        if not os.path.exists("matches/report_20.xml"):
+            self.skipTest("no cached match reports")
+        state = ServerState(":memory:", "output/shots")
+        stdout = sys.stdout
+        queries = [(path, {"matchid": [str(m)]}) for m in range(1, 21) for path in ("/boxscore", "/buzzerbeaters")]
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(lambda q: dispatch(state, *q), queries))
+        self.assertEqual(len(results), 40)
+        self.assertIs(sys.stdout, stdout)
+
+    def test_client_matches_cli(self):
+        import buzzerbeaters
+
+        if not os.path.exists("matches/report_1.xml"):
+            self.skipTest("no cached match reports")
+        server = ThreadingHTTPServer((DEFAULT_HOST, 0), make_handler(ServerState(":memory:", "output/shots")))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        port = str(server.server_address[1])
+        saved_argv = sys.argv
+        try:
+            for flags in ([], ["--details"], ["--json"]):
+                outputs = []
+                for argv, run in (
+                    (["bb-buzzerbeaters", "--matchid", "1", *flags], buzzerbeaters.main),
+                    (["bb-query", "--port", port, "buzzerbeaters", "--matchid", "1", *flags], client_main),
+                ):
+                    sys.argv = argv
+                    with contextlib.redirect_stdout(io.StringIO()) as out:
+                        run()
+                    outputs.append(out.getvalue())
+                self.assertEqual(outputs[0], outputs[1], flags)
+            with self.assertRaises(SystemExit):
+                query("/stop", port=int(port))
+            self.assertEqual(query("/stop", port=int(port), method="POST"), {"stopping": True})
+            thread.join(5)
+            self.assertFalse(thread.is_alive())
+        finally:
+            sys.argv = saved_argv
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
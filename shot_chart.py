@@ -1,8 +1,19 @@
-from PIL import Image, ImageDraw
+import numpy as np
+
+HEATMAP_LAYERS = ("attempts", "made", "pct")
+
+# Colour ramps (low -> high) for density layers and for FG% (cold -> hot).
+_DENSITY_COLORS = np.array([[255, 225, 90], [200, 20, 20]], dtype=np.float64)
+_PCT_COLORS = np.array([[40, 90, 220], [220, 40, 30]], dtype=np.float64)
+# FG% mapped onto the ramp; outside this range the end colours are used.
+_PCT_RANGE = (0.25, 0.65)
 
 
 class ShotChart:
     def __init__(self) -> None:
+        # PIL is only needed once something is drawn.
+        from PIL import Image, ImageDraw
+
         self.img = Image.open("court.png")
         self.img_draw = ImageDraw.Draw(self.img)
 
@@ -16,3 +27,67 @@ class ShotChart:
 
     def save(self, name):
         self.img.save(name)
+
+
+def _ramp(colors: np.ndarray, t: np.ndarray) -> np.ndarray:
+    t = np.clip(t, 0.0, 1.0)[..., None]
+    return colors[0] * (1 - t) + colors[1] * t
+
+
+def heatmap_image(x, y, made, layer: str = "attempts", cell: int = 6, court: str = "court.png"):
+    """Bin shots into cell x cell pixel squares and composite one overlay over the court.
+
+    layer "attempts" and "made" shade by density; "pct" colours each cell by
+    FG% with opacity following attempts.
+    """
+    from PIL import Image
+
+    img = Image.open(court).convert("RGBA")
+    width, height = img.size
+    cols, rows = -(-width // cell), -(-height // cell)
+
+    x = np.clip(np.asarray(x, dtype=np.int64), 0, width - 1)
+    y = np.clip(np.asarray(y, dtype=np.int64), 0, height - 1)
+    made = np.asarray(made, dtype=np.float64)
+    index = (y // cell) * cols + x // cell
+    attempts = np.bincount(index, minlength=rows * cols).reshape(rows, cols)
+    makes = np.bincount(index, weights=made, minlength=rows * cols).reshape(rows, cols)
+
+    # Opacity follows attempts, or makes for the "made" layer. The square root
+    # keeps a few hot spots from washing out the rest of the court.
+    counts = makes if layer == "made" else attempts
+    density = np.sqrt(counts / max(counts.max(), 1))
+    if layer == "pct":
+        pct = makes / np.maximum(attempts, 1)
+        rgb = _ramp(_PCT_COLORS, (pct - _PCT_RANGE[0]) / (_PCT_RANGE[1] - _PCT_RANGE[0]))
+    else:
+        rgb = _ramp(_DENSITY_COLORS, density)
+    alpha = np.where(counts > 0, 60 + 170 * density, 0)
+
+    overlay = np.dstack([rgb, alpha]).astype(np.uint8)
+    overlay = np.repeat(np.repeat(overlay, cell, axis=0), cell, axis=1)[:height, :width]
+    return Image.alpha_composite(img, Image.fromarray(overlay, "RGBA"))
+
+
+class HeatmapChart:
+    """ShotChart replacement that collects shots and renders them binned on save()."""
+
+    def __init__(self, layer: str = "attempts", cell: int = 6) -> None:
+        self.layer = layer
+        self.cell = cell
+        self.x: list[int] = []
+        self.y: list[int] = []
+        self.made: list[bool] = []
+
+    def add_made(self, x, y):
+        self.x.append(x)
+        self.y.append(y)
+        self.made.append(True)
+
+    def add_miss(self, x, y):
+        self.x.append(x)
+        self.y.append(y)
+        self.made.append(False)
+
+    def save(self, name):
+        heatmap_image(self.x, self.y, self.made, self.layer, self.cell).save(name)
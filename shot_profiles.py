@@ -0,0 +1,228 @@
+import argparse
+import contextlib
+import csv
+import io
+import os
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from cli_args import add_matchid_args, read_match_ids
+from event_types import ShotResult, ShotType
+from parallel import imap_bounded
+
+SHOT_TYPES = list(ShotType)
+LEVELS = ("league", "team", "player")
+
+MADE = [ShotResult.SCORED, ShotResult.GOALTEND, ShotResult.SCORED_WITH_FOUL]
+FOULED = [ShotResult.MISSED_WITH_FOUL, ShotResult.SCORED_WITH_FOUL]
+
+
+class ShotProfiles:
+    """Shot type x ShotResult counts per (level, season, entity).
+
+    Counts live in one growable array; two instances (e.g. from worker
+    processes) combine with merge(). League rows use entity 0.
+    """
+
+    def __init__(self) -> None:
+        self.index: dict[tuple[str, int, int], int] = {}
+        self.counts = np.zeros((64, len(SHOT_TYPES), len(ShotResult)), dtype=np.int64)
+
+    def _row(self, key: tuple[str, int, int]) -> int:
+        row = self.index.get(key)
+        if row is None:
+            row = len(self.index)
+            self.index[key] = row
+            if row == len(self.counts):
+                self.counts = np.concatenate([self.counts, np.zeros_like(self.counts)])
+        return row
+
+    def add(self, level: str, season: int, entity: int, counts: np.ndarray) -> None:
+        # Resolve the row first: it may grow (replace) self.counts.
+        row = self._row((level, season, entity))
+        self.counts[row] += counts
+
+    def add_match(self, season: int, team_ids: list[int], player_ids: list[list[int]], shot_types) -> None:
+        # shot_types is the game.ShotTypes extension after Game.play.
+        self.add("league", season, 0, shot_types.counts.sum(axis=0))
+        for side in (0, 1):
+            self.add("team", season, team_ids[side], shot_types.counts[side])
+            for index, player_id in enumerate(player_ids[side]):
+                counts = shot_types.player_counts[side, index]
+                if player_id and counts.any():
+                    self.add("player", season, player_id, counts)
+
+    def merge(self, other: "ShotProfiles") -> None:
+        for key, row in other.index.items():
+            self.add(*key, other.counts[row])
+
+    def rows(self, level: str) -> list[list]:
+        """One row per (season, entity, shot type) with attempts, makes and shares."""
+        keys = [(key, row) for key, row in self.index.items() if key[0] == level]
+        if not keys:
+            return []
+        counts = self.counts[[row for _, row in keys]]
+        # A missed shot drawing a foul is not a field goal attempt.
+        attempts = counts.sum(axis=2) - counts[:, :, ShotResult.MISSED_WITH_FOUL]
+        made = counts[:, :, MADE].sum(axis=2)
+        blocked = counts[:, :, ShotResult.BLOCKED]
+        fouled = counts[:, :, FOULED].sum(axis=2)
+        pct = np.round(100 * made / np.maximum(attempts, 1), 1)
+        share = np.round(100 * attempts / np.maximum(attempts.sum(axis=1, keepdims=True), 1), 1)
+
+        out = []
+        for i, ((_, season, entity), _) in enumerate(keys):
+            for k in np.flatnonzero(counts[i].sum(axis=1)):
+                out.append(
+                    [
+                        season,
+                        entity,
+                        SHOT_TYPES[k].name,
+                        int(attempts[i, k]),
+                        int(made[i, k]),
+                        float(pct[i, k]),
+                        int(blocked[i, k]),
+                        int(fouled[i, k]),
+                        float(share[i, k]),
+                    ]
+                )
+        return out
+
+
+HEADERS = ["season", "entity_id", "shot_type", "att", "made", "pct", "blocked", "fouled", "share"]
+
+
+def match_profile(match_id, season: int = 0) -> ShotProfiles:
+    from game import Game, PlayOptions, ShotTypes
+    from main import get_xml_text, parse_xml
+
+    shot_types = ShotTypes()
+    with contextlib.redirect_stdout(io.StringIO()):
+        events, ht, at = parse_xml(get_xml_text(match_id))
+        game = Game(str(match_id), events, ht, at, PlayOptions(), [shot_types])
+        game.play()
+
+    profiles = ShotProfiles()
+    profiles.add_match(
+        season,
+        [team.id for team in game.teams],
+        [[player.id for player in team.players] for team in game.teams],
+        shot_types,
+    )
+    return profiles
+
+
+def _season_profile(item) -> ShotProfiles:
+    return match_profile(*item)
+
+
+def collect_profiles(match_ids, seasons: dict[str, int] | None = None, workers: int = 1) -> tuple[ShotProfiles, int]:
+    """Merge per-match profiles; returns (profiles, matches that failed).
+
+    seasons maps match id to season; other matches are counted under season 0.
+    """
+    seasons = seasons or {}
+    items = [(match_id, seasons.get(str(match_id), 0)) for match_id in match_ids]
+    total = ShotProfiles()
+    failed = 0
+    for _, profiles, error in imap_bounded(_season_profile, items, workers):
+        if error is not None:
+            failed += 1
+        else:
+            total.merge(profiles)
+    return total, failed
+
+
+def match_seasons(match_ids, store_dir: str) -> dict[str, int]:
+    # Seasons recorded in the shot store index by the schedule lookups.
+    from shot_table import ShotStore
+
+    store = ShotStore(store_dir)
+    seasons = {}
+    for match_id in match_ids:
+        season = store.matches.get(str(match_id), {}).get("season")
+        if season is not None:
+            seasons[str(match_id)] = season
+    return seasons
+
+
+def main() -> None:
+    from tabulate import tabulate
+
+    parser = argparse.ArgumentParser(description="Shot type efficiency profiles across many matches.")
+    add_matchid_args(parser)
+    parser.add_argument("--store", default="output/shots", help="Shot store whose index gives each match's season ('' for none)")
+    parser.add_argument("--level", choices=LEVELS, default="league")
+    parser.add_argument("--entity", type=int, default=None, help="Only this team/player id")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (0 = one per CPU)")
+    parser.add_argument("--out", default=None, help="CSV output path (default: output/shot_profiles_<level>.csv)")
+    args = parser.parse_args()
+
+    match_ids = read_match_ids(args)
+    if not match_ids:
+        parser.error("Provide --matchids and/or --matchids-file")
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+
+    seasons = match_seasons(match_ids, args.store) if args.store else {}
+    if len(seasons) < len(match_ids):
+        print(f"Warning: {len(match_ids) - len(seasons)} matches have no season in the shot store; counting them under season 0.", file=sys.stderr)
+    profiles, failed = collect_profiles(match_ids, seasons, workers)
+    rows = profiles.rows(args.level)
+    if args.entity is not None:
+        rows = [r for r in rows if r[1] == args.entity]
+
+    out_path = Path(args.out or f"output/shot_profiles_{args.level}.csv")
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADERS)
+        writer.writerows(rows)
+    print(f"{len(match_ids) - failed} matches ({failed} failed), {len(rows)} rows -> {out_path}")
+    if args.level == "league" or args.entity is not None:
+        print(tabulate(rows, headers=HEADERS))
+
+
+class TestShotProfiles(unittest.TestCase):
+    def test_merge_and_rows(self):
+        counts = np.zeros((len(SHOT_TYPES), len(ShotResult)), dtype=np.int64)
+        layup = SHOT_TYPES.index(ShotType.LAYUP)
+        counts[layup, ShotResult.SCORED] = 3
+        counts[layup, ShotResult.MISSED] = 1
+        counts[layup, ShotResult.MISSED_WITH_FOUL] = 2
+
+        a, b = ShotProfiles(), ShotProfiles()
+        a.add("team", 70, 5, counts)
+        b.add("team", 70, 5, counts)
+        b.add("team", 70, 6, counts)
+        a.merge(b)
+
+        rows = {(r[1], r[2]): r for r in a.rows("team")}
+        self.assertEqual(len(rows), 2)
+        season, entity, name, att, made, pct, blocked, fouled, share = rows[(5, "LAYUP")]
+        self.assertEqual((att, made, fouled, share), (8, 6, 4, 100.0))
+        self.assertEqual(pct, 75.0)
+
+    def test_seasons_from_store(self):
+        import tempfile
+
+        from shot_table import ShotStore
+
+        if not os.path.exists("matches/report_3.xml"):
+            self.skipTest("no cached match reports")
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ShotStore(tmp)
+            store.note(1, season=70)
+            store.note(2, season=71)
+            store.save()
+            seasons = match_seasons([1, 2, 3], tmp)
+        self.assertEqual(seasons, {"1": 70, "2": 71})
+        profiles, failed = collect_profiles([1, 2, 3], seasons)
+        self.assertEqual(failed, 0)
+        self.assertEqual(sorted({r[0] for r in profiles.rows("league")}), [0, 70, 71])
+
+
+if __name__ == "__main__":
+    main()
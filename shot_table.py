@@ -0,0 +1,243 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from event import BaseEvent, Clocks, ShotEvent, ShotPos, convert
+from event_types import ShotResult, ShotType
+
+# Court image is 368px wide and baskets are at x=21 and x=347 (326px apart).
+# Real basket-to-basket distance is 83.5 ft (94 ft court - 2 * 5.25 ft).
+FT_PER_PX = 83.5 / 326
+# Basket each side shoots at, indexed by attacking team (0 = home).
+BASKET_X = np.array([347, 21])
+BASKET_Y = 96
+
+THREE_POINTERS = [int(t) for t in ShotType if t // 100 == 1]
+
+# One array per column, all of the same length (one entry per shot).
+SHOT_COLUMNS = ("side", "team", "player", "shot_type", "result", "x", "y", "distance_ft", "gameclock")
+
+
+def shot_distance_px(x, y, side):
+    """Distance from (x, y) to the basket `side` attacks; scalars or arrays."""
+    dx = np.asarray(x) - BASKET_X[side]
+    dy = np.asarray(y) - BASKET_Y
+    return np.sqrt(dx * dx + dy * dy)
+
+
+def empty_shots() -> dict[str, np.ndarray]:
+    return {
+        name: np.zeros(0, dtype=np.float64 if name == "distance_ft" else np.int64)
+        for name in SHOT_COLUMNS
+    }
+
+
+def shots_from_events(baseevents: list[BaseEvent], team_ids=(0, 0), player_ids=((), ())) -> dict[str, np.ndarray]:
+    """Shot table of one match's base events.
+
+    team_ids and player_ids (by roster index) map sides and attackers to ids;
+    unknown attackers get player 0. Shots without a position are skipped.
+    """
+    shots = [be for be in baseevents if isinstance(be, ShotEvent) and be.shot_pos is not None]
+    if not shots:
+        return empty_shots()
+
+    raw = np.array(
+        [
+            (be.att_team, be.attacker, int(be.shot_type), int(be.shot_result), be.shot_pos.x, be.shot_pos.y, be.gameclock)
+            for be in shots
+        ],
+        dtype=np.int64,
+    )
+    side, attacker, shot_type, result, x, y, gameclock = raw.T
+
+    player = np.zeros(len(raw), dtype=np.int64)
+    for s in (0, 1):
+        ids = np.array([0, *player_ids[s]], dtype=np.int64)
+        mask = (side == s) & (attacker > 0) & (attacker < len(ids))
+        player[mask] = ids[attacker[mask]]
+
+    return {
+        "side": side,
+        "team": np.asarray(team_ids, dtype=np.int64)[side],
+        "player": player,
+        "shot_type": shot_type,
+        "result": result,
+        "x": x,
+        "y": y,
+        "distance_ft": shot_distance_px(x, y, side) * FT_PER_PX,
+        "gameclock": gameclock,
+    }
+
+
+def match_shot_table(match_id) -> tuple[dict[str, np.ndarray], tuple[int, int]]:
+    """Parse one match report into its shot table and (home, away) team ids.
+
+    Commentary is not rendered; actors are resolved because convert() needs them.
+    """
+    from comments import Comments
+    from main import get_xml_text, parse_xml
+
+    events, ht, at = parse_xml(get_xml_text(match_id), quiet=True)
+    comments = Comments()
+    for event in events:
+        comments.set_actors(event, [ht, at])
+    baseevents = convert(events)
+    team_ids = (int(ht.id), int(at.id))
+    shots = shots_from_events(baseevents, team_ids, ([p.id for p in ht.players], [p.id for p in at.players]))
+    return shots, team_ids
+
+
+def match_shots(match_id) -> dict[str, np.ndarray]:
+    return match_shot_table(match_id)[0]
+
+
+def concat_shots(tables) -> dict[str, np.ndarray]:
+    tables = list(tables)
+    if not tables:
+        return empty_shots()
+    return {name: np.concatenate([t[name] for t in tables]) for name in SHOT_COLUMNS}
+
+
+def is_three(shots: dict[str, np.ndarray]) -> np.ndarray:
+    return np.isin(shots["shot_type"], THREE_POINTERS)
+
+
+def is_made(shots: dict[str, np.ndarray]) -> np.ndarray:
+    return np.isin(shots["result"], [ShotResult.SCORED, ShotResult.GOALTEND, ShotResult.SCORED_WITH_FOUL])
+
+
+class ShotStore:
+    """Shot tables of parsed matches kept on disk, one npz per match.
+
+    index.json maps every known match to its season, start time and team ids,
+    so (team, season) lookups do not open match files. It also keeps team
+    schedules of finished seasons, which no longer change. A match is parsed
+    once, the first time its shots are requested.
+    """
+
+    def __init__(self, root: str = "output/shots") -> None:
+        self.root = Path(root)
+        self.index_path = self.root / "index.json"
+        self.matches: dict[str, dict] = {}
+        self.schedules: dict[str, list] = {}
+        if self.index_path.exists():
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.matches = data.get("matches", {})
+            self.schedules = data.get("schedules", {})
+        self._dirty = False
+
+    def _path(self, match_id) -> Path:
+        return self.root / f"{match_id}.npz"
+
+    def note(self, match_id, season: int | None = None, start: str | None = None) -> None:
+        # Record schedule details of a match, whether or not its shots are stored yet.
+        entry = self.matches.setdefault(str(match_id), {})
+        for key, value in (("season", season), ("start", start)):
+            if value is not None and entry.get(key) != value:
+                entry[key] = value
+                self._dirty = True
+
+    def schedule(self, team_id: int, season: int) -> list | None:
+        return self.schedules.get(f"{team_id}:{season}")
+
+    def set_schedule(self, team_id: int, season: int, matches: list) -> None:
+        self.schedules[f"{team_id}:{season}"] = [list(m) for m in matches]
+        self._dirty = True
+
+    def shots(self, match_id) -> dict[str, np.ndarray]:
+        path = self._path(match_id)
+        if path.exists():
+            with np.load(path) as data:
+                return {name: data[name] for name in SHOT_COLUMNS}
+
+        shots, team_ids = match_shot_table(match_id)
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(f, **shots)
+        self.matches.setdefault(str(match_id), {})["teams"] = list(team_ids)
+        self._dirty = True
+        return shots
+
+    def load(self, match_ids) -> dict[str, np.ndarray]:
+        """Concatenated shots of the given matches, parsing only the new ones."""
+        try:
+            return concat_shots(self.shots(match_id) for match_id in match_ids)
+        finally:
+            self.save()
+
+    def find(self, team_id: int | None = None, seasons=None) -> list[str]:
+        """Stored matches of a team and/or seasons, most recent first."""
+        out = []
+        for match_id, entry in self.matches.items():
+            if "teams" not in entry:
+                continue
+            if team_id is not None and team_id not in entry["teams"]:
+                continue
+            if seasons is not None and entry.get("season") not in seasons:
+                continue
+            out.append(match_id)
+        out.sort(key=lambda m: (self.matches[m].get("start") or "", int(m) if m.isdigit() else 0), reverse=True)
+        return out
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"matches": self.matches, "schedules": self.schedules}, f)
+        tmp.replace(self.index_path)
+        self._dirty = False
+
+
+def _shot(side: int, attacker: int, shot_type: ShotType, x: int, y: int) -> ShotEvent:
+    return ShotEvent([], Clocks(5, 0, 0), shot_type, ShotResult.SCORED, attacker, 1, 0, side, 1 - side, ShotPos(x, y))
+
+
+class TestShotTable(unittest.TestCase):
+    def test_shots_from_events(self):
+        events = [
+            _shot(0, 2, ShotType.THREE_POINTER_CORNER, 347, 10),
+            _shot(1, 1, ShotType.LAYUP, 24, 100),
+            _shot(1, 9, ShotType.DUNK1, 21, 96),
+        ]
+        shots = shots_from_events(events, (10, 20), ([101, 102], [201]))
+        self.assertEqual(shots["team"].tolist(), [10, 20, 20])
+        self.assertEqual(shots["player"].tolist(), [102, 201, 0])
+        self.assertEqual(is_three(shots).tolist(), [True, False, False])
+        self.assertTrue(is_made(shots).all())
+        self.assertAlmostEqual(shots["distance_ft"][0], 86 * FT_PER_PX)
+        self.assertAlmostEqual(shots["distance_ft"][1], 5 * FT_PER_PX)
+        self.assertEqual(shots["distance_ft"][2], 0.0)
+
+    def test_concat(self):
+        shots = concat_shots([empty_shots(), shots_from_events([_shot(0, 1, ShotType.HOOK, 340, 96)])])
+        self.assertEqual(len(shots["x"]), 1)
+        self.assertAlmostEqual(float(shot_distance_px(340, 96, 0)), 7.0)
+
+    def test_store_index(self):
+        with tempfile.TemporaryDirectory() as root:
+            store = ShotStore(root)
+            store.note(1, season=70, start="2025-01-02")
+            store.note(2, season=70, start="2025-01-05")
+            store.note(3, season=69, start="2024-06-01")
+            for match_id, teams in (("1", [5, 6]), ("2", [7, 5]), ("3", [5, 8])):
+                store.matches[match_id]["teams"] = teams
+            store.set_schedule(5, 69, [(3, "2024-06-01")])
+            store.save()
+
+            reopened = ShotStore(root)
+            self.assertEqual(reopened.find(5), ["2", "1", "3"])
+            self.assertEqual(reopened.find(5, {69}), ["3"])
+            self.assertEqual(reopened.find(6), ["1"])
+            self.assertEqual(reopened.schedule(5, 69), [[3, "2024-06-01"]])
+            self.assertIsNone(reopened.schedule(5, 70))
+
+
+if __name__ == "__main__":
+    unittest.main()
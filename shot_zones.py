@@ -0,0 +1,210 @@
+import argparse
+import csv
+import unittest
+from enum import IntEnum
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from cli_args import add_matchid_args, read_match_ids
+from event_types import ShotResult
+from shot_table import BASKET_X, BASKET_Y, FT_PER_PX, ShotStore, concat_shots, is_made, is_three, match_shots
+
+# Size of court.png; shot positions are pixels on this image.
+COURT_WIDTH = 368
+COURT_HEIGHT = 192
+
+# Court geometry in feet, measured from the basket.
+RESTRICTED_RADIUS = 4.0
+LANE_HALF_WIDTH = 8.0
+LANE_DEPTH = 19.0 - 5.25  # free throw line to basket
+ARC_RADIUS = 23.75
+CORNER_DISTANCE = 22.0
+HALF_COURT = 47.0 - 5.25
+
+
+class Zone(IntEnum):
+    RESTRICTED_AREA = 0
+    PAINT = 1
+    MID_RANGE_LEFT = 2
+    MID_RANGE_CENTER = 3
+    MID_RANGE_RIGHT = 4
+    CORNER_3_LEFT = 5
+    CORNER_3_RIGHT = 6
+    ABOVE_BREAK_3_LEFT = 7
+    ABOVE_BREAK_3_CENTER = 8
+    ABOVE_BREAK_3_RIGHT = 9
+    BACKCOURT = 10
+
+
+def _side_zones(side: int) -> np.ndarray:
+    # u: feet from the basket towards half court, v: feet to the shooter's left.
+    y, x = np.mgrid[0:COURT_HEIGHT, 0:COURT_WIDTH]
+    if side == 0:
+        u = (BASKET_X[0] - x) * FT_PER_PX
+        v = (BASKET_Y - y) * FT_PER_PX
+    else:
+        u = (x - BASKET_X[1]) * FT_PER_PX
+        v = (y - BASKET_Y) * FT_PER_PX
+    dist = np.sqrt(u * u + v * v)
+    left = v > LANE_HALF_WIDTH
+    right = v < -LANE_HALF_WIDTH
+
+    corner = np.abs(v) >= CORNER_DISTANCE
+    corner_depth = np.sqrt(ARC_RADIUS**2 - CORNER_DISTANCE**2)
+    three = np.where(u <= corner_depth, corner, dist >= ARC_RADIUS)
+
+    zones = np.full(u.shape, Zone.MID_RANGE_CENTER, dtype=np.uint8)
+    zones[left] = Zone.MID_RANGE_LEFT
+    zones[right] = Zone.MID_RANGE_RIGHT
+    zones[~left & ~right & (u <= LANE_DEPTH)] = Zone.PAINT
+    zones[three & left] = Zone.ABOVE_BREAK_3_LEFT
+    zones[three & right] = Zone.ABOVE_BREAK_3_RIGHT
+    zones[three & ~left & ~right] = Zone.ABOVE_BREAK_3_CENTER
+    zones[three & corner & (u <= corner_depth) & (v > 0)] = Zone.CORNER_3_LEFT
+    zones[three & corner & (u <= corner_depth) & (v < 0)] = Zone.CORNER_3_RIGHT
+    zones[dist <= RESTRICTED_RADIUS] = Zone.RESTRICTED_AREA
+    zones[u > HALF_COURT] = Zone.BACKCOURT
+    return zones
+
+
+@lru_cache(maxsize=None)
+def zone_raster() -> np.ndarray:
+    """(2, COURT_HEIGHT, COURT_WIDTH) zone id per pixel, indexed by attacking side."""
+    raster = np.stack([_side_zones(0), _side_zones(1)])
+    raster.setflags(write=False)
+    return raster
+
+
+def classify(x, y, side) -> np.ndarray:
+    """Zone ids for arrays of shot pixel positions (one lookup, no geometry)."""
+    x = np.clip(np.asarray(x), 0, COURT_WIDTH - 1)
+    y = np.clip(np.asarray(y), 0, COURT_HEIGHT - 1)
+    return zone_raster()[side, y, x]
+
+
+HEADERS = ["entity_id", "zone", "att", "made", "pct", "pts", "pts_per_shot", "share"]
+
+
+def zone_totals(shots: dict[str, np.ndarray], level: str = "team"):
+    """Attempts, makes and points per (entity, zone).
+
+    level is "team" or "player". Returns (entities, att, made, pts) where
+    the count arrays are (entities, len(Zone)).
+    """
+    # A missed shot drawing a foul is not a field goal attempt.
+    attempt = shots["result"] != ShotResult.MISSED_WITH_FOUL
+    made = is_made(shots)
+    pts = np.where(made, np.where(is_three(shots), 3, 2), 0)
+    zones = classify(shots["x"], shots["y"], shots["side"]).astype(np.int64)
+
+    entities, inv = np.unique(shots[level], return_inverse=True)
+    flat = inv.ravel() * len(Zone) + zones
+    size = len(entities) * len(Zone)
+    shape = (len(entities), len(Zone))
+    return (
+        entities,
+        np.bincount(flat, weights=attempt, minlength=size).reshape(shape).astype(np.int64),
+        np.bincount(flat, weights=made, minlength=size).reshape(shape).astype(np.int64),
+        np.bincount(flat, weights=pts, minlength=size).reshape(shape).astype(np.int64),
+    )
+
+
+def zone_rows(entities, att, made, pts) -> list[list]:
+    pct = np.round(100 * made / np.maximum(att, 1), 1)
+    per_shot = np.round(pts / np.maximum(att, 1), 2)
+    share = np.round(100 * att / np.maximum(att.sum(axis=1, keepdims=True), 1), 1)
+    rows = []
+    for i, entity in enumerate(entities.tolist()):
+        for zone in Zone:
+            if att[i, zone] == 0:
+                continue
+            rows.append(
+                [
+                    entity,
+                    zone.name,
+                    int(att[i, zone]),
+                    int(made[i, zone]),
+                    float(pct[i, zone]),
+                    int(pts[i, zone]),
+                    float(per_shot[i, zone]),
+                    float(share[i, zone]),
+                ]
+            )
+    return rows
+
+
+def main() -> None:
+    from tabulate import tabulate
+
+    parser = argparse.ArgumentParser(description="Shooting splits by court zone per team or player.")
+    add_matchid_args(parser)
+    parser.add_argument("--teamid", type=int, default=None, help="Only this team's shots; without match ids, its stored matches")
+    parser.add_argument("--season", type=int, nargs="+", default=None, help="Stored matches of these seasons (with --teamid)")
+    parser.add_argument("--level", choices=("team", "player"), default="team")
+    parser.add_argument("--store", default="output/shots", help="Shot store directory ('' to disable)")
+    parser.add_argument("--out", default=None, help="CSV output path (default: output/shot_zones_<level>.csv)")
+    args = parser.parse_args()
+
+    store = ShotStore(args.store) if args.store else None
+    match_ids = read_match_ids(args)
+    if not match_ids and args.teamid is not None and store is not None:
+        match_ids = store.find(args.teamid, set(args.season) if args.season else None)
+    match_ids = list(dict.fromkeys(match_ids))
+    if not match_ids:
+        parser.error("Provide --matchids, --matchids-file or --teamid with stored matches")
+
+    if store is not None:
+        shots = store.load(match_ids)
+    else:
+        shots = concat_shots(match_shots(m) for m in match_ids)
+    if args.teamid is not None:
+        keep = shots["team"] == args.teamid
+        shots = {name: column[keep] for name, column in shots.items()}
+
+    rows = zone_rows(*zone_totals(shots, args.level))
+    out_path = Path(args.out or f"output/shot_zones_{args.level}.csv")
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADERS)
+        writer.writerows(rows)
+    print(f"{len(shots['x'])} shots from {len(match_ids)} matches, {len(rows)} rows -> {out_path}")
+    if args.teamid is not None and args.level == "team":
+        print(tabulate(rows, headers=HEADERS))
+
+
+class TestShotZones(unittest.TestCase):
+    def test_raster(self):
+        raster = zone_raster()
+        self.assertEqual(raster.shape, (2, COURT_HEIGHT, COURT_WIDTH))
+        # At the basket, in the lane, and beyond half court.
+        self.assertEqual(classify([347, 21], [96, 96], [0, 1]).tolist(), [Zone.RESTRICTED_AREA] * 2)
+        self.assertEqual(int(classify(347 - 40, 96, 0)), Zone.PAINT)
+        self.assertEqual(int(classify(100, 96, 0)), Zone.BACKCOURT)
+        # The same spot is a left corner three for one side and a right corner three for the other.
+        self.assertEqual(int(classify(360, 2, 0)), Zone.CORNER_3_LEFT)
+        self.assertEqual(int(classify(8, 2, 1)), Zone.CORNER_3_RIGHT)
+        self.assertEqual(int(classify(347 - 110, 96, 0)), Zone.ABOVE_BREAK_3_CENTER)
+
+    def test_totals(self):
+        shots = {
+            "side": np.array([0, 0, 0, 1]),
+            "team": np.array([5, 5, 5, 6]),
+            "player": np.array([1, 1, 2, 3]),
+            "shot_type": np.array([402, 402, 100, 402]),
+            "result": np.array([ShotResult.SCORED, ShotResult.MISSED_WITH_FOUL, ShotResult.SCORED, ShotResult.MISSED]),
+            "x": np.array([347, 346, 347 - 110, 21]),
+            "y": np.array([96, 96, 96, 96]),
+        }
+        entities, att, made, pts = zone_totals(shots, "team")
+        self.assertEqual(entities.tolist(), [5, 6])
+        self.assertEqual(att[0, Zone.RESTRICTED_AREA], 1)
+        self.assertEqual(pts[0, Zone.ABOVE_BREAK_3_CENTER], 3)
+        rows = zone_rows(entities, att, made, pts)
+        self.assertEqual([r[:4] for r in rows], [[5, "RESTRICTED_AREA", 1, 1], [5, "ABOVE_BREAK_3_CENTER", 1, 1], [6, "RESTRICTED_AREA", 1, 0]])
+
+
+if __name__ == "__main__":
+    main()
@@ -18,52 +18,106 @@ def _load_module(path: Path, name: str) -> ModuleType:
     return module
 
 
+def _run(filename: str, name: str, entry: str = "main") -> None:
+    # --cprofile/--tracemalloc/--flamegraph work for every command; the
+    # profiling helpers are only loaded when one of them is given.
+    if any(arg.split("=", 1)[0] in ("--cprofile", "--tracemalloc", "--flamegraph") for arg in sys.argv[1:]):
+        profiling = _load_module(Path.cwd() / "cli_profile.py", "_bbinsider_cli_profile")
+        profiling.run_profiled(lambda: getattr(_load_module(Path.cwd() / filename, name), entry)())
+        return
+    getattr(_load_module(Path.cwd() / filename, name), entry)()
+
+
 def main() -> None:
     # Load root-level main.py so users can run from repo root without refactor.
-    module = _load_module(Path.cwd() / "main.py", "_bbinsider_main")
-    module.main()
+    _run("main.py", "_bbinsider_main")
 
 
 def shotchart() -> None:
     # Load root-level event.py so users can run from repo root without refactor.
-    module = _load_module(Path.cwd() / "event.py", "_bbinsider_event")
-    module.shotchart_main()
+    _run("event.py", "_bbinsider_event", "shotchart_main")
 
 
 def buzzerbeaters() -> None:
     # Load root-level buzzerbeaters.py so users can run from repo root without refactor.
-    module = _load_module(Path.cwd() / "buzzerbeaters.py", "_bbinsider_buzzerbeaters")
-    module.main()
+    _run("buzzerbeaters.py", "_bbinsider_buzzerbeaters")
 
 
 def team_info() -> None:
     # Load root-level team_info.py from repo root.
-    module = _load_module(Path.cwd() / "team_info.py", "_bbinsider_team_info")
-    module.main()
+    _run("team_info.py", "_bbinsider_team_info")
 
 
 def team_buzzerbeaters() -> None:
     # Load root-level team_buzzerbeaters.py from repo root.
-    module = _load_module(
-        Path.cwd() / "team_buzzerbeaters.py",
-        "_bbinsider_team_buzzerbeaters",
-    )
-    module.main()
+    _run("team_buzzerbeaters.py", "_bbinsider_team_buzzerbeaters")
 
 
 def team_shot_distance_hist() -> None:
     # Load root-level team_shot_distance_hist.py from repo root.
-    module = _load_module(
-        Path.cwd() / "team_shot_distance_hist.py",
-        "_bbinsider_team_shot_distance_hist",
-    )
-    module.main()
+    _run("team_shot_distance_hist.py", "_bbinsider_team_shot_distance_hist")
 
 
 def buzzerbeater_descriptions() -> None:
     # Load root-level buzzerbeater_descriptions.py from repo root.
-    module = _load_module(
-        Path.cwd() / "buzzerbeater_descriptions.py",
-        "_bbinsider_buzzerbeater_descriptions",
-    )
-    module.main()
+    _run("buzzerbeater_descriptions.py", "_bbinsider_buzzerbeater_descriptions")
+
+
+def season_stats() -> None:
+    # Load root-level season_stats.py from repo root.
+    _run("season_stats.py", "_bbinsider_season_stats")
+
+
+def verify() -> None:
+    # Load root-level verify.py from repo root.
+    _run("verify.py", "_bbinsider_verify")
+
+
+def lineups() -> None:
+    # Load root-level lineups.py from repo root.
+    _run("lineups.py", "_bbinsider_lineups")
+
+
+def on_off() -> None:
+    # Load root-level on_off.py from repo root.
+    _run("on_off.py", "_bbinsider_on_off")
+
+
+def pace() -> None:
+    # Load root-level pace.py from repo root.
+    _run("pace.py", "_bbinsider_pace")
+
+
+def shot_profiles() -> None:
+    # Load root-level shot_profiles.py from repo root.
+    _run("shot_profiles.py", "_bbinsider_shot_profiles")
+
+
+def shot_zones() -> None:
+    # Load root-level shot_zones.py from repo root.
+    _run("shot_zones.py", "_bbinsider_shot_zones")
+
+
+def season_shot_chart() -> None:
+    # Load root-level season_shot_chart.py from repo root.
+    _run("season_shot_chart.py", "_bbinsider_season_shot_chart")
+
+
+def startup_bench() -> None:
+    # Load root-level startup_bench.py from repo root.
+    _run("startup_bench.py", "_bbinsider_startup_bench")
+
+
+def serve() -> None:
+    # Load root-level serve.py from repo root.
+    _run("serve.py", "_bbinsider_serve")
+
+
+def query() -> None:
+    # Thin client for a running bb-serve.
+    _run("serve.py", "_bbinsider_serve", "client_main")
+
+
+def golden() -> None:
+    # Load root-level golden.py from repo root.
+    _run("golden.py", "_bbinsider_golden")
@@ -0,0 +1,97 @@
+import argparse
+import re
+import subprocess
+import sys
+import unittest
+
+# Root module behind each console script (see src/bb_events/cli.py).
+COMMANDS = {
+    "bbinsider": "main",
+    "bbinsider-shotchart": "event",
+    "bb-buzzerbeaters": "buzzerbeaters",
+    "bb-team-info": "team_info",
+    "bb-team-buzzerbeaters": "team_buzzerbeaters",
+    "bb-team-shot-distance-hist": "team_shot_distance_hist",
+    "bb-buzzerbeater-descriptions": "buzzerbeater_descriptions",
+    "bb-season-stats": "season_stats",
+    "bb-verify": "verify",
+    "bb-lineups": "lineups",
+    "bb-on-off": "on_off",
+    "bb-pace": "pace",
+    "bb-shot-profiles": "shot_profiles",
+    "bb-shot-zones": "shot_zones",
+    "bb-season-shotchart": "season_shot_chart",
+    "bb-serve": "serve",
+    "bb-query": "serve",
+    "bb-golden": "golden",
+}
+
+# Packages that must only be imported by the code path that uses them,
+# never while a command module is loaded (e.g. for --help).
+LAZY_PACKAGES = ("matplotlib", "requests", "bs4", "PIL", "tabulate", "rich")
+
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def import_profile(module: str) -> tuple[int, list[str]]:
+    """Import `module` in a fresh interpreter.
+
+    Returns its cumulative import time in microseconds (from -X importtime)
+    and the LAZY_PACKAGES it pulled in.
+    """
+    code = f"import sys, {module}; print(' '.join(sorted(sys.modules)))"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        # Top-level entries have no indentation after the separator.
+        if match and match.group(4) == module and len(match.group(3)) == 1:
+            total = int(match.group(2))
+    loaded = set(proc.stdout.split())
+    return total, [name for name in LAZY_PACKAGES if name in loaded]
+
+
+def main() -> None:
+    from tabulate import tabulate
+
+    parser = argparse.ArgumentParser(description="Import time of each console script module (python -X importtime).")
+    parser.add_argument("commands", nargs="*", help="Commands to measure (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per module; the fastest is reported")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail when a module takes longer to import")
+    args = parser.parse_args()
+
+    commands = args.commands or list(COMMANDS)
+    unknown = [c for c in commands if c not in COMMANDS]
+    if unknown:
+        parser.error(f"Unknown commands: {', '.join(unknown)}")
+
+    rows = []
+    failed = False
+    for command in commands:
+        module = COMMANDS[command]
+        runs = [import_profile(module) for _ in range(max(args.repeat, 1))]
+        ms = min(total for total, _ in runs) / 1000
+        eager = runs[0][1]
+        over = args.budget_ms is not None and ms > args.budget_ms
+        failed |= bool(eager) or over
+        rows.append([command, module, round(ms, 1), ", ".join(eager) or "-", "over budget" if over else ""])
+    print(tabulate(rows, headers=["command", "module", "import_ms", "eager heavy imports", ""]))
+    if failed:
+        sys.exit(1)
+
+
+class TestStartup(unittest.TestCase):
+    def test_no_eager_heavy_imports(self):
+        for command, module in COMMANDS.items():
+            with self.subTest(command=command):
+                _, eager = import_profile(module)
+                self.assertEqual(eager, [], f"{module} imports {eager} at module level")
+
+
+if __name__ == "__main__":
+    main()
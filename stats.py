@@ -1,5 +1,8 @@
+import unittest
 from enum import IntEnum
 
+import numpy as np
+
 
 class Statistic(IntEnum):
     Points = 0
@@ -38,9 +41,33 @@ class Statistic(IntEnum):
     TeamStats = 32
 
 
+# Statistics compared by Team.__eq__ against the BB API boxscore.
+VERIFIED_STATS = [
+    Statistic.Points,
+    Statistic.FieldGoalsMade,
+    Statistic.FieldGoalsAtt,
+    Statistic.ThreePointsMade,
+    Statistic.ThreePointsAtt,
+    Statistic.FreeThrowsMade,
+    Statistic.FreeThrowsAtt,
+    Statistic.OffRebounds,
+    Statistic.DefRebounds,
+    Statistic.Assists,
+    Statistic.Turnovers,
+    Statistic.Steals,
+    Statistic.Blocks,
+    Statistic.Fouls,
+]
+
+SECS_BY_POSITION = slice(Statistic.SecsPG, Statistic.SecsC + 1)
+
+
 class StatSheet:
-    def __init__(self) -> None:
-        self.sheet = [0] * Statistic.TeamStats
+    def __init__(self, sheet: np.ndarray | None = None) -> None:
+        # Usually a row view into a Stats array, so writes land in the game array.
+        if sheet is None:
+            sheet = np.zeros(Statistic.TeamStats, dtype=np.int64)
+        self.sheet = sheet
 
     def __repr__(self) -> str:
         return f"""Stats
@@ -79,51 +106,53 @@ class StatSheet:
         ]
 
     def player_stats(self):
+        sheet = self.sheet.tolist()
         return {
-            "secs_pg": self.sheet[Statistic.SecsPG],
-            "secs_sg": self.sheet[Statistic.SecsSG],
-            "secs_sf": self.sheet[Statistic.SecsSF],
-            "secs_pf": self.sheet[Statistic.SecsPF],
-            "secs_c": self.sheet[Statistic.SecsC],
+            "secs_pg": sheet[Statistic.SecsPG],
+            "secs_sg": sheet[Statistic.SecsSG],
+            "secs_sf": sheet[Statistic.SecsSF],
+            "secs_pf": sheet[Statistic.SecsPF],
+            "secs_c": sheet[Statistic.SecsC],
             "mins": self.minutes(),
-            "pts": self.sheet[Statistic.Points],
-            "fgm": self.sheet[Statistic.FieldGoalsMade],
-            "fga": self.sheet[Statistic.FieldGoalsAtt],
-            "tpm": self.sheet[Statistic.ThreePointsMade],
-            "tpa": self.sheet[Statistic.ThreePointsAtt],
-            "ftm": self.sheet[Statistic.FreeThrowsMade],
-            "fta": self.sheet[Statistic.FreeThrowsAtt],
-            "+/-": self.sheet[Statistic.PlusMinus],
-            "or": self.sheet[Statistic.OffRebounds],
-            "dr": self.sheet[Statistic.DefRebounds],
-            "tr": self.sheet[Statistic.OffRebounds] + self.sheet[Statistic.DefRebounds],
-            "ast": self.sheet[Statistic.Assists],
-            "to": self.sheet[Statistic.Turnovers],
-            "stl": self.sheet[Statistic.Steals],
-            "blk": self.sheet[Statistic.Blocks],
-            "pf": self.sheet[Statistic.Fouls],
+            "pts": sheet[Statistic.Points],
+            "fgm": sheet[Statistic.FieldGoalsMade],
+            "fga": sheet[Statistic.FieldGoalsAtt],
+            "tpm": sheet[Statistic.ThreePointsMade],
+            "tpa": sheet[Statistic.ThreePointsAtt],
+            "ftm": sheet[Statistic.FreeThrowsMade],
+            "fta": sheet[Statistic.FreeThrowsAtt],
+            "+/-": sheet[Statistic.PlusMinus],
+            "or": sheet[Statistic.OffRebounds],
+            "dr": sheet[Statistic.DefRebounds],
+            "tr": sheet[Statistic.OffRebounds] + sheet[Statistic.DefRebounds],
+            "ast": sheet[Statistic.Assists],
+            "to": sheet[Statistic.Turnovers],
+            "stl": sheet[Statistic.Steals],
+            "blk": sheet[Statistic.Blocks],
+            "pf": sheet[Statistic.Fouls],
             "dunks": None,
             "points_in_the_paint": None,
         }
 
     def team_stats(self):
+        sheet = self.sheet.tolist()
         return {
-            "pts": self.sheet[Statistic.Points],
-            "fgm": self.sheet[Statistic.FieldGoalsMade],
-            "fga": self.sheet[Statistic.FieldGoalsAtt],
-            "tpm": self.sheet[Statistic.ThreePointsMade],
-            "tpa": self.sheet[Statistic.ThreePointsAtt],
-            "ftm": self.sheet[Statistic.FreeThrowsMade],
-            "fta": self.sheet[Statistic.FreeThrowsAtt],
-            "+/-": self.sheet[Statistic.PlusMinus],
-            "or": self.sheet[Statistic.OffRebounds],
-            "dr": self.sheet[Statistic.DefRebounds],
-            "tr": self.sheet[Statistic.OffRebounds] + self.sheet[Statistic.DefRebounds],
-            "ast": self.sheet[Statistic.Assists],
-            "to": self.sheet[Statistic.Turnovers],
-            "stl": self.sheet[Statistic.Steals],
-            "blk": self.sheet[Statistic.Blocks],
-            "pf": self.sheet[Statistic.Fouls],
+            "pts": sheet[Statistic.Points],
+            "fgm": sheet[Statistic.FieldGoalsMade],
+            "fga": sheet[Statistic.FieldGoalsAtt],
+            "tpm": sheet[Statistic.ThreePointsMade],
+            "tpa": sheet[Statistic.ThreePointsAtt],
+            "ftm": sheet[Statistic.FreeThrowsMade],
+            "fta": sheet[Statistic.FreeThrowsAtt],
+            "+/-": sheet[Statistic.PlusMinus],
+            "or": sheet[Statistic.OffRebounds],
+            "dr": sheet[Statistic.DefRebounds],
+            "tr": sheet[Statistic.OffRebounds] + sheet[Statistic.DefRebounds],
+            "ast": sheet[Statistic.Assists],
+            "to": sheet[Statistic.Turnovers],
+            "stl": sheet[Statistic.Steals],
+            "blk": sheet[Statistic.Blocks],
+            "pf": sheet[Statistic.Fouls],
             "dunks": None,
             "points_in_the_paint": None,
             "fastbreak_points": None,
@@ -138,23 +167,87 @@ class StatSheet:
         }
 
     def minutes(self):
-        return (
-            round(self.sheet[Statistic.SecsPG] / 60)
-            + round(self.sheet[Statistic.SecsSG] / 60)
-            + round(self.sheet[Statistic.SecsSF] / 60)
-            + round(self.sheet[Statistic.SecsPF] / 60)
-            + round(self.sheet[Statistic.SecsC] / 60)
-        )
+        return sum(round(secs / 60) for secs in self.sheet[SECS_BY_POSITION].tolist())
 
 
 class Stats:
-    def __init__(self) -> None:
-        self.full = StatSheet()
+    """Per-period stat sheets of one team or player in a single array.
+
+    Row 0 holds the full-game totals and rows 1..n one period each, so `full`
+    and `qtr` are views into `data` and whole-game tables are array slices.
+    """
+
+    def __init__(self, periods: int = 4) -> None:
+        self.data = np.zeros((periods + 1, Statistic.TeamStats), dtype=np.int64)
+        self.periods = 0
+        self.full = StatSheet(self.data[0])
         self.qtr: list[StatSheet] = []
 
     def add(self, stat: Statistic, val: int):
-        self.full.sheet[stat] += val
-        self.qtr[-1].sheet[stat] += val
+        self.data[0, stat] += val
+        if self.periods:
+            self.data[self.periods, stat] += val
 
     def new_qtr_sheet(self):
-        self.qtr.append(StatSheet())
+        self.periods += 1
+        if self.periods == len(self.data):
+            # Overtime: grow the array and re-point the sheet views at it.
+            data = np.zeros((2 * len(self.data) - 1, Statistic.TeamStats), dtype=np.int64)
+            data[: len(self.data)] = self.data
+            self.data = data
+            self.full = StatSheet(data[0])
+            self.qtr = [StatSheet(data[i]) for i in range(1, self.periods)]
+        self.qtr.append(StatSheet(self.data[self.periods]))
+
+    def by_period(self) -> np.ndarray:
+        # periods x statistic
+        return self.data[1 : self.periods + 1]
+
+
+def stack_totals(stats: list[Stats]) -> np.ndarray:
+    """Full-game rows of many Stats as one (n, statistic) array.
+
+    Used for a team's players in one game or one player's games across a
+    season; averages and percentiles are then plain reductions over axis 0.
+    """
+    if not stats:
+        return np.zeros((0, Statistic.TeamStats), dtype=np.int64)
+    return np.stack([s.data[0] for s in stats])
+
+
+def stack_periods(stats: list[Stats], periods: int | None = None) -> np.ndarray:
+    # (n, periods, statistic), zero padded where a sheet has fewer periods.
+    if periods is None:
+        periods = max((s.periods for s in stats), default=0)
+    out = np.zeros((len(stats), periods, Statistic.TeamStats), dtype=np.int64)
+    for i, s in enumerate(stats):
+        n = min(s.periods, periods)
+        out[i, :n] = s.data[1 : n + 1]
+    return out
+
+
+class TestStats(unittest.TestCase):
+    def test_overtime_growth_keeps_views(self):
+        stats = Stats()
+        for period in range(6):
+            stats.new_qtr_sheet()
+            stats.add(Statistic.Points, period + 1)
+        self.assertEqual(stats.full.sheet[Statistic.Points], 21)
+        self.assertEqual([q.sheet[Statistic.Points] for q in stats.qtr], [1, 2, 3, 4, 5, 6])
+        self.assertEqual(stats.by_period()[:, Statistic.Points].sum(), 21)
+
+    def test_stacking(self):
+        a, b = Stats(), Stats()
+        a.new_qtr_sheet()
+        a.add(Statistic.Assists, 3)
+        for _ in range(5):
+            b.new_qtr_sheet()
+        b.add(Statistic.Assists, 1)
+        self.assertEqual(stack_totals([a, b])[:, Statistic.Assists].tolist(), [3, 1])
+        periods = stack_periods([a, b])
+        self.assertEqual(periods.shape, (2, 5, Statistic.TeamStats))
+        self.assertEqual(periods[1, 4, Statistic.Assists], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+
+import numpy as np
+
+# Columns of a stint table (Team.stint_table), one row per stint.
+TEAM = 0
+MASK = 1
+PLAYERS = slice(2, 7)  # player ids by position PG..C
+START = 7
+END = 8
+PTS_FOR = 9
+PTS_AGAINST = 10
+POSS_FOR = 11
+POSS_AGAINST = 12
+STINT_COLUMNS = 13
+
+
+def lineup_mask(lineup) -> int:
+    # Bit i set when roster index i is on court.
+    mask = 0
+    for index in lineup:
+        if index >= 0:
+            mask |= 1 << index
+    return mask
+
+
+class StintLog:
+    """Stints of one team in one game.
+
+    A stint is the time one lineup (roster indices by position) stays on
+    court. Points and possessions are counted into the open stint and the
+    row is stored when the lineup changes, a period ends or the game ends.
+    """
+
+    def __init__(self) -> None:
+        self.rows: list[tuple] = []
+        self.start = 0
+        self.pts_for = 0
+        self.pts_against = 0
+        self.poss_for = 0
+        self.poss_against = 0
+
+    def close(self, lineup: list[int], clock: int) -> None:
+        if clock > self.start or self.pts_for or self.pts_against or self.poss_for or self.poss_against:
+            self.rows.append(
+                (
+                    lineup_mask(lineup),
+                    tuple(lineup),
+                    self.start,
+                    clock,
+                    self.pts_for,
+                    self.pts_against,
+                    self.poss_for,
+                    self.poss_against,
+                )
+            )
+        self.start = clock
+        self.pts_for = self.pts_against = 0
+        self.poss_for = self.poss_against = 0
+
+    def table(self, team_id: int, player_ids: list[int]) -> np.ndarray:
+        out = np.zeros((len(self.rows), STINT_COLUMNS), dtype=np.int64)
+        for i, (mask, lineup, start, end, pf, pa, possf, possa) in enumerate(self.rows):
+            out[i, TEAM] = team_id
+            out[i, MASK] = mask
+            out[i, PLAYERS] = [player_ids[p] if p >= 0 else 0 for p in lineup]
+            out[i, START:] = (start, end, pf, pa, possf, possa)
+        return out
+
+
+class TestStintLog(unittest.TestCase):
+    def test_mask(self):
+        self.assertEqual(lineup_mask([0, 2, 11, -1, 3]), 0b100000001101)
+
+    def test_stint_split_at_quarter_break(self):
+        from player import Player
+        from team import Team
+
+        team = Team()
+        team.verbose = False
+        team.players = [Player(f"p{i}") for i in range(6)]
+        for pos in range(5):
+            team.set_starter(pos, pos)
+        team.add_points_for(2)
+        team.push_stat_sheet(720)
+        team.add_points_against(3)
+        team.update_minutes(900)
+        self.assertEqual(
+            [row[1:6] for row in team.stints.rows],
+            [((0, 1, 2, 3, 4), 0, 720, 2, 0), ((0, 1, 2, 3, 4), 720, 900, 0, 3)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,12 @@
 from ast import BitAnd
 from player import Player
-from stats import Stats, Statistic
+import numpy as np
+
+from stats import VERIFIED_STATS, Stats, Statistic, stack_totals
 from typing import Optional
-from tabulate import tabulate, SEPARATING_LINE
 from event_types import *
-from shot_chart import ShotChart
+from shot_chart import HeatmapChart, ShotChart
+from stints import StintLog
 
 
 def opponent(team: int) -> int:
@@ -17,19 +19,62 @@ class Team:
         self.name: str = ""
         self.short: str = ""
         self.players: list[Player] = []
-        self.active: list[Player] = [Player()] * 5
+        # On-court roster indices by position (PG..C), -1 until starters are known.
+        self.lineup: list[int] = [-1] * 5
+        self._empty = Player()
+        self.stints = StintLog()
+        # Points scored minus conceded since the on-court players were last credited.
+        self._plus_minus = 0
         self.stats = Stats()
         self.last_update = 0
-        self.shot_chart = ShotChart()
+        self._shot_chart: Optional[ShotChart] = None
+        # "dots" draws each shot; "heatmap" bins them when the chart is saved.
+        self.chart_style = "dots"
 
         self.verbose = True
         self.off_strategy = "~unknown~"
         self.def_strategy = "~unknown~"
 
+    @property
+    def shot_chart(self) -> ShotChart:
+        # Opening court.png is the most expensive part of a Team, so defer it
+        # until a chart is actually drawn.
+        if self._shot_chart is None:
+            self._shot_chart = HeatmapChart() if self.chart_style == "heatmap" else ShotChart()
+        return self._shot_chart
+
+    @property
+    def active(self) -> list[Player]:
+        return [self.players[i] if i >= 0 else self._empty for i in self.lineup]
+
     def set_starter(self, pid: int, pos: int):
-        self.active[pos] = self.players[pid]
+        self.lineup[pos] = pid
         self.players[pid].starter = True
 
+    def add_points_for(self, pts: int):
+        self._plus_minus += pts
+        self.stints.pts_for += pts
+
+    def add_points_against(self, pts: int):
+        self._plus_minus -= pts
+        self.stints.pts_against += pts
+
+    def add_possession(self, own: bool):
+        if own:
+            self.stints.poss_for += 1
+        else:
+            self.stints.poss_against += 1
+
+    def credit_plus_minus(self):
+        # Plus/minus is settled per stint (and per period) instead of per score.
+        if self._plus_minus:
+            for player in self.active:
+                player.add_stats(Statistic.PlusMinus, self._plus_minus)
+            self._plus_minus = 0
+
+    def stint_table(self) -> np.ndarray:
+        return self.stints.table(self.id, [player.id for player in self.players])
+
     def make_sub(self, sub_type: SubType, player_out, player_in):
         pout = self.players[player_out]
         pin = self.players[player_in]
@@ -38,33 +83,27 @@ class Team:
             print(f"{str(sub_type)} - OUT: {pout.name}, IN: {pin.name}")
 
         if sub_type == SubType.SUB_PG:
-            self.active[0] = pin
+            self.lineup[0] = player_in
         elif sub_type == SubType.SUB_SG:
-            self.active[1] = pin
+            self.lineup[1] = player_in
         elif sub_type == SubType.SUB_SF:
-            self.active[2] = pin
+            self.lineup[2] = player_in
         elif sub_type == SubType.SUB_PF:
-            self.active[3] = pin
+            self.lineup[3] = player_in
         elif sub_type == SubType.SUB_C:
-            self.active[4] = pin
+            self.lineup[4] = player_in
 
     def make_swap(self, player1: int, player2: int):
         p1 = self.players[player1]
         p2 = self.players[player2]
 
-        pos1 = -1
-        pos2 = -1
-
-        for index, player in enumerate(self.active):
-            if player.id == p1.id:
-                pos2 = index
-            elif player.id == p2.id:
-                pos1 = index
+        pos1 = self.lineup.index(player2) if player2 in self.lineup else -1
+        pos2 = self.lineup.index(player1) if player1 in self.lineup else -1
 
         pos_name = ["PG", "SG", "SF", "PF", "C"]
 
-        self.active[pos1] = p1
-        self.active[pos2] = p2
+        self.lineup[pos1] = player1
+        self.lineup[pos2] = player2
 
         if self.verbose:
             print(
@@ -72,16 +111,21 @@ class Team:
             )
 
     def update_minutes(self, gameclock: int):
+        # Called right before every lineup change and at the end of the game,
+        # so this closes the current stint.
         secs = gameclock - self.last_update
+        active = self.active
 
-        self.active[0].add_stats(Statistic.SecsPG, secs)
-        self.active[1].add_stats(Statistic.SecsSG, secs)
-        self.active[2].add_stats(Statistic.SecsSF, secs)
-        self.active[3].add_stats(Statistic.SecsPF, secs)
-        self.active[4].add_stats(Statistic.SecsC, secs)
+        active[0].add_stats(Statistic.SecsPG, secs)
+        active[1].add_stats(Statistic.SecsSG, secs)
+        active[2].add_stats(Statistic.SecsSF, secs)
+        active[3].add_stats(Statistic.SecsPF, secs)
+        active[4].add_stats(Statistic.SecsC, secs)
+        self.credit_plus_minus()
+        self.stints.close(self.lineup, gameclock)
 
         if self.verbose:
-            for player in self.active:
+            for player in active:
                 print(
                     f"MINUTES {self.short} - {player.name} +{secs}s = {player.secs_total()}"
                 )
@@ -89,7 +133,11 @@ class Team:
         self.last_update = gameclock
 
     def points(self) -> int:
-        return self.stats.full.sheet[Statistic.Points]
+        return int(self.stats.data[0, Statistic.Points])
+
+    def player_totals(self) -> np.ndarray:
+        # players x statistic, full-game rows in roster order
+        return stack_totals([player.stats for player in self.players])
 
     def add_stats(self, stat: Statistic, val: int, pid: Optional[int] = None):
         if isinstance(pid, int):
@@ -103,12 +151,19 @@ class Team:
                 print(f"{self.name},  --  {stat.name}: {val}")
         self.stats.add(stat, val)
 
-    def push_stat_sheet(self):
+    def push_stat_sheet(self, clock: Optional[int] = None):
+        # clock is the end of the period being closed; a lineup that plays
+        # through the break gets one stint per period.
+        self.credit_plus_minus()
+        if clock is not None:
+            self.stints.close(self.lineup, clock)
         self.stats.new_qtr_sheet()
         for player in self.players:
             player.stats.new_qtr_sheet()
 
     def print_stats(self):
+        from tabulate import SEPARATING_LINE, tabulate
+
         headers = [
             "Name",
             "MIN",
@@ -136,77 +191,46 @@ class Team:
         print()
         print()
 
-    def __eq__(self, other):
-        def stats_eql(stat: Statistic):
-            if self.stats.full.sheet[stat] != other.stats.full.sheet[stat]:
-                print(
-                    f"Not eql: {str(stat)} - {self.name}: {self.stats.full.sheet[stat]} != {other.stats.full.sheet[stat]}"
-                )
-                return False
-            return True
-
-        team_eql = (
-            self.id == other.id
-            and self.name == other.name
-            and stats_eql(Statistic.Points)
-            and stats_eql(Statistic.FieldGoalsMade)
-            and stats_eql(Statistic.FieldGoalsAtt)
-            and stats_eql(Statistic.ThreePointsMade)
-            and stats_eql(Statistic.ThreePointsAtt)
-            and stats_eql(Statistic.FreeThrowsMade)
-            and stats_eql(Statistic.FreeThrowsAtt)
-            and stats_eql(Statistic.OffRebounds)
-            and stats_eql(Statistic.DefRebounds)
-            and stats_eql(Statistic.Assists)
-            and stats_eql(Statistic.Turnovers)
-            and stats_eql(Statistic.Steals)
-            and stats_eql(Statistic.Blocks)
-            and stats_eql(Statistic.Fouls)
-        )
-
-        player_map = {}
-        for player in other.players:
-            player_map[player.name] = player
-
-        player_eql = True
-        for player in self.players:
-            other = player_map[player.name]
-
-            def p_stats_eql(stat: Statistic):
-                if player.stats.full.sheet[stat] != other.stats.full.sheet[stat]:
-                    if __debug__:
-                        print(
-                            f"Not eql: {player.name} - {str(stat)}: {player.stats.full.sheet[stat]} != {other.stats.full.sheet[stat]}"
-                        )
-                    return False
-                return True
-
-            if __debug__:
-                print(
-                    player.name,
-                    player.stats.full.minutes() == other.stats.full.minutes(),
-                    player.stats.full.minutes(),
-                    other.stats.full.minutes(),
-                )
+    def diff(self, other) -> list[dict]:
+        """Verified stats where `other` disagrees with this (reference) team.
 
-            player_eql &= (
-                player.id == other.id
-                and player.name == other.name
-                and player.stats.full.minutes() == other.stats.full.minutes()
-                and p_stats_eql(Statistic.Points)
-                and p_stats_eql(Statistic.FieldGoalsMade)
-                and p_stats_eql(Statistic.FieldGoalsAtt)
-                and p_stats_eql(Statistic.ThreePointsMade)
-                and p_stats_eql(Statistic.ThreePointsAtt)
-                and p_stats_eql(Statistic.FreeThrowsMade)
-                and p_stats_eql(Statistic.FreeThrowsAtt)
-                and p_stats_eql(Statistic.OffRebounds)
-                and p_stats_eql(Statistic.DefRebounds)
-                and p_stats_eql(Statistic.Assists)
-                and p_stats_eql(Statistic.Turnovers)
-                and p_stats_eql(Statistic.Steals)
-                and p_stats_eql(Statistic.Blocks)
-                and p_stats_eql(Statistic.Fouls)
-            )
+        Each entry names the player (None for the team row), the statistic,
+        and the expected (self) and computed (other) values.
+        """
+        diffs = []
 
-        return team_eql and player_eql
+        def add(player, stat: str, expected, computed):
+            diffs.append({"player": player, "stat": stat, "expected": expected, "computed": computed})
+
+        def compare(player, ours: np.ndarray, theirs: np.ndarray):
+            for k in np.flatnonzero(ours[VERIFIED_STATS] != theirs[VERIFIED_STATS]):
+                stat = VERIFIED_STATS[k]
+                add(player, stat.name, int(ours[stat]), int(theirs[stat]))
+
+        if self.id != other.id:
+            add(None, "id", self.id, other.id)
+        if self.name != other.name:
+            add(None, "name", self.name, other.name)
+        compare(None, self.stats.data[0], other.stats.data[0])
+
+        player_map = {player.name: player for player in other.players}
+        for player in self.players:
+            theirs = player_map.get(player.name)
+            if theirs is None:
+                add(player.name, "missing", player.id, None)
+                continue
+            if player.id != theirs.id:
+                add(player.name, "id", player.id, theirs.id)
+            mins = player.stats.full.minutes()
+            other_mins = theirs.stats.full.minutes()
+            if mins != other_mins:
+                add(player.name, "Minutes", mins, other_mins)
+            compare(player.name, player.stats.data[0], theirs.stats.data[0])
+
+        return diffs
+
+    def __eq__(self, other):
+        diffs = self.diff(other)
+        for d in diffs:
+            print(f"Not eql: {d['player'] or self.name} - {d['stat']}: {d['expected']} != {d['computed']}")
+        return not diffs
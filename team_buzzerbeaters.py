@@ -1,37 +1,35 @@
+from __future__ import annotations
+
 import argparse
 import os
 import sqlite3
 import sys
+import time
 import xml.etree.ElementTree as ET
 from datetime import date
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import requests
-
-from buzzerbeaters import find_buzzerbeaters
+from bbapi import BBApi
+from buzzerbeaters import find_buzzerbeater_records
 from first_active_match import _schedule_matches, _parse_team_name, _sort_key, _login, _load_env
 from main import get_xml_text
+from parallel import imap_bounded
+from scan_profile import ScanProfile
 from team_info import get_team_history_from_webpage, get_teaminfo, first_season
 
-try:
-    from rich.console import Console
-    from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeElapsedColumn
-except Exception:
-    Console = None
-    Progress = None
+if TYPE_CHECKING:
+    import requests
 
 
-def _load_env(path: str = ".env") -> None:
-    if not os.path.exists(path):
-        return
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            k, v = line.split("=", 1)
-            if k and v and k not in os.environ:
-                os.environ[k] = v
+def _load_rich():
+    # Optional, and slow to import: only load it when the TUI is on.
+    try:
+        import rich.console
+        import rich.progress
+    except Exception:
+        return None
+    return rich
 
 
 def _current_season(session: requests.Session) -> int:
@@ -87,24 +85,44 @@ def _completed_matches(session: requests.Session, team_id: int, season: int):
     return completed, match_types, match_scores, match_seasons
 
 
-def _save_hits(db_path: str, match_id: int, match_type: str | None, match_score, season_num, hits, ht, at) -> int:
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
-    _ensure_columns(cur)
-    inserted = 0
-    for ev in hits:
-        if ev.team == 0:
-            team = ht
-            opp = at
-            is_home = 1
-        else:
-            team = at
-            opp = ht
-            is_home = 0
+def _union_completed_matches(session: requests.Session, team_ids: list[int], season: int):
+    # Matches between two scanned teams show up in both schedules; keep the first copy only.
+    completed = []
+    match_types = {}
+    match_scores = {}
+    match_seasons = {}
+    for team_id in team_ids:
+        team_completed, team_types, team_scores, _ = _completed_matches(session, team_id, season)
+        for mid in team_completed:
+            if mid in match_types:
+                continue
+            completed.append(mid)
+            match_types[mid] = team_types.get(mid)
+            match_scores[mid] = team_scores.get(mid)
+            match_seasons[mid] = season
+    return completed, match_types, match_scores, match_seasons
+
+
+def _read_team_ids(path: str) -> list[int]:
+    team_ids = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            team_ids.append(int(line))
+    # Preserve file order but drop duplicates.
+    return list(dict.fromkeys(team_ids))
+
 
-        player_id = getattr(ev.player1obj, "id", ev.player1)
-        player_name = getattr(ev.player1obj, "name", "")
+def _league_team_ids(api: BBApi, league_id: int, seasons: list[int]) -> dict[int, list[int]]:
+    # League membership changes with promotion/relegation, so expand per season.
+    return {season: [int(tid) for tid in api.standings(league_id, season)] for season in seasons}
 
+
+def _save_hits(cur: sqlite3.Cursor, match_id: int, match_type: str | None, match_score, season_num, records) -> int:
+    inserted = 0
+    for rec in records:
         cur.execute(
             """
             INSERT INTO buzzerbeaters (
@@ -141,30 +159,30 @@ def _save_hits(db_path: str, match_id: int, match_type: str | None, match_score,
             """,
             (
                 match_id,
-                team.id,
-                team.name,
-                opp.id,
-                opp.name,
-                int(player_id),
-                player_name,
-                ev.period,
-                ev.gameclock.clock,
-                ev.comment,
+                rec["team_id"],
+                rec["team_name"],
+                rec["opponent_id"],
+                rec["opponent_name"],
+                rec["player_id"],
+                rec["player_name"],
+                rec["period"],
+                rec["game_clock"],
+                rec["comment"],
                 match_type,
-                is_home,
-                getattr(ev, "linked_event_kind", None),
-                getattr(ev, "shot_type", None),
-                getattr(ev, "shot_type_label", None),
-                getattr(ev, "shot_result", None),
-                getattr(ev, "free_throw_type", None),
-                getattr(ev, "shot_x", None),
-                getattr(ev, "shot_y", None),
-                getattr(ev, "shot_distance", None),
-                getattr(ev, "shot_distance_ft", None),
-                getattr(ev, "score_before_home", None),
-                getattr(ev, "score_before_away", None),
-                getattr(ev, "score_after_home", None),
-                getattr(ev, "score_after_away", None),
+                rec["is_home"],
+                rec["event_kind"],
+                rec["shot_type"],
+                rec["shot_type_label"],
+                rec["shot_result"],
+                rec["free_throw_type"],
+                rec["shot_x"],
+                rec["shot_y"],
+                rec["shot_distance"],
+                rec["shot_distance_ft"],
+                rec["score_before_home"],
+                rec["score_before_away"],
+                rec["score_after_home"],
+                rec["score_after_away"],
                 match_score[0] if match_score else None,
                 match_score[1] if match_score else None,
                 season_num,
@@ -172,8 +190,6 @@ def _save_hits(db_path: str, match_id: int, match_type: str | None, match_score,
         )
         if cur.rowcount:
             inserted += 1
-    conn.commit()
-    conn.close()
     return inserted
 
 
@@ -256,6 +272,42 @@ def _ensure_columns(cur: sqlite3.Cursor) -> None:
             """
         )
 
+
+def _profiled_records(matchid: int):
+    # Worker side of --profile: a fresh profile per match, shipped back for merging.
+    profile = ScanProfile()
+    start = time.perf_counter()
+    records = find_buzzerbeater_records(matchid, profile)
+    profile.match_done(time.perf_counter() - start)
+    return records, profile.snapshot()
+
+
+def _detect_records(jobs, workers: int, profile: ScanProfile):
+    # Yields (job, records) in job order; records is None when the match failed to parse.
+    if profile.enabled:
+        results = _detect_records_with(_profiled_records, jobs, workers)
+        for job, result in results:
+            if result is None:
+                profile.count("matches_failed")
+                yield job, None
+                continue
+            records, snapshot = result
+            profile.merge(snapshot)
+            yield job, records
+        return
+    yield from _detect_records_with(find_buzzerbeater_records, jobs, workers)
+
+
+def _detect_job(job, detect):
+    return detect(job[1])
+
+
+def _detect_records_with(detect, jobs, workers: int):
+    # Records are None for matches that failed to parse.
+    for job, records, _ in imap_bounded(_detect_job, jobs, workers, detect):
+        yield job, records
+
+
 def _phase_message(console, message: str) -> None:
     if console is not None:
         console.print(f"[dim]{message}[/dim]")
@@ -270,9 +322,20 @@ def _warning_message(console, message: str) -> None:
         print(f"Warning: {message}", file=sys.stderr, flush=True)
 
 
+def _count_response(profile: ScanProfile):
+    def hook(resp, *args, **kwargs):
+        profile.count("api_requests")
+        profile.count("bytes_fetched", len(resp.content))
+
+    return hook
+
+
 def main() -> None:
     parser = argparse.ArgumentParser()
-    parser.add_argument("--teamid", type=int, required=True)
+    scope = parser.add_mutually_exclusive_group(required=True)
+    scope.add_argument("--teamid", type=int, default=None)
+    scope.add_argument("--league", type=int, default=None, help="Scan every team in this league (per season standings)")
+    scope.add_argument("--teams", type=str, default=None, help="File with one team id per line")
     parser.add_argument("--season", type=int, default=None)
     parser.add_argument("--seasons", type=str, default=None, help="Comma-separated list")
     parser.add_argument("--season-from", type=int, dest="season_from", default=None)
@@ -280,6 +343,12 @@ def main() -> None:
     parser.add_argument("--auto-first-season", action="store_true", help="Auto-detect first season for current team name")
     parser.add_argument("--from-first-active", action="store_true", help="Start from the first active match of the team")
     parser.add_argument("--db", default="data/buzzerbeaters.db")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Detection worker processes (default 1, 0 = one per CPU)",
+    )
     parser.add_argument(
         "--tui",
         dest="tui",
@@ -293,9 +362,27 @@ def main() -> None:
         action="store_false",
         help="Disable Rich TUI progress",
     )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="output/profiles/team_buzzerbeaters.json",
+        default=None,
+        metavar="PATH",
+        help="Record per-phase timings and counters; write a JSON report (default output/profiles/team_buzzerbeaters.json)",
+    )
     args = parser.parse_args()
-    console = Console(stderr=True) if args.tui and Console is not None else None
-    _phase_message(console, f"Starting team buzzerbeater scan for team {args.teamid}...")
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    if args.teamid is None and (args.auto_first_season or args.from_first_active):
+        parser.error("--auto-first-season and --from-first-active require --teamid")
+    profile = ScanProfile(enabled=args.profile is not None)
+    rich = _load_rich() if args.tui else None
+    console = rich.console.Console(stderr=True) if rich is not None else None
+    if args.league is not None:
+        _phase_message(console, f"Starting buzzerbeater scan for league {args.league}...")
+    elif args.teams is not None:
+        _phase_message(console, f"Starting buzzerbeater scan for teams in {args.teams}...")
+    else:
+        _phase_message(console, f"Starting team buzzerbeater scan for team {args.teamid}...")
     db_path = Path(args.db)
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -306,9 +393,14 @@ def main() -> None:
     if not username or not security_code:
         raise SystemExit("Missing BB_USERNAME or BB_SECURITY_CODE in environment")
 
+    import requests
+
     _phase_message(console, "Authenticating with BB API...")
     session = requests.Session()
-    _login(session)
+    if profile.enabled:
+        session.hooks["response"].append(_count_response(profile))
+    with profile.phase("login"):
+        _login(session)
 
     # Resolve seasons to scan
     seasons = []
@@ -341,18 +433,36 @@ def main() -> None:
     if any(1 <= s <= 14 for s in seasons):
         _warning_message(console, "Buzzerbeaters are currently not tracked in seasons 1-14.")
 
+    if args.league is not None:
+        _phase_message(console, "Expanding league teams from standings...")
+        season_teams = _league_team_ids(BBApi.from_session(session), args.league, seasons)
+    elif args.teams is not None:
+        team_ids = _read_team_ids(args.teams)
+        if not team_ids:
+            raise SystemExit(f"No team ids found in {args.teams}")
+        season_teams = {season: team_ids for season in seasons}
+    else:
+        season_teams = {season: [args.teamid] for season in seasons}
+    scanned_teams = {tid for team_ids in season_teams.values() for tid in team_ids}
+    if len(scanned_teams) > 1:
+        _phase_message(console, f"Teams to scan: {len(scanned_teams)}")
+
     total_hits = 0
     total_inserted = 0
     total_matches = 0
     start_from_match = None
     start_from_time = None
     first_season_schedule = {}
+    seen_matches = set()
+    hits_for = {}
+    hits_against = {}
 
     if args.from_first_active:
         _phase_message(console, "Resolving first active match in the first scanned season...")
         # Derive first active match within the first season in list
         first_season_num = min(seasons)
-        schedule = _schedule_matches(session, args.teamid, first_season_num)
+        with profile.phase("schedule"):
+            schedule = _schedule_matches(session, args.teamid, first_season_num)
         schedule.sort(key=lambda m: _sort_key(m[1]))
         first_season_schedule = {mid: start for mid, start in schedule}
         names_seen = []
@@ -372,21 +482,32 @@ def main() -> None:
 
     skipped = 0
     progress = None
-    if args.tui and Progress is not None:
-        progress = Progress(
-            SpinnerColumn(),
-            TextColumn("{task.description}"),
-            BarColumn(),
-            TextColumn("{task.completed}/{task.total}"),
-            TimeElapsedColumn(),
+    if rich is not None:
+        progress = rich.progress.Progress(
+            rich.progress.SpinnerColumn(),
+            rich.progress.TextColumn("{task.description}"),
+            rich.progress.BarColumn(),
+            rich.progress.TextColumn("{task.completed}/{task.total}"),
+            rich.progress.TimeElapsedColumn(),
             console=console,
         )
 
     if progress:
         progress.__enter__()
+    profile_task = None
+    profile_shown = 0.0
+    if progress and profile.enabled:
+        profile_task = progress.add_task(profile.summary(), total=None)
 
+    jobs = []
+    season_tasks = {}
     for season in seasons:
-        completed, match_types, match_scores, match_seasons = _completed_matches(session, args.teamid, season)
+        with profile.phase("schedule"):
+            completed, match_types, match_scores, match_seasons = _union_completed_matches(
+                session, season_teams[season], season
+            )
+        completed = [m for m in completed if m not in seen_matches]
+        seen_matches.update(completed)
         if start_from_match is not None and season == min(seasons):
             # Filter to matches at or after the first active match in this season
             if start_from_time is not None and first_season_schedule:
@@ -399,25 +520,34 @@ def main() -> None:
             else:
                 completed = [m for m in completed if m >= start_from_match]
         total_matches += len(completed)
-        task_id = None
         if progress:
-            task_id = progress.add_task(f"Season {season}", total=len(completed))
-        for mid in completed:
-            try:
-                hits, ht, at = find_buzzerbeaters(mid)
-            except Exception:
-                skipped += 1
-                if progress and task_id is not None:
-                    progress.advance(task_id)
-                continue
-            for ev in hits:
-                ev.period = ev.period if hasattr(ev, "period") else None
-            total_hits += len(hits)
-            total_inserted += _save_hits(
-                str(db_path), mid, match_types.get(mid), match_scores.get(mid), season, hits, ht, at
-            )
-            if progress and task_id is not None:
-                progress.advance(task_id)
+            season_tasks[season] = progress.add_task(f"Season {season}", total=len(completed))
+        jobs.extend((season, mid, match_types.get(mid), match_scores.get(mid)) for mid in completed)
+
+    # The main process is the only writer; workers just hand back hit records.
+    conn = sqlite3.connect(str(db_path))
+    cur = conn.cursor()
+    _ensure_columns(cur)
+    for (season, mid, match_type, match_score), records in _detect_records(jobs, workers, profile):
+        if records is None:
+            skipped += 1
+        else:
+            total_hits += len(records)
+            for rec in records:
+                hits_for[rec["team_id"]] = hits_for.get(rec["team_id"], 0) + 1
+                hits_against[rec["opponent_id"]] = hits_against.get(rec["opponent_id"], 0) + 1
+            with profile.phase("save_hits"):
+                total_inserted += _save_hits(cur, mid, match_type, match_score, season, records)
+                conn.commit()
+        if progress:
+            progress.advance(season_tasks[season])
+            # Percentiles are recomputed over every match so far; refresh twice a second at most.
+            if profile_task is not None and time.perf_counter() - profile_shown > 0.5:
+                progress.update(profile_task, description=profile.summary())
+                profile_shown = time.perf_counter()
+    conn.close()
+    if profile_task is not None:
+        progress.update(profile_task, description=profile.summary(), total=1, completed=1)
 
     if progress:
         progress.__exit__(None, None, None)
@@ -428,6 +558,13 @@ def main() -> None:
     print(f"rows_inserted: {total_inserted}")
     if skipped:
         print(f"matches_skipped: {skipped}")
+    if len(scanned_teams) > 1:
+        print(f"teams_scanned: {len(scanned_teams)}")
+        print("hits_by_team (for/against):")
+        for tid in sorted(scanned_teams):
+            print(f"- {tid}: {hits_for.get(tid, 0)}/{hits_against.get(tid, 0)}")
+    if profile.enabled:
+        print(f"profile: {profile.write(args.profile)}")
 
 
 if __name__ == "__main__":
@@ -1,10 +1,14 @@
+from __future__ import annotations
+
 import argparse
 import os
 import re
 import xml.etree.ElementTree as ET
 
-import requests
-from bs4 import BeautifulSoup
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import requests
 
 
 def _load_env(path: str = ".env") -> None:
@@ -68,6 +72,8 @@ def get_team_history_from_webpage(session: requests.Session, team_id: int) -> li
         re.IGNORECASE,
     )
 
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(resp.text, "html.parser")
     spans = soup.find_all("span")
 
@@ -116,6 +122,8 @@ def main() -> None:
     parser.add_argument("--teamid", type=int, required=True)
     args = parser.parse_args()
 
+    import requests
+
     _load_env()
     session = requests.Session()
     _login(session)
@@ -1,20 +1,18 @@
+from __future__ import annotations
+
 import argparse
-import contextlib
-import io
-import math
 import os
 import xml.etree.ElementTree as ET
 from datetime import date, datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import matplotlib.pyplot as plt
 import numpy as np
-import requests
 
-from comments import Comments
-from event import ShotEvent, convert
-from main import get_xml_text, parse_xml
-from buzzerbeaters import FT_PER_PX
+from shot_table import ShotStore, concat_shots, is_three, match_shots
+
+if TYPE_CHECKING:
+    import requests
 
 
 def _load_env(path: str = ".env") -> None:
@@ -113,72 +111,81 @@ def _sort_key(start: str):
         return start
 
 
-def _collect_distances(match_ids: list[int]):
-    three_dists = []
-    two_dists = []
-    for matchid in match_ids:
-        text = get_xml_text(matchid)
-        with contextlib.redirect_stdout(io.StringIO()):
-            events, ht, at = parse_xml(text)
-            comments = Comments()
-            for ev in events:
-                ev.comment = comments.get_comment(ev, [ht, at])
-            baseevents = convert(events)
-
-        for be in baseevents:
-            if not isinstance(be, ShotEvent) or be.shot_pos is None:
-                continue
-            basket_x, basket_y = (347, 96) if be.att_team == 0 else (21, 96)
-            dx = be.shot_pos.x - basket_x
-            dy = be.shot_pos.y - basket_y
-            dist_ft = math.sqrt(dx * dx + dy * dy) * FT_PER_PX
-            if be.is_3pt():
-                three_dists.append(dist_ft)
-            else:
-                two_dists.append(dist_ft)
-    return three_dists, two_dists
+def _collect_distances(match_ids: list[int], store: ShotStore | None = None):
+    if store is not None:
+        shots = store.load(match_ids)
+    else:
+        shots = concat_shots(match_shots(matchid) for matchid in match_ids)
+    three = is_three(shots)
+    return shots["distance_ft"][three], shots["distance_ft"][~three]
+
+
+def _recent_matches(session, store, team_id: int, seasons: list[int], current: int, count: int) -> list[int]:
+    # Most recent finished matches of a team, newest season first.
+    match_ids = []
+    for season in seasons:
+        matches = store.schedule(team_id, season) if store is not None and season < current else None
+        if matches is None:
+            matches = _schedule_matches(session, team_id, season)
+            if store is not None and season < current:
+                # Finished seasons no longer change.
+                store.set_schedule(team_id, season, matches)
+        matches = sorted(matches, key=lambda m: _sort_key(m[1]), reverse=True)
+        for mid, start in matches:
+            if store is not None:
+                store.note(mid, season, start)
+            match_ids.append(mid)
+            if len(match_ids) >= count:
+                return match_ids
+    return match_ids
 
 
 def main() -> None:
     parser = argparse.ArgumentParser()
-    parser.add_argument("--teamid", type=int, required=True)
-    parser.add_argument("--season", type=int, default=None)
-    parser.add_argument("--count", type=int, default=10, help="Number of most recent games")
+    parser.add_argument("--teamid", type=int, nargs="+", required=True, help="One or more team ids")
+    parser.add_argument("--season", type=int, nargs="+", default=None, help="Only these seasons")
+    parser.add_argument("--count", type=int, default=10, help="Number of most recent games per team")
     parser.add_argument("--bin-width", type=float, default=0.25)
+    parser.add_argument("--store", default="output/shots", help="Shot store directory ('' to disable)")
+    parser.add_argument("--offline", action="store_true", help="Use only matches already in the shot store (no API calls)")
     parser.add_argument("--out", default="output/charts/team_shot_distance_hist.png")
     args = parser.parse_args()
 
-    _load_env()
-    session = requests.Session()
-    _login(session)
+    store = ShotStore(args.store) if args.store else None
+    match_ids: list = []
+    if args.offline:
+        if store is None:
+            parser.error("--offline needs --store")
+        for team_id in args.teamid:
+            match_ids += store.find(team_id, set(args.season) if args.season else None)[: args.count]
+    else:
+        import requests
 
-    current = _current_season(session)
-    seasons = _all_seasons(session)
-    seasons = [s for s in seasons if s <= current]
-    seasons.sort(reverse=True)
+        _load_env()
+        session = requests.Session()
+        _login(session)
 
-    match_ids = []
-    if args.season is not None:
-        seasons = [args.season]
+        current = _current_season(session)
+        if args.season is not None:
+            seasons = sorted(args.season, reverse=True)
+        else:
+            seasons = sorted((s for s in _all_seasons(session) if s <= current), reverse=True)
+        for team_id in args.teamid:
+            match_ids += _recent_matches(session, store, team_id, seasons, current, args.count)
+    # Teams that played each other share matches; count those shots once.
+    match_ids = list(dict.fromkeys(str(m) for m in match_ids))
 
-    for season in seasons:
-        matches = _schedule_matches(session, args.teamid, season)
-        matches.sort(key=lambda m: _sort_key(m[1]), reverse=True)
-        for mid, _ in matches:
-            match_ids.append(mid)
-            if len(match_ids) >= args.count:
-                break
-        if len(match_ids) >= args.count:
-            break
+    three_dists, two_dists = _collect_distances(match_ids, store)
 
-    three_dists, two_dists = _collect_distances(match_ids)
+    # pyplot is by far the slowest import here; only load it to draw.
+    import matplotlib.pyplot as plt
 
     bin_width = args.bin_width
     fig, axes = plt.subplots(1, 2, figsize=(12, 4), sharey=True)
 
     # 3PT histogram
-    if three_dists:
-        bins = np.arange(min(three_dists), max(three_dists) + bin_width, bin_width)
+    if len(three_dists):
+        bins = np.arange(three_dists.min(), three_dists.max() + bin_width, bin_width)
     else:
         bins = 10
     axes[0].hist(three_dists, bins=bins, color="#4C78A8", alpha=0.8)
@@ -190,8 +197,8 @@ def main() -> None:
     axes[0].legend()
 
     # 2PT histogram
-    if two_dists:
-        bins = np.arange(min(two_dists), max(two_dists) + bin_width, bin_width)
+    if len(two_dists):
+        bins = np.arange(two_dists.min(), two_dists.max() + bin_width, bin_width)
     else:
         bins = 10
     axes[1].hist(two_dists, bins=bins, color="#72B7B2", alpha=0.8)
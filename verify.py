@@ -0,0 +1,132 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+
+
+from bbapi import BBApi
+from cli_args import add_matchid_args, read_match_ids
+from first_active_match import _load_env
+from game import Game, PlayOptions
+from main import get_xml_text, parse_xml
+from parallel import imap_bounded
+
+
+def _boxscore_path(matchid: str) -> Path:
+    return Path("matches") / f"boxscore_{matchid}.xml"
+
+
+def verify_match(matchid: str) -> dict:
+    """Compare the simulated box score of one match with its cached BB API boxscore.
+
+    Runs in worker processes, so it only reads the boxscore cache; fetching
+    is done up front by the single authenticated client in main().
+    """
+    if not _boxscore_path(matchid).exists():
+        return {"matchid": matchid, "error": "no cached boxscore"}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        events, ht, at = parse_xml(get_xml_text(matchid))
+        game = Game(matchid, events, ht, at, PlayOptions())
+        game.play()
+
+    # The API lists the away team first.
+    away, home = BBApi().boxscore(matchid=matchid)
+    mismatches = []
+    for side, expected, computed in (("home", home, game.teams[0]), ("away", away, game.teams[1])):
+        for d in expected.diff(computed):
+            mismatches.append({"side": side, "team": expected.name, **d})
+    return {"matchid": matchid, "mismatches": mismatches}
+
+
+def _verify_all(match_ids: list[str], workers: int):
+    # Yields one result per match, in match order.
+    for matchid, result, error in imap_bounded(verify_match, match_ids, workers):
+        yield {"matchid": matchid, "error": repr(error)} if error else result
+
+
+def _fetch_missing_boxscores(match_ids: list[str]) -> None:
+    missing = [m for m in match_ids if not _boxscore_path(m).exists()]
+    if not missing:
+        return
+    username = os.getenv("BB_USERNAME")
+    security_code = os.getenv("BB_SECURITY_CODE")
+    if not username or not security_code:
+        print(
+            f"Warning: {len(missing)} boxscores are not cached and BB_USERNAME/BB_SECURITY_CODE are not set; skipping them.",
+            file=sys.stderr,
+        )
+        return
+    # One login for the whole batch; get_xml_boxscore writes matches/boxscore_<id>.xml.
+    api = BBApi(username, security_code)
+    for matchid in missing:
+        api.get_xml_boxscore(matchid)
+
+
+def main() -> None:
+    from tabulate import tabulate
+
+    parser = argparse.ArgumentParser(description="Verify simulated box scores against BB API boxscores.")
+    add_matchid_args(parser)
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (0 = one per CPU)")
+    parser.add_argument("--out", default="output/verify/report.json", help="JSON mismatch report path")
+    parser.add_argument("--show", type=int, default=20, help="Print up to N individual mismatches")
+    args = parser.parse_args()
+
+    match_ids = read_match_ids(args)
+    if not match_ids:
+        parser.error("Provide --matchids and/or --matchids-file")
+
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+
+    _load_env()
+    Path("matches").mkdir(exist_ok=True)
+    _fetch_missing_boxscores(match_ids)
+
+    results = []
+    per_stat: Counter = Counter()
+    for result in _verify_all(match_ids, workers):
+        results.append(result)
+        for m in result.get("mismatches", []):
+            per_stat[m["stat"]] += 1
+
+    ok = [r for r in results if "error" not in r and not r["mismatches"]]
+    failed = [r for r in results if r.get("mismatches")]
+    errors = [r for r in results if "error" in r]
+    report = {
+        "matches": len(results),
+        "ok": len(ok),
+        "mismatched": len(failed),
+        "errors": len(errors),
+        "per_stat": dict(per_stat.most_common()),
+        "results": [r for r in results if "error" in r or r["mismatches"]],
+    }
+
+    out_path = Path(args.out)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"Verified {len(results)} matches: {len(ok)} ok, {len(failed)} mismatched, {len(errors)} errors -> {out_path}")
+    if per_stat:
+        print(tabulate(per_stat.most_common(), headers=["stat", "mismatches"]))
+    rows = []
+    for r in failed:
+        for m in r["mismatches"]:
+            rows.append([r["matchid"], m["team"], m["player"] or "(team)", m["stat"], m["expected"], m["computed"]])
+    if rows and args.show > 0:
+        print()
+        print(tabulate(rows[: args.show], headers=["match", "team", "player", "stat", "expected", "computed"]))
+    for r in errors[: args.show]:
+        print(f"{r['matchid']}: {r['error']}", file=sys.stderr)
+
+    if failed or errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()